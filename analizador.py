@@ -3,20 +3,61 @@ import requests
 import pandas as pd
 import numpy as np
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
 from typing import List, Dict, Tuple, Set
 import warnings
 import time
 import sqlite3
 import os
+import zlib
+import hashlib
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from task_manager import BackgroundTaskManager, CancellationToken, OperationCancelled, check_cancelled
+from progress import ProgressBus, ProgressEvent, console_printer
+from http_client import FetchError
+from sources import get_shared_fetcher, normalize_payload
+from singleflight import download_flights
+from draw_calendar import date_ordinal, is_new_draw_due, parse_draw_date, years_before
+from draw_matrix import DrawMatrix, consecutive_runs, popcount, rank_desc
+from number_index import NumberIndex
+from draw_query import DrawFeatures
+from lookup_tables import LookupTables
+from lotteries import LOTTERIES, get_lottery
+from null_model import cached_simulations, history_metrics, significance
+from combinatorics import cached_distributions, central_interval, mean_std
+from randomness import randomness_battery
+from snapshot import DrawSnapshot, invalidate_snapshot, load_snapshot, merge_snapshot, write_snapshot
 
 warnings.filterwarnings('ignore')
 
+# Concursos gravados por transação durante downloads longos (perda máxima numa interrupção)
+CHECKPOINT_BATCH_SIZE = 25
+
+# Cache considerado antigo demais para responder sem consultar a API
+OFFLINE_MAX_AGE_HOURS = 24 * 7
+
+# Atualizações de "último concurso" disparadas pelo modo offline-first
+refresh_tasks = BackgroundTaskManager(max_workers=2)
+
+
+# Históricos sintéticos do modelo nulo usados por padrão no relatório
+NULL_MODEL_SIMULATIONS = 500
+
+
+def low_high_midpoint(lottery_type: str) -> int:
+    """Maior número considerado "baixo" na análise baixos/altos"""
+    return get_lottery(lottery_type).low_max
+
+
 class LotteryCacheManager:
     def __init__(self, db_path: str = "lottery_cache.db"):
         """Inicializa o gerenciador de cache"""
         self.db_path = db_path
+        # Snapshots colunares (.npy) ao lado do banco, um diretório por loteria
+        self.snapshot_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), "snapshots")
+        self.simulation_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), "simulacoes")
+        self.distribution_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), "distribuicoes")
         self.init_database()
     
     def init_database(self):
@@ -33,6 +74,7 @@ class LotteryCacheManager:
             data TEXT NOT NULL,
             numeros TEXT NOT NULL,
             data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            data_ordinal INTEGER,
             UNIQUE(lottery_type, concurso)
         )
         ''')
@@ -48,15 +90,124 @@ class LotteryCacheManager:
         )
         ''')
         
+        # Arquivo das respostas brutas da API: blobs comprimidos endereçados pelo conteúdo
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS raw_blobs (
+            sha256 TEXT PRIMARY KEY,
+            payload BLOB NOT NULL,
+            tamanho INTEGER NOT NULL
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS raw_respostas (
+            lottery_type TEXT NOT NULL,
+            concurso INTEGER NOT NULL,
+            fonte TEXT,
+            sha256 TEXT NOT NULL REFERENCES raw_blobs(sha256),
+            data_download TIMESTAMP,
+            PRIMARY KEY (lottery_type, concurso)
+        )
+        ''')
+        
+        # Agregados mantidos a cada save_results (painel e comparação sem ler os concursos)
+        had_aggregates = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'number_stats'"
+        ).fetchone() is not None
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS number_stats (
+            lottery_type TEXT NOT NULL,
+            numero INTEGER NOT NULL,
+            frequencia INTEGER NOT NULL,
+            primeiro_concurso INTEGER,
+            ultimo_concurso INTEGER,
+            PRIMARY KEY (lottery_type, numero)
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pattern_histograms (
+            lottery_type TEXT NOT NULL,
+            padrao TEXT NOT NULL,
+            valor INTEGER NOT NULL,
+            quantidade INTEGER NOT NULL,
+            PRIMARY KEY (lottery_type, padrao, valor)
+        )
+        ''')
+        
+        # Ponto de retomada de downloads longos interrompidos
+        self._create_checkpoint_table(cursor)
+        
         # Índices para melhor performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_lottery_concurso ON concursos(lottery_type, concurso)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_lottery_type ON concursos(lottery_type)')
         
+        self._migrate_schema(cursor)
+        
+        # Janelas por data (depende da coluna criada pela migração em caches antigos)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_lottery_data ON concursos(lottery_type, data_ordinal)')
+        
+        if not had_aggregates:
+            # Cache anterior às tabelas agregadas: calcula uma vez a partir dos concursos
+            for (lottery_type,) in cursor.execute('SELECT DISTINCT lottery_type FROM concursos').fetchall():
+                self._rebuild_aggregates(cursor, lottery_type)
+        
         conn.commit()
         conn.close()
     
+    def _create_checkpoint_table(self, cursor):
+        """Um ponto de retomada por download (loteria + operação), não um por loteria"""
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS download_checkpoints (
+            lottery_type TEXT NOT NULL,
+            operacao TEXT NOT NULL,
+            inicio INTEGER NOT NULL,
+            fim INTEGER NOT NULL,
+            proximo_concurso INTEGER NOT NULL,
+            data_inicio TIMESTAMP,
+            data_atualizacao TIMESTAMP,
+            PRIMARY KEY (lottery_type, operacao)
+        )
+        ''')
+    
+    def _migrate_schema(self, cursor):
+        """Atualiza caches criados por versões anteriores"""
+        stats_columns = {row[1] for row in cursor.execute('PRAGMA table_info(cache_stats)')}
+        if 'data_ultima_verificacao' not in stats_columns:
+            # Momento da última consulta ao "último concurso" da API
+            cursor.execute('ALTER TABLE cache_stats ADD COLUMN data_ultima_verificacao TIMESTAMP')
+        
+        concursos_columns = {row[1] for row in cursor.execute('PRAGMA table_info(concursos)')}
+        if 'data_ordinal' not in concursos_columns:
+            # Data como inteiro ordenável; preenchida a partir do texto 'dd/mm/aaaa' já gravado
+            cursor.execute('ALTER TABLE concursos ADD COLUMN data_ordinal INTEGER')
+            rows = cursor.execute('SELECT id, data FROM concursos').fetchall()
+            cursor.executemany(
+                'UPDATE concursos SET data_ordinal = ? WHERE id = ?',
+                [(date_ordinal(data), row_id) for row_id, data in rows]
+            )
+            if rows:
+                print(f"🔧 Cache migrado: datas indexadas para {len(rows)} concursos")
+        
+        checkpoint_columns = {row[1] for row in cursor.execute('PRAGMA table_info(download_checkpoints)')}
+        if 'operacao' not in checkpoint_columns:
+            # Versões anteriores guardavam um único ponto por loteria (sempre do histórico completo)
+            old = cursor.execute(
+                'SELECT lottery_type, inicio, fim, proximo_concurso, data_atualizacao FROM download_checkpoints'
+            ).fetchall()
+            cursor.execute('DROP TABLE download_checkpoints')
+            self._create_checkpoint_table(cursor)
+            cursor.executemany('''
+            INSERT INTO download_checkpoints
+            (lottery_type, operacao, inicio, fim, proximo_concurso, data_atualizacao)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(lottery_type, f"historico:{inicio}", inicio, fim, proximo, updated)
+                  for lottery_type, inicio, fim, proximo, updated in old])
+    
     def get_cached_results(self, lottery_type: str, start_concurso: int, end_concurso: int) -> List[Dict]:
-        """Busca concursos no cache"""
+        """Busca concursos no cache (pelo snapshot memory-mapped quando está em dia)"""
+        snapshot = self.get_snapshot(lottery_type)
+        if snapshot is not None:
+            return snapshot.to_results(snapshot.window(start_concurso, end_concurso))
+        
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
@@ -68,45 +219,114 @@ class LotteryCacheManager:
         ORDER BY concurso
         ''', (lottery_type, start_concurso, end_concurso))
         
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'concurso': row['concurso'],
-                'data': row['data'],
-                'numeros': json.loads(row['numeros']),
-                'numeros_ordenados': sorted(json.loads(row['numeros']))
-            })
+        rows = cursor.fetchall()
+        conn.close()
+        return self._rows_to_results(rows)
+    
+    def get_results_between_dates(self, lottery_type: str, start: date, end: date) -> List[Dict]:
+        """Concursos sorteados entre duas datas (inclusive), por uma consulta no índice de datas"""
+        snapshot = self.get_snapshot(lottery_type)
+        if snapshot is not None:
+            return snapshot.to_results(snapshot.date_window(start, end))
         
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT concurso, data, numeros
+        FROM concursos
+        WHERE lottery_type = ? AND data_ordinal BETWEEN ? AND ?
+        ORDER BY concurso
+        ''', (lottery_type, start.toordinal(), end.toordinal()))
+        
+        rows = cursor.fetchall()
         conn.close()
-        return results
+        return self._rows_to_results(rows)
     
-    def save_results(self, lottery_type: str, results: List[Dict]):
-        """Salva resultados no cache"""
-        if not results:
+    def _rows_to_results(self, rows) -> List[Dict]:
+        """Converte linhas (concurso, data, numeros) no formato de resultado"""
+        if not rows:
+            return []
+        
+        # Um único json.loads para todas as linhas (histórico completo em uma passada)
+        all_numbers = json.loads('[' + ','.join(row['numeros'] for row in rows) + ']')
+        
+        return [
+            {
+                'concurso': row['concurso'],
+                'data': row['data'],
+                'numeros': numbers,
+                'numeros_ordenados': sorted(numbers)
+            }
+            for row, numbers in zip(rows, all_numbers)
+        ]
+    
+    def save_results(self, lottery_type: str, results: List[Dict], checkpoint: Tuple[int, int, int] = None):
+        """
+        Salva resultados no cache
+        
+        Args:
+            checkpoint: (operacao, inicio, fim, proximo_concurso) do download em
+                andamento, gravado na mesma transação dos concursos
+        """
+        if not results and not checkpoint:
             return
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        if checkpoint:
+            # data_inicio fica a do primeiro lote: na retomada, o que foi gravado depois dela está feito
+            cursor.execute('''
+            INSERT INTO download_checkpoints
+            (lottery_type, operacao, inicio, fim, proximo_concurso, data_inicio, data_atualizacao)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT(lottery_type, operacao) DO UPDATE SET
+                inicio = excluded.inicio,
+                fim = excluded.fim,
+                proximo_concurso = excluded.proximo_concurso,
+                data_atualizacao = excluded.data_atualizacao
+            ''', (lottery_type, *checkpoint, datetime.now().isoformat()))
+        
+        if not results:
+            conn.commit()
+            conn.close()
+            return
+        
+        # Concursos já gravados que serão substituídos (afeta a atualização dos agregados)
+        previous = self._stored_numbers(cursor, lottery_type, [r['concurso'] for r in results])
+        
         for result in results:
             cursor.execute('''
-            INSERT OR REPLACE INTO concursos (lottery_type, concurso, data, numeros)
-            VALUES (?, ?, ?, ?)
+            INSERT OR REPLACE INTO concursos (lottery_type, concurso, data, numeros, data_ordinal)
+            VALUES (?, ?, ?, ?, ?)
             ''', (
                 lottery_type,
                 result['concurso'],
                 result['data'],
-                json.dumps(result['numeros'])
+                json.dumps(result['numeros']),
+                date_ordinal(result['data'])
             ))
+            
+            if result.get('raw'):
+                self._archive_raw(cursor, lottery_type, result['concurso'], result['raw'], result.get('fonte'))
+        
+        self._update_aggregates(cursor, lottery_type, results, previous)
         
         # Atualiza estatísticas
         concursos = [r['concurso'] for r in results]
         datas = [r['data'] for r in results if r['data']]
         
         cursor.execute('''
-        INSERT OR REPLACE INTO cache_stats 
+        INSERT INTO cache_stats 
         (lottery_type, ultimo_concurso, total_concursos, data_ultima_atualizacao, data_primeiro_concurso)
         VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(lottery_type) DO UPDATE SET
+            ultimo_concurso = MAX(COALESCE(ultimo_concurso, 0), excluded.ultimo_concurso),
+            total_concursos = excluded.total_concursos,
+            data_ultima_atualizacao = excluded.data_ultima_atualizacao,
+            data_primeiro_concurso = excluded.data_primeiro_concurso
         ''', (
             lottery_type,
             max(concursos) if concursos else 0,
@@ -117,16 +337,264 @@ class LotteryCacheManager:
         
         conn.commit()
         conn.close()
+        
+        # Lotes intermediários de um download só invalidam; o lote final entra no snapshot
+        # (só as linhas novas; releitura completa do SQLite apenas se ele estava inválido)
+        if checkpoint:
+            invalidate_snapshot(self.snapshot_dir, lottery_type)
+        else:
+            self._merge_into_snapshot(lottery_type, results)
+    
+    def _stored_numbers(self, cursor, lottery_type: str, concursos: List[int]) -> Dict[int, List[int]]:
+        """Dezenas já gravadas para os concursos informados"""
+        stored = {}
+        for start in range(0, len(concursos), 500):
+            chunk = concursos[start:start + 500]
+            cursor.execute(f'''
+            SELECT concurso, numeros FROM concursos
+            WHERE lottery_type = ? AND concurso IN ({','.join('?' * len(chunk))})
+            ''', (lottery_type, *chunk))
+            stored.update((concurso, json.loads(numeros)) for concurso, numeros in cursor.fetchall())
+        return stored
+    
+    def _update_aggregates(self, cursor, lottery_type: str, results: List[Dict], previous: Dict[int, List[int]]):
+        """
+        Atualiza number_stats e pattern_histograms na transação do save_results
+        
+        Concursos novos são somados incrementalmente; se algum concurso já gravado
+        mudou de dezenas, os agregados da loteria são recalculados.
+        """
+        latest = {r['concurso']: r for r in results}
+        if any(sorted(previous[c]) != sorted(r['numeros']) for c, r in latest.items() if c in previous):
+            self._rebuild_aggregates(cursor, lottery_type)
+            return
+        
+        self._add_to_aggregates(
+            cursor, lottery_type, [(c, r['numeros']) for c, r in latest.items() if c not in previous]
+        )
+    
+    def _add_to_aggregates(self, cursor, lottery_type: str, draws: List[Tuple[int, List[int]]]):
+        """Soma concursos (concurso, dezenas) às tabelas agregadas"""
+        if not draws:
+            return
+        
+        mid = low_high_midpoint(lottery_type)
+        frequency = Counter()
+        first_seen = {}
+        last_seen = {}
+        histograms = Counter()
+        
+        for concurso, numbers in draws:
+            for num in numbers:
+                frequency[num] += 1
+                first_seen[num] = min(first_seen.get(num, concurso), concurso)
+                last_seen[num] = max(last_seen.get(num, concurso), concurso)
+            histograms[('pares', sum(1 for n in numbers if n % 2 == 0))] += 1
+            histograms[('baixos', sum(1 for n in numbers if n <= mid))] += 1
+            histograms[('soma', sum(numbers))] += 1
+        
+        cursor.executemany('''
+        INSERT INTO number_stats (lottery_type, numero, frequencia, primeiro_concurso, ultimo_concurso)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(lottery_type, numero) DO UPDATE SET
+            frequencia = frequencia + excluded.frequencia,
+            primeiro_concurso = MIN(primeiro_concurso, excluded.primeiro_concurso),
+            ultimo_concurso = MAX(ultimo_concurso, excluded.ultimo_concurso)
+        ''', [(lottery_type, num, count, first_seen[num], last_seen[num]) for num, count in frequency.items()])
+        
+        cursor.executemany('''
+        INSERT INTO pattern_histograms (lottery_type, padrao, valor, quantidade)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(lottery_type, padrao, valor) DO UPDATE SET
+            quantidade = quantidade + excluded.quantidade
+        ''', [(lottery_type, padrao, valor, count) for (padrao, valor), count in histograms.items()])
+    
+    def _rebuild_aggregates(self, cursor, lottery_type: str):
+        """Recalcula do zero os agregados de uma loteria a partir dos concursos gravados"""
+        cursor.execute('DELETE FROM number_stats WHERE lottery_type = ?', (lottery_type,))
+        cursor.execute('DELETE FROM pattern_histograms WHERE lottery_type = ?', (lottery_type,))
+        
+        rows = cursor.execute(
+            'SELECT concurso, numeros FROM concursos WHERE lottery_type = ?', (lottery_type,)
+        ).fetchall()
+        self._add_to_aggregates(cursor, lottery_type, [(concurso, json.loads(numeros)) for concurso, numeros in rows])
+    
+    def get_number_stats(self, lottery_type: str) -> Dict[int, Dict]:
+        """Frequência, primeira e última aparição de cada número no histórico em cache"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT numero, frequencia, primeiro_concurso, ultimo_concurso
+        FROM number_stats WHERE lottery_type = ?
+        ORDER BY numero
+        ''', (lottery_type,))
+        stats = {
+            numero: {'frequencia': frequencia, 'primeiro_concurso': primeiro, 'ultimo_concurso': ultimo}
+            for numero, frequencia, primeiro, ultimo in cursor.fetchall()
+        }
+        
+        conn.close()
+        return stats
     
-    def get_missing_concursos(self, lottery_type: str, start_concurso: int, end_concurso: int) -> List[int]:
-        """Retorna lista de concursos faltantes no cache"""
+    def get_pattern_histograms(self, lottery_type: str) -> Dict[str, Dict[int, int]]:
+        """Histogramas {padrão: {valor: concursos}} de pares, baixos e soma"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT padrao, valor, quantidade FROM pattern_histograms
+        WHERE lottery_type = ?
+        ORDER BY padrao, valor
+        ''', (lottery_type,))
+        histograms = defaultdict(dict)
+        for padrao, valor, quantidade in cursor.fetchall():
+            histograms[padrao][valor] = quantidade
+        
+        conn.close()
+        return dict(histograms)
+    
+    def refresh_snapshot(self, lottery_type: str) -> int:
+        """Regrava o snapshot colunar da loteria a partir do SQLite"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT concurso, data_ordinal, numeros FROM concursos
+        WHERE lottery_type = ?
+        ORDER BY concurso
+        ''', (lottery_type,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        if not rows:
+            invalidate_snapshot(self.snapshot_dir, lottery_type)
+            return 0
+        
+        all_numbers = json.loads('[' + ','.join(row[2] for row in rows) + ']')
+        try:
+            return write_snapshot(
+                self.snapshot_dir, lottery_type,
+                [(concurso, ordinal, numbers) for (concurso, ordinal, _), numbers in zip(rows, all_numbers)]
+            )
+        except OSError as e:
+            # Sem snapshot o cache continua funcionando pelo SQLite
+            print(f"⚠️  Não foi possível gravar o snapshot de {lottery_type}: {e}")
+            invalidate_snapshot(self.snapshot_dir, lottery_type)
+            return 0
+    
+    def _merge_into_snapshot(self, lottery_type: str, results: List[Dict]):
+        """Acrescenta ao snapshot os concursos recém-gravados (ou o regrava, se estiver inválido)"""
+        rows = [(r['concurso'], date_ordinal(r['data']), r['numeros']) for r in results]
+        try:
+            merged = merge_snapshot(self.snapshot_dir, lottery_type, rows)
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar o snapshot de {lottery_type}: {e}")
+            invalidate_snapshot(self.snapshot_dir, lottery_type)
+            return
+        if merged is None:
+            self.refresh_snapshot(lottery_type)
+    
+    def get_snapshot(self, lottery_type: str) -> DrawSnapshot:
+        """Snapshot memory-mapped da loteria, ou None se ausente/desatualizado"""
+        return load_snapshot(self.snapshot_dir, lottery_type)
+    
+    def _archive_raw(self, cursor, lottery_type: str, concurso: int, payload: Dict, source: str = None):
+        """Guarda a resposta bruta comprimida (blobs idênticos são armazenados uma vez)"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(canonical).hexdigest()
+        
+        cursor.execute('''
+        INSERT OR IGNORE INTO raw_blobs (sha256, payload, tamanho) VALUES (?, ?, ?)
+        ''', (digest, zlib.compress(canonical, 6), len(canonical)))
+        cursor.execute('''
+        INSERT OR REPLACE INTO raw_respostas (lottery_type, concurso, fonte, sha256, data_download)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (lottery_type, concurso, source, digest, datetime.now().isoformat()))
+    
+    def get_raw_payload(self, lottery_type: str, concurso: int) -> Dict:
+        """Resposta original da API para um concurso (premiação, ganhadores etc.) ou None"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT b.payload FROM raw_respostas r JOIN raw_blobs b ON b.sha256 = r.sha256
+        WHERE r.lottery_type = ? AND r.concurso = ?
+        ''', (lottery_type, concurso))
+        row = cursor.fetchone()
+        
+        conn.close()
+        return json.loads(zlib.decompress(row[0])) if row else None
+    
+    def iter_raw_payloads(self, lottery_type: str):
+        """Percorre (concurso, fonte, resposta) do arquivo bruto, em ordem de concurso"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT r.concurso, r.fonte, b.payload FROM raw_respostas r JOIN raw_blobs b ON b.sha256 = r.sha256
+        WHERE r.lottery_type = ?
+        ORDER BY r.concurso
+        ''', (lottery_type,))
+        
+        try:
+            for concurso, source, payload in cursor:
+                yield concurso, source, json.loads(zlib.decompress(payload))
+        finally:
+            conn.close()
+    
+    def rebuild_from_archive(self, lottery_type: str) -> int:
+        """
+        Reconstrói os concursos da loteria a partir do arquivo bruto, sem rede
+        
+        Útil quando o esquema ou o parser mudam. Retorna a quantidade de concursos regravados.
+        """
+        results = []
+        for concurso, source, payload in self.iter_raw_payloads(lottery_type):
+            record = normalize_payload(payload, lottery_type, source)
+            if record:
+                results.append(record.to_result())
+        
+        self.save_results(lottery_type, results)
+        return len(results)
+    
+    def get_checkpoint(self, lottery_type: str, operation: str) -> Dict:
+        """Download interrompido da operação (ou None)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM download_checkpoints WHERE lottery_type = ? AND operacao = ?',
+                       (lottery_type, operation))
+        row = cursor.fetchone()
+        
+        conn.close()
+        return dict(row) if row else None
+    
+    def clear_checkpoint(self, lottery_type: str, operation: str):
+        """Remove o ponto de retomada de um download concluído (os das outras operações ficam)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('DELETE FROM download_checkpoints WHERE lottery_type = ? AND operacao = ?',
+                     (lottery_type, operation))
+        conn.commit()
+        conn.close()
+    
+    def get_missing_concursos(self, lottery_type: str, start_concurso: int, end_concurso: int,
+                              saved_since: str = None) -> List[int]:
+        """
+        Retorna lista de concursos faltantes no cache
+        
+        Args:
+            saved_since: Considera faltantes também os gravados antes deste momento
+                (data_inicio de um ponto de retomada)
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
         SELECT concurso FROM concursos 
-        WHERE lottery_type = ? AND concurso BETWEEN ? AND ?
-        ''', (lottery_type, start_concurso, end_concurso))
+        WHERE lottery_type = ? AND concurso BETWEEN ? AND ? AND data_atualizacao >= COALESCE(?, '')
+        ''', (lottery_type, start_concurso, end_concurso, saved_since))
         
         cached = set(row[0] for row in cursor.fetchall())
         all_concursos = set(range(start_concurso, end_concurso + 1))
@@ -169,35 +637,157 @@ class LotteryCacheManager:
                 'status': 'vazio'
             }
     
-    def clear_cache(self, lottery_type: str = None):
-        """Limpa o cache (tudo ou de uma loteria específica)"""
+    def clear_cache(self, lottery_type: str = None, include_archive: bool = False):
+        """
+        Limpa o cache (tudo ou de uma loteria específica)
+        
+        O arquivo de respostas brutas é preservado (permite reconstruir sem rede),
+        a menos que include_archive=True.
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        if include_archive:
+            if lottery_type:
+                cursor.execute('DELETE FROM raw_respostas WHERE lottery_type = ?', (lottery_type,))
+            else:
+                cursor.execute('DELETE FROM raw_respostas')
+            cursor.execute('DELETE FROM raw_blobs WHERE sha256 NOT IN (SELECT sha256 FROM raw_respostas)')
+        
         if lottery_type:
             cursor.execute('DELETE FROM concursos WHERE lottery_type = ?', (lottery_type,))
             cursor.execute('DELETE FROM cache_stats WHERE lottery_type = ?', (lottery_type,))
+            cursor.execute('DELETE FROM download_checkpoints WHERE lottery_type = ?', (lottery_type,))
+            cursor.execute('DELETE FROM number_stats WHERE lottery_type = ?', (lottery_type,))
+            cursor.execute('DELETE FROM pattern_histograms WHERE lottery_type = ?', (lottery_type,))
         else:
             cursor.execute('DELETE FROM concursos')
             cursor.execute('DELETE FROM cache_stats')
+            cursor.execute('DELETE FROM download_checkpoints')
+            cursor.execute('DELETE FROM number_stats')
+            cursor.execute('DELETE FROM pattern_histograms')
         
         conn.commit()
         conn.close()
+        
+        if lottery_type:
+            invalidate_snapshot(self.snapshot_dir, lottery_type)
+        elif os.path.isdir(self.snapshot_dir):
+            for name in os.listdir(self.snapshot_dir):
+                invalidate_snapshot(self.snapshot_dir, name)
     
     def is_cache_stale(self, lottery_type: str, max_age_hours: int = 24) -> bool:
-        """Verifica se o cache está desatualizado"""
-        stats = self.get_cache_stats(lottery_type)
-        if 'data_ultima_atualizacao' not in stats:
+        """Verifica se o cache está desatualizado (sem download nem consulta à API recente)"""
+        state = self.get_sync_state(lottery_type)
+        if not state:
             return True
         
-        try:
-            last_update = datetime.fromisoformat(stats['data_ultima_atualizacao'])
-            return (datetime.now() - last_update) > timedelta(hours=max_age_hours)
-        except:
+        last_contact = max(filter(None, [state['ultima_atualizacao'], state['ultima_verificacao']]), default=None)
+        if last_contact is None:
             return True
+        return (datetime.now() - last_contact) > timedelta(hours=max_age_hours)
+    
+    def mark_checked(self, lottery_type: str):
+        """Registra que o último concurso da API acabou de ser consultado"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        INSERT INTO cache_stats (lottery_type, total_concursos, data_ultima_verificacao)
+        VALUES (?, 0, ?)
+        ON CONFLICT(lottery_type) DO UPDATE SET data_ultima_verificacao = excluded.data_ultima_verificacao
+        ''', (lottery_type, datetime.now().isoformat()))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_sync_state(self, lottery_type: str) -> Dict:
+        """
+        Último concurso em cache e momentos da última atualização/consulta
+        
+        Retorna None se não há concursos da loteria no cache.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT concurso, data FROM concursos
+        WHERE lottery_type = ?
+        ORDER BY concurso DESC LIMIT 1
+        ''', (lottery_type,))
+        latest = cursor.fetchone()
+        
+        cursor.execute('''
+        SELECT data_ultima_atualizacao, data_ultima_verificacao FROM cache_stats WHERE lottery_type = ?
+        ''', (lottery_type,))
+        stats = cursor.fetchone() or (None, None)
+        
+        conn.close()
+        
+        if not latest:
+            return None
+        
+        def parse_timestamp(value):
+            try:
+                return datetime.fromisoformat(value) if value else None
+            except ValueError:
+                return None
+        
+        return {
+            'ultimo_concurso': latest[0],
+            'data_ultimo_concurso': latest[1],
+            'ultima_atualizacao': parse_timestamp(stats[0]),
+            'ultima_verificacao': parse_timestamp(stats[1])
+        }
+
+
+def cached_overview(cache_manager: LotteryCacheManager, lottery_type: str) -> Dict:
+    """
+    Resumo de todo o histórico em cache lido das tabelas agregadas
+
+    Não carrega nem percorre concursos (nem cria um analisador): o custo não
+    depende do tamanho do histórico. A faixa de números vem do registro de
+    loterias. Retorna {} se não há concursos da loteria no cache.
+    """
+    number_stats = cache_manager.get_number_stats(lottery_type)
+    if not number_stats:
+        return {}
+    histograms = cache_manager.get_pattern_histograms(lottery_type)
+
+    def weighted_mean(histogram):
+        total = sum(histogram.values())
+        return sum(valor * count for valor, count in histogram.items()) / total if total else 0
+
+    total_draws = sum(histograms.get('soma', {}).values())
+    last_concurso = max(s['ultimo_concurso'] for s in number_stats.values())
+    numbers = get_lottery(lottery_type).range
+    # Todos os números da loteria: os nunca sorteados entram com frequência 0
+    frequencies = {num: number_stats[num]['frequencia'] if num in number_stats else 0 for num in numbers}
+    ranking = sorted(frequencies.items(), key=lambda x: (-x[1], x[0]))
+
+    # Atraso em concursos desde a última aparição (números nunca sorteados contam o histórico todo)
+    delays = {num: last_concurso - number_stats[num]['ultimo_concurso'] if num in number_stats else total_draws
+              for num in numbers}
+
+    return {
+        'total_concursos': total_draws,
+        'ultimo_concurso': last_concurso,
+        'frequencias': frequencies,
+        'mais_frequentes': ranking[:10],
+        'menos_frequentes': ranking[-10:],
+        'frequencia_media': np.mean(list(frequencies.values())),
+        'frequencia_desvio': np.std(list(frequencies.values())),
+        'mais_atrasados': sorted(delays.items(), key=lambda x: x[1], reverse=True)[:15],
+        'media_pares': weighted_mean(histograms.get('pares', {})),
+        'media_baixos': weighted_mean(histograms.get('baixos', {})),
+        'media_soma': weighted_mean(histograms.get('soma', {})),
+        'histogramas': histograms
+    }
+
 
 class LotteryPatternAnalyzer:
-    def __init__(self, lottery_type: str = "megasena", last_n_games: int = None, years: int = None):
+    def __init__(self, lottery_type: str = "megasena", last_n_games: int = None, years: int = None,
+                 full_history: bool = False, cache_manager: LotteryCacheManager = None):
         """
         Analisador de padrões para loterias da Caixa com cache
         
@@ -205,57 +795,21 @@ class LotteryPatternAnalyzer:
             lottery_type: Tipo de loteria (megasena, lotofacil, quina, etc.)
             last_n_games: Quantidade de concursos a analisar (sobrescreve years se ambos fornecidos)
             years: Quantidade de anos a analisar (calcula automaticamente os concursos)
+            full_history: Analisa do concurso 1 ao último (ignora last_n_games e years)
+            cache_manager: Cache a usar (padrão: lottery_cache.db no diretório atual)
         """
         self.lottery_type = lottery_type
+        self.full_history = full_history
         
-        # Configurações detalhadas por loteria
-        self.lottery_config = {
-            "megasena": {
-                "range": range(1, 61), 
-                "draw_size": 6, 
-                "weekly_draws": 2,
-                "description": "Mega-Sena: 60 números, sorteios às quartas e sábados"
-            },
-            "lotofacil": {
-                "range": range(1, 26), 
-                "draw_size": 15, 
-                "weekly_draws": 3,
-                "description": "Lotofácil: 25 números, sorteios às segundas, quartas e sextas"
-            },
-            "quina": {
-                "range": range(1, 81), 
-                "draw_size": 5, 
-                "weekly_draws": 6,
-                "description": "Quina: 80 números, sorteios de segunda a sábado"
-            },
-            "lotomania": {
-                "range": range(0, 100), 
-                "draw_size": 20, 
-                "weekly_draws": 2,
-                "description": "Lotomania: 100 números (0-99), sorteios às terças e sextas"
-            },
-            "duplasena": {
-                "range": range(1, 51), 
-                "draw_size": 6, 
-                "weekly_draws": 3,
-                "description": "Dupla Sena: 50 números, sorteios às terças, quintas e sábados"
-            },
-            "diadesorte": {
-                "range": range(1, 32), 
-                "draw_size": 7, 
-                "weekly_draws": 2,
-                "description": "Dia de Sorte: 31 números, sorteios às terças e sextas"
-            },
-            "timemania": {
-                "range": range(1, 81), 
-                "draw_size": 7, 
-                "weekly_draws": 3,
-                "description": "Timemania: 80 números, sorteios às terças, quintas e sábados"
-            }
-        }
+        # Definição compartilhada da loteria (registro em lotteries.py)
+        self.lottery = get_lottery(lottery_type)
         
         # Calcula quantidade de concursos baseado em anos se fornecido
-        if years is not None and last_n_games is None:
+        if full_history:
+            last_n_games = 100  # Substituído pelo último concurso conhecido
+            self.years = None
+            print(f"📚 Configurado para analisar o histórico completo de {lottery_type}")
+        elif years is not None and last_n_games is None:
             last_n_games = self._calculate_games_from_years(years)
             self.years = years
             print(f"📅 Configurado para analisar aproximadamente {years} ano(s) "
@@ -268,85 +822,125 @@ class LotteryPatternAnalyzer:
             
         self.last_n_games = last_n_games
         self.results = []
+        self._matrix_cache = None
+        self._index_cache = None
+        self._features_cache = None
+        self._patterns_cache = None
         self.numbers_range = self._get_numbers_range()
         self.draw_size = self._get_draw_size()
         
         # Inicializa gerenciador de cache
-        self.cache_manager = LotteryCacheManager()
+        self.cache_manager = cache_manager or LotteryCacheManager()
+        self.offline_first = True
+        
+        if full_history:
+            # Estimativa até a primeira busca: o último concurso conhecido no cache
+            state = self.cache_manager.get_sync_state(lottery_type)
+            if state:
+                self.last_n_games = state['ultimo_concurso']
+        
+        # Fontes de resultados (Caixa + espelho) com limite de taxa compartilhado no processo
+        self.fetcher = get_shared_fetcher()
+        
+        # Canal de progresso: eventos coalescidos para console e interface
+        self.progress_bus = ProgressBus()
+        self.console_subscription = self.progress_bus.subscribe(console_printer, max_rate=1.0)
         self.progress_callback = None
+        self._progress_subscription = None
     
-    def set_progress_callback(self, callback):
-        """Define uma função de callback para atualizar progresso"""
+    def set_progress_callback(self, callback, max_rate: float = None):
+        """
+        Define uma função de callback para atualizar progresso
+        
+        O callback recebe o texto do último ProgressEvent, no máximo `max_rate` vezes por segundo.
+        """
+        if self._progress_subscription:
+            self._progress_subscription.cancel()
+            self._progress_subscription = None
+        
         self.progress_callback = callback
+        if callback:
+            self._progress_subscription = self.progress_bus.subscribe(
+                lambda event: callback(event.format()), max_rate=max_rate
+            )
+    
+    def subscribe_progress(self, callback, max_rate: float = None):
+        """Inscreve um consumidor de ProgressEvent no canal de progresso do analisador"""
+        return self.progress_bus.subscribe(callback, max_rate=max_rate)
     
     def _calculate_games_from_years(self, years: int) -> int:
         """Calcula quantidade aproximada de concursos baseado em anos"""
-        config = self.lottery_config.get(self.lottery_type)
-        if not config:
-            return 100  # Valor padrão se loteria não encontrada
-            
-        weekly_draws = config["weekly_draws"]
-        
         # Cálculo: semanas por ano (52) × sorteios por semana × anos
         # Considera que a maioria dos sorteios ocorre, exceto em feriados
-        games_per_year = weekly_draws * 52
-        total_games = int(games_per_year * years)
-        
-        # Ajuste para concursos disponíveis na API
-        # A API pode não ter todos os concursos históricos
-        if total_games > 3000:  # Limite prático
-            total_games = 3000
-            print(f"⚠️  Limitando a {total_games} concursos (máximo prático para API)")
-            
+        total_games = int(self.lottery.games_per_year * years)
+        
+        # Sem limite: janelas maiores que o histórico são ajustadas em fetch_results
         return total_games
     
     def _get_numbers_range(self) -> range:
         """Define o range de números baseado no tipo de loteria"""
-        config = self.lottery_config.get(self.lottery_type)
-        if config:
-            return config["range"]
-        return range(1, 61)  # Default para Mega-Sena
+        return self.lottery.range
     
     def _get_draw_size(self) -> int:
         """Quantidade de números sorteados por concurso"""
-        config = self.lottery_config.get(self.lottery_type)
-        if config:
-            return config["draw_size"]
-        return 6  # Default para Mega-Sena
+        return self.lottery.draw_size
+    
+    def get_raw_result(self, concurso: int) -> Dict:
+        """Resposta completa da API guardada no cache (premiação, ganhadores...), sem rede"""
+        return self.cache_manager.get_raw_payload(self.lottery_type, concurso)
     
     def get_lottery_info(self) -> Dict:
         """Retorna informações detalhadas sobre a loteria configurada"""
-        config = self.lottery_config.get(self.lottery_type, {})
         return {
             "tipo": self.lottery_type,
             "faixa_numeros": f"{self.numbers_range[0]}-{self.numbers_range[-1]}",
             "quantidade_numeros": len(list(self.numbers_range)),
             "numeros_por_sorteio": self.draw_size,
-            "sorteios_semana": config.get("weekly_draws", 0),
-            "descricao": config.get("description", ""),
+            "sorteios_semana": self.lottery.weekly_draws,
+            "descricao": self.lottery.description,
             "concursos_configurados": self.last_n_games,
             "anos_equivalentes": self.years
         }
     
-    def fetch_results(self, num_games: int = None, use_cache: bool = True) -> List[Dict]:
-        """Busca resultados da API da Caixa com cache"""
+    def fetch_results(self, num_games: int = None, use_cache: bool = True,
+                      cancel_token: CancellationToken = None, offline_first: bool = None) -> List[Dict]:
+        """
+        Busca resultados da API da Caixa com cache
+
+        Args:
+            num_games: Quantidade de concursos (padrão: last_n_games)
+            use_cache: Usa o cache local para evitar downloads repetidos
+            cancel_token: Token que interrompe a busca entre requisições (levanta OperationCancelled)
+            offline_first: Usa o calendário de sorteios para evitar consultar o último
+                concurso quando o cache está em dia (padrão: self.offline_first)
+        """
         if num_games is None:
             num_games = self.last_n_games
+        if offline_first is None:
+            offline_first = self.offline_first
         
-        base_url = "https://servicebus2.caixa.gov.br/portaldeloterias/api"
         all_results = []
         
         # Mostra informações sobre a busca
-        if self.years:
+        if self.full_history:
+            print(f"🔍 Buscando o histórico completo de {self.lottery_type}...")
+        elif self.years:
             print(f"🔍 Buscando {num_games} concursos (≈{self.years} ano(s)) de {self.lottery_type}...")
         else:
             print(f"🔍 Buscando {num_games} concursos de {self.lottery_type}...")
         
-        # Busca o último concurso primeiro
+        # Descobre o último concurso (pelo cache, se estiver em dia, ou pela API)
         try:
-            response = requests.get(f"{base_url}/{self.lottery_type}", timeout=15)
-            latest = response.json()
-            last_number = latest['numero']
+            check_cancelled(cancel_token)
+            last_number = None
+            if use_cache and offline_first:
+                last_number = self._resolve_cached_last_number()
+            if last_number is None:
+                last_number = self._fetch_latest_number(cancel_token)
+            
+            if self.full_history:
+                num_games = last_number
+                self.last_n_games = last_number
             
             # Verifica se há concursos suficientes disponíveis
             if last_number < num_games:
@@ -372,12 +966,10 @@ class LotteryPatternAnalyzer:
                 
                 if missing:
                     print(f"⬇️  Baixando {len(missing)} concursos faltantes...")
-                    missing_results = self._fetch_missing_concursos(missing, last_number)
+                    missing_results = self._fetch_missing_concursos(missing, last_number, cancel_token)
                     
-                    if missing_results:
-                        # Salva no cache
-                        self.cache_manager.save_results(self.lottery_type, missing_results)
-                        all_results.extend(missing_results)
+                    # Os concursos baixados já foram salvos no cache
+                    all_results.extend(missing_results)
                     
                     print(f"✅ Total: {len(all_results)} concursos ({cached_count} do cache + {len(missing_results)} baixados)")
                 else:
@@ -385,112 +977,344 @@ class LotteryPatternAnalyzer:
             else:
                 # Busca tudo da API (sem cache)
                 print("🔄 Ignorando cache, baixando todos os concursos...")
-                all_results = self._fetch_all_concursos(start, last_number)
-                
-                # Salva no cache
-                self.cache_manager.save_results(self.lottery_type, all_results)
+                all_results = self._fetch_all_concursos(start, last_number, cancel_token)
                 print(f"✅ {len(all_results)} concursos baixados e salvos no cache")
+            
+            if self.years and all_results:
+                all_results = self._exact_years_window(all_results, cancel_token)
                     
+        except OperationCancelled:
+            raise
         except Exception as e:
             print(f"Erro ao buscar dados: {e}")
-            print("Usando dados de exemplo para demonstração...")
-            # Fallback: usar dados de exemplo se API falhar
-            all_results = self._generate_sample_data()
+            all_results = self._load_cached_window(num_games) if use_cache else []
+            if all_results:
+                print(f"📴 Sem conexão: usando {len(all_results)} concursos do cache")
+            else:
+                print("Usando dados de exemplo para demonstração...")
+                # Fallback: usar dados de exemplo se API falhar
+                all_results = self._generate_sample_data()
         
         # Ordena por concurso
         all_results.sort(key=lambda x: x['concurso'])
         self.results = all_results
         return all_results
     
-    def _fetch_missing_concursos(self, missing: List[int], last_number: int) -> List[Dict]:
-        """Busca apenas os concursos faltantes"""
-        results = []
-        base_url = "https://servicebus2.caixa.gov.br/portaldeloterias/api"
+    def _fetch_latest_number(self, cancel_token: CancellationToken = None) -> int:
+        """Consulta na API o número do último concurso"""
+        latest = self.fetcher.fetch_latest(self.lottery_type, cancel_token=cancel_token)
+        if latest is None:
+            raise FetchError(f"Loteria {self.lottery_type} não encontrada na API")
+        
+        last_number = latest.concurso
+        self.cache_manager.mark_checked(self.lottery_type)
+        return last_number
+    
+    def _resolve_cached_last_number(self) -> int:
+        """
+        Último concurso a partir do cache, sem rede, quando nenhum sorteio novo é esperado
         
-        for i, concurso in enumerate(missing, 1):
-            try:
-                if self.progress_callback:
-                    self.progress_callback(f"Baixando concurso {concurso}/{last_number} ({i}/{len(missing)})")
-                
-                url = f"{base_url}/{self.lottery_type}/{concurso}"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    numbers = [int(num) for num in data.get('dezenasSorteadasOrdemSorteio', [])]
-                    
-                    if numbers:
-                        results.append({
-                            'concurso': concurso,
-                            'data': data.get('dataApuracao', ''),
-                            'numeros': numbers,
-                            'numeros_ordenados': sorted(numbers)
-                        })
-                
-                # Progresso a cada 10 concursos
-                if i % 10 == 0 or i == len(missing):
-                    print(f"   {i}/{len(missing)} concursos baixados...")
-                
-                # Pequena pausa para não sobrecarregar o servidor
-                time.sleep(0.05)
-                
-            except Exception as e:
-                print(f"Erro no concurso {concurso}: {e}")
-                continue
+        Se o calendário indica que já houve sorteio, responde com o cache e agenda a
+        atualização em segundo plano. Retorna None (consultar a API) com cache vazio
+        ou muito antigo.
+        """
+        state = self.cache_manager.get_sync_state(self.lottery_type)
+        if not state or self.cache_manager.is_cache_stale(self.lottery_type, OFFLINE_MAX_AGE_HOURS):
+            return None
         
-        return results
+        last_draw = parse_draw_date(state['data_ultimo_concurso'])
+        
+        if is_new_draw_due(last_draw, state['ultima_verificacao'], self.lottery.draw_days):
+            print("🆕 Sorteio novo previsto: usando o cache e atualizando em segundo plano")
+            self._schedule_background_refresh(state['ultimo_concurso'])
+        else:
+            print(f"📴 Cache em dia (último concurso #{state['ultimo_concurso']}): sem consulta à API")
+        
+        return state['ultimo_concurso']
     
-    def _fetch_all_concursos(self, start: int, end: int) -> List[Dict]:
-        """Busca todos os concursos da API"""
-        results = []
-        base_url = "https://servicebus2.caixa.gov.br/portaldeloterias/api"
+    def _schedule_background_refresh(self, last_cached: int):
+        """Baixa em segundo plano os concursos publicados depois do último em cache"""
+        refresh_tasks.submit(
+            f"refresh:{self.lottery_type}",
+            lambda token: self.refresh_latest(token, last_cached)
+        )
+    
+    def refresh_latest(self, cancel_token: CancellationToken = None, last_cached: int = None) -> List[Dict]:
+        """
+        Consulta o último concurso e baixa para o cache os publicados depois do último salvo
+        
+        Returns:
+            Concursos novos baixados (lista vazia se o cache já estava em dia)
+        
+        Raises:
+            FetchError (ou erro de conexão) se a API não responder
+        """
+        if last_cached is None:
+            state = self.cache_manager.get_sync_state(self.lottery_type)
+            last_cached = state['ultimo_concurso'] if state else None
+        
+        latest = self._fetch_latest_number(cancel_token)
+        if last_cached is None:
+            # Cache vazio: baixa apenas a janela configurada
+            last_cached = max(0, latest - self.last_n_games)
+        if latest <= last_cached:
+            return []
+        
+        return self._download_concursos(
+            list(range(last_cached + 1, latest + 1)),
+            f"Atualizando concursos {last_cached + 1} a {latest}",
+            cancel_token
+        )
+    
+    def merge_results(self, new_results: List[Dict]) -> int:
+        """
+        Incorpora concursos novos à janela carregada, descartando os mais antigos
+        
+        Returns:
+            Quantidade de concursos efetivamente adicionados
+        """
+        if not self.results:
+            return 0
+        
+        known = {r['concurso'] for r in self.results}
+        added = [r for r in new_results if r['concurso'] not in known]
+        if not added:
+            return 0
+        
+        merged = sorted(self.results + added, key=lambda x: x['concurso'])
+        self.results = merged[-len(self.results):]
+        
+        if self._index_cache is not None:
+            # Atualiza o índice invertido em vez de reconstruí-lo
+            index = self._index_cache[2]
+            first = self.results[0]['concurso']
+            index.add([r for r in added if r['concurso'] >= first])
+            index.trim_before(first)
+            self._index_cache = (self.results, len(self.results), index)
+        return len(added)
+    
+    def _exact_years_window(self, results: List[Dict], cancel_token: CancellationToken = None) -> List[Dict]:
+        """
+        Ajusta a janela estimada para exatamente `years` anos até o último concurso
         
+        A estimativa (sorteios por semana × 52) ignora feriados e concursos especiais:
+        se ela não cobrir o período, a janela é estendida para trás. O recorte final
+        é uma única consulta no índice de datas do cache.
+        """
+        results = sorted(results, key=lambda x: x['concurso'])
+        last_date = parse_draw_date(results[-1]['data'])
+        if last_date is None:
+            return results
+        cutoff = years_before(last_date, self.years)
+        
+        first = results[0]['concurso']
+        first_date = parse_draw_date(results[0]['data'])
+        step = self.lottery.weekly_draws * 4  # ~1 mês
+        while first > 1 and first_date and first_date > cutoff:
+            check_cancelled(cancel_token)
+            start = max(1, first - step)
+            missing = self.cache_manager.get_missing_concursos(self.lottery_type, start, first - 1)
+            if missing:
+                self._download_concursos(
+                    missing, f"Completando {self.years} ano(s): concursos {start} a {first - 1}", cancel_token
+                )
+            
+            earlier = self.cache_manager.get_cached_results(self.lottery_type, start, start)
+            if not earlier:
+                break
+            first, first_date = start, parse_draw_date(earlier[0]['data'])
+        
+        window = self.cache_manager.get_results_between_dates(
+            self.lottery_type, cutoff + timedelta(days=1), last_date
+        )
+        if not window:
+            return results
+        
+        self.last_n_games = len(window)
+        print(f"📅 Janela exata de {self.years} ano(s): {len(window)} concursos desde {window[0]['data']}")
+        return window
+    
+    def _load_cached_window(self, num_games: int) -> List[Dict]:
+        """Últimos `num_games` concursos (ou `years` anos) disponíveis no cache"""
+        state = self.cache_manager.get_sync_state(self.lottery_type)
+        if not state:
+            return []
+        
+        last_date = parse_draw_date(state['data_ultimo_concurso'])
+        if self.years and last_date:
+            return self.cache_manager.get_results_between_dates(
+                self.lottery_type, years_before(last_date, self.years) + timedelta(days=1), last_date
+            )
+        
+        last_number = state['ultimo_concurso']
+        return self.cache_manager.get_cached_results(
+            self.lottery_type, max(1, last_number - num_games + 1), last_number
+        )
+    
+    def _fetch_missing_concursos(self, missing: List[int], last_number: int,
+                                 cancel_token: CancellationToken = None) -> List[Dict]:
+        """Busca apenas os concursos faltantes"""
+        return self._download_concursos(
+            missing, f"Baixando concursos faltantes até {last_number}", cancel_token
+        )
+    
+    def _fetch_all_concursos(self, start: int, end: int,
+                             cancel_token: CancellationToken = None) -> List[Dict]:
+        """Busca todos os concursos da API (retomando um download interrompido)"""
         total = end - start + 1
         print(f"📥 Concursos {start} a {end} ({total} total)")
         
-        for i, concurso in enumerate(range(start, end + 1), 1):
-            try:
-                if self.progress_callback:
-                    self.progress_callback(f"Baixando concurso {concurso}/{end} ({i}/{total})")
-                
-                url = f"{base_url}/{self.lottery_type}/{concurso}"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    numbers = [int(num) for num in data.get('dezenasSorteadasOrdemSorteio', [])]
-                    
-                    if numbers:
-                        results.append({
-                            'concurso': concurso,
-                            'data': data.get('dataApuracao', ''),
-                            'numeros': numbers,
-                            'numeros_ordenados': sorted(numbers)
-                        })
-                
-                # Progresso a cada 10 concursos
-                if i % 10 == 0 or i == total:
-                    progress_msg = f"   {i}/{total} concursos baixados..."
-                    print(progress_msg)
-                    if self.progress_callback:
-                        self.progress_callback(progress_msg)
+        operation = f"historico:{start}"
+        pending = list(range(start, end + 1))
+        results = []
+        checkpoint = self.cache_manager.get_checkpoint(self.lottery_type, operation)
+        if checkpoint:
+            # O que falta vem do cache (gravados desde o início do download), não do cursor:
+            # concursos que falharam antes dele também são baixados de novo
+            pending = self.cache_manager.get_missing_concursos(
+                self.lottery_type, start, end, saved_since=checkpoint['data_inicio']
+            )
+            skip = set(pending)
+            results = [r for r in self.cache_manager.get_cached_results(self.lottery_type, start, end)
+                       if r['concurso'] not in skip]
+            print(f"⏯️  Retomando download interrompido: {len(results)} concursos já baixados, "
+                  f"{len(pending)} pendentes")
+        
+        results.extend(self._download_concursos(
+            pending, f"Baixando concursos {start} a {end}", cancel_token, operation=operation
+        ))
+        if not pending:
+            self.cache_manager.clear_checkpoint(self.lottery_type, operation)
+        
+        print(f"✅ {len(results)} concursos carregados com sucesso!")
+        return results
+    
+    def _download_concursos(self, concursos: List[int], description: str,
+                            cancel_token: CancellationToken = None, operation: str = None) -> List[Dict]:
+        """
+        Baixa uma lista de concursos e salva no cache os que este analisador buscou
+        
+        Os concursos são gravados a cada CHECKPOINT_BATCH_SIZE junto com o ponto de
+        retomada da operação (padrão: "inicio-fim" da lista), então uma interrupção
+        perde no máximo um lote; ao terminar, só esse ponto é removido. Concursos que
+        outro analisador já está baixando (ex.: análise rápida e comparação
+        simultâneas) são aguardados em vez de baixados novamente.
+        """
+        if not concursos:
+            return []
+        if operation is None:
+            operation = f"{concursos[0]}-{concursos[-1]}"
+        
+        owned, waiting = download_flights.claim(self.lottery_type, concursos)
+        if waiting:
+            print(f"🔗 {len(waiting)} concursos já estão sendo baixados por outra análise")
+        
+        results = []
+        downloaded = []
+        batch = []
+        tracker = self.progress_bus.tracker("download", len(concursos), description, self.lottery_type)
+        
+        def save_batch(next_concurso: int = None):
+            checkpoint = (operation, concursos[0], concursos[-1], next_concurso) if next_concurso else None
+            self.cache_manager.save_results(self.lottery_type, batch, checkpoint=checkpoint)
+            # A resposta bruta e a fonte ficam só no arquivo do cache, não na memória
+            for result in batch:
+                result.pop('raw', None)
+                result.pop('fonte', None)
+            batch.clear()
+        
+        completed = 0
+        try:
+            for concurso in owned:
+                check_cancelled(cancel_token)
+                result = None
+                try:
+                    result, nbytes = self._fetch_concurso(concurso, cancel_token)
+                    tracker.advance(nbytes=nbytes)
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    error_msg = f"Erro no concurso {concurso}: {e}"
+                    print(error_msg)
+                    tracker.advance(message=error_msg)
                 
-                # Pequena pausa para não sobrecarregar o servidor
-                time.sleep(0.05)
+                download_flights.resolve(self.lottery_type, concurso, result)
+                completed += 1
+                if result:
+                    downloaded.append(result)
+                    batch.append(result)
                 
-            except Exception as e:
-                error_msg = f"Erro no concurso {concurso}: {e}"
-                print(error_msg)
-                if self.progress_callback:
-                    self.progress_callback(error_msg)
-                continue
+                if len(batch) >= CHECKPOINT_BATCH_SIZE and completed < len(owned):
+                    save_batch(owned[completed])
+        except BaseException as e:
+            # Libera quem está aguardando e guarda o que já foi baixado
+            download_flights.abandon(self.lottery_type, owned[completed:], e)
+            save_batch(owned[completed])
+            raise
+        
+        for concurso, future in sorted(waiting.items()):
+            result = None
+            try:
+                while True:
+                    check_cancelled(cancel_token)
+                    try:
+                        result = future.result(timeout=0.25)
+                        break
+                    except FutureTimeoutError:
+                        continue
+            except OperationCancelled:
+                if cancel_token and cancel_token.cancelled:
+                    save_batch()
+                    raise
+                # O outro analisador foi cancelado: baixa este concurso aqui
+                result = self._fetch_shared_fallback(concurso, cancel_token, batch)
+            except Exception:
+                result = self._fetch_shared_fallback(concurso, cancel_token, batch)
+            
+            if result:
+                # O dicionário é do outro analisador, que ainda pode não ter gravado o lote
+                results.append({k: v for k, v in result.items() if k not in ('raw', 'fonte')})
+            tracker.advance()
         
-        print(f"✅ {len(results)} concursos carregados com sucesso!")
-        if self.progress_callback:
-            self.progress_callback(f"✅ {len(results)} concursos carregados com sucesso!")
+        results.extend(downloaded)
+        save_batch()
+        self.cache_manager.clear_checkpoint(self.lottery_type, operation)
         
+        tracker.finish(f"✅ {len(results)} concursos baixados")
         return results
     
+    def _fetch_shared_fallback(self, concurso: int, cancel_token: CancellationToken,
+                               downloaded: List[Dict]) -> Dict:
+        """Baixa diretamente um concurso cujo download compartilhado falhou"""
+        try:
+            result, _ = self._fetch_concurso(concurso, cancel_token)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            print(f"Erro no concurso {concurso}: {e}")
+            return None
+        
+        if result:
+            downloaded.append(result)
+        return result
+    
+    def _fetch_concurso(self, concurso: int, cancel_token: CancellationToken = None) -> Tuple[Dict, int]:
+        """
+        Busca um concurso com retentativas, hedge e failover entre as fontes
+        
+        Returns:
+            (resultado ou None, bytes recebidos)
+        """
+        record, nbytes = self.fetcher.fetch_contest(self.lottery_type, concurso, cancel_token=cancel_token)
+        if record is None:
+            return None, nbytes
+        
+        result = record.to_result()
+        # Só para o arquivo bruto: save_results arquiva e o download remove as duas chaves
+        result['fonte'] = record.source
+        result['raw'] = record.raw
+        return result, nbytes
+    
     def _generate_sample_data(self) -> List[Dict]:
         """Gera dados de exemplo para testes"""
         np.random.seed(42)  # Para reproducibilidade
@@ -514,148 +1338,391 @@ class LotteryPatternAnalyzer:
         print(f"✅ {len(sample_data)} concursos de exemplo gerados")
         return sample_data
     
+    def draw_matrix(self) -> DrawMatrix:
+        """Matriz de incidência dos resultados carregados (recalculada quando self.results muda)"""
+        cached = self._matrix_cache
+        if cached is None or cached[0] is not self.results or cached[1] != len(self.results):
+            matrix = self._snapshot_matrix() or DrawMatrix.from_results(self.results, max(self.numbers_range))
+            cached = (self.results, len(self.results), matrix)
+            self._matrix_cache = cached
+        return cached[2]
+    
+    def _snapshot_matrix(self) -> DrawMatrix:
+        """Matriz direto do snapshot (sem cópia) quando os resultados são uma faixa contígua dele"""
+        if not self.results:
+            return None
+        snapshot = self.cache_manager.get_snapshot(self.lottery_type)
+        if snapshot is None:
+            return None
+        
+        rows = snapshot.window(self.results[0]['concurso'], self.results[-1]['concurso'])
+        concursos = np.fromiter((r['concurso'] for r in self.results), dtype=np.int32, count=len(self.results))
+        if not np.array_equal(snapshot.concursos[rows], concursos):
+            return None
+        return snapshot.matrix(rows, max(self.numbers_range))
+    
+    def number_index(self) -> NumberIndex:
+        """Índice invertido número → concursos dos resultados carregados"""
+        cached = self._index_cache
+        if cached is None or cached[0] is not self.results or cached[1] != len(self.results):
+            cached = (self.results, len(self.results), NumberIndex.from_matrix(self.draw_matrix()))
+            self._index_cache = cached
+        return cached[2]
+    
+    def contests_with(self, numbers: List[int], match: str = "all") -> List[int]:
+        """
+        Concursos em que os números saíram
+        
+        Args:
+            numbers: Números consultados
+            match: "all" para todos juntos no mesmo concurso, "any" para pelo menos um
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match deve ser 'all' ou 'any', não {match!r}")
+        if not self.results:
+            self.fetch_results()
+        
+        index = self.number_index()
+        found = index.intersect(numbers) if match == "all" else index.union(numbers)
+        return found.tolist()
+    
+    def co_occurrence(self, numbers: List[int]) -> Dict:
+        """Concursos em que os números saíram juntos e quando foi a última vez"""
+        concursos = self.contests_with(numbers, match="all")
+        total_draws = len(self.results)
+        last = concursos[-1] if concursos else None
+        
+        last_date = None
+        draws_since = None
+        if last is not None:
+            # As linhas da matriz seguem a ordem de self.results
+            row = int(np.searchsorted(self.draw_matrix().concursos, last))
+            last_date = self.results[row]['data']
+            draws_since = total_draws - 1 - row
+        
+        return {
+            'numeros': sorted(set(numbers)),
+            'concursos': concursos,
+            'total': len(concursos),
+            'percentual': len(concursos) / total_draws * 100 if total_draws else 0,
+            'ultimo_concurso': last,
+            'data_ultimo': last_date,
+            'concursos_desde': draws_since
+        }
+    
+    def draw_features(self) -> DrawFeatures:
+        """Tabela de atributos por concurso (uma passada sobre a matriz) e bitmaps por número"""
+        cached = self._features_cache
+        if cached is None or cached[0] is not self.results or cached[1] != len(self.results):
+            features = DrawFeatures.from_matrix(self.draw_matrix(), self.lookup_tables())
+            cached = (self.results, len(self.results), features)
+            self._features_cache = cached
+        return cached[2]
+    
+    def _query_mask(self, filters: Dict) -> np.ndarray:
+        if not self.results:
+            self.fetch_results()
+        return self.draw_features().mask(**filters)
+    
+    def find_draws(self, **filters) -> List[int]:
+        """
+        Concursos que satisfazem todos os predicados
+        
+        Faixas aceitam um valor exato ou (mínimo, máximo), inclusive:
+        total_sum, evens, lows, max_run (1 = sem números consecutivos) e
+        decades (dezenas distintas ocupadas). Listas de números: contains
+        (todos), contains_any (pelo menos um) e excludes (nenhum).
+        
+        Exemplo: find_draws(total_sum=(150, 200), contains=[7], evens=4, max_run=1)
+        """
+        mask = self._query_mask(filters)
+        return self.draw_features().concursos[mask].tolist()
+    
+    def count_draws(self, **filters) -> int:
+        """Quantidade de concursos que satisfazem os predicados (mesmos filtros de find_draws)"""
+        return int(np.count_nonzero(self._query_mask(filters)))
+    
+    def similar_draws(self, ticket: List[int], k: int = 10, metric: str = "overlap") -> Dict:
+        """
+        Concursos passados mais parecidos com um bilhete
+        
+        Args:
+            ticket: Números do bilhete
+            k: Quantidade de concursos retornados
+            metric: "overlap" (mais acertos) ou "jaccard" (acertos / números distintos na união)
+            
+        Returns:
+            Dicionário com os k concursos mais parecidos (empates favorecem os mais
+            recentes) e o histograma de acertos em todo o período
+        """
+        if metric not in ("overlap", "jaccard"):
+            raise ValueError(f"metric deve ser 'overlap' ou 'jaccard', não {metric!r}")
+        ticket = sorted(set(ticket))
+        invalid = [num for num in ticket if num not in self.numbers_range]
+        if invalid:
+            raise ValueError(f"Números fora da faixa de {self.lottery_type}: {invalid}")
+        if not self.results:
+            self.fetch_results()
+        
+        features = self.draw_features()
+        overlaps = features.overlaps(ticket)
+        union = len(ticket) + popcount(features.masks) - overlaps
+        jaccard = overlaps / np.maximum(union, 1)
+        scores = overlaps if metric == "overlap" else jaccard
+        
+        k = min(k, len(scores))
+        if 0 < k < len(scores):
+            # Nota do k-ésimo colocado; empates nessa nota ficam todos como candidatos
+            threshold = -np.partition(-scores, k - 1)[k - 1]
+            top = np.flatnonzero(scores >= threshold)
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((-features.concursos[top], -scores[top]))][:k]
+        
+        similar = []
+        for row in top.tolist():
+            result = self.results[row]
+            similar.append({
+                'concurso': result['concurso'],
+                'data': result['data'],
+                'numeros': result.get('numeros_ordenados', sorted(result['numeros'])),
+                'acertos': int(overlaps[row]),
+                'jaccard': float(jaccard[row])
+            })
+        
+        histogram = np.bincount(overlaps, minlength=len(ticket) + 1)
+        return {
+            'ticket': ticket,
+            'metric': metric,
+            'similares': similar,
+            'histograma': {hits: int(count) for hits, count in enumerate(histogram.tolist())}
+        }
+    
     def calculate_basic_statistics(self) -> Dict:
         """Calcula estatísticas básicas"""
         if not self.results:
             self.fetch_results()
         
-        all_numbers = []
-        for result in self.results:
-            all_numbers.extend(result['numeros'])
-        
-        num_counter = Counter(all_numbers)
-        total_draws = len(self.results)
+        matrix = self.draw_matrix()
+        total_draws = len(matrix)
         
-        # Frequência de cada número
-        frequencies = {num: count for num, count in num_counter.items()}
+        # Frequência de cada número (apenas os que já saíram)
+        counts = matrix.counts.sum(axis=0, dtype=np.int64)
+        drawn = np.flatnonzero(counts)
+        frequencies = {int(num): int(counts[num]) for num in drawn}
         
         # Números mais e menos sorteados
-        most_common = num_counter.most_common(10)
-        least_common = num_counter.most_common()[-10:]
+        ranking = rank_desc(counts[drawn], drawn.tolist())
+        most_common = ranking[:10]
+        least_common = ranking[-10:]
         
         return {
             'total_concursos': total_draws,
             'frequencias': frequencies,
             'mais_frequentes': most_common,
             'menos_frequentes': least_common,
-            'frequencia_media': np.mean(list(frequencies.values())),
-            'frequencia_desvio': np.std(list(frequencies.values())),
-            'periodo_analisado': f"{self.years} ano(s)" if self.years else f"{total_draws} concursos"
+            'frequencia_media': np.mean(counts[drawn]),
+            'frequencia_desvio': np.std(counts[drawn]),
+            'periodo_analisado': self._describe_period(total_draws)
         }
     
-    def analyze_patterns(self) -> Dict:
-        """Analisa diversos padrões estatísticos"""
-        
-        patterns = {
-            'pares_impares': self._analyze_parity(),
-            'baixos_altos': self._analyze_low_high(),
-            'somas': self._analyze_sums(),
-            'sequencias': self._analyze_sequences(),
-            'atrasos': self._analyze_delays(),
-            'consecutivos': self._analyze_consecutive(),
-            'distribuicao': self._analyze_distribution(),
-            'repeticao_anterior': self._analyze_repetition(),
-            'finais': self._analyze_last_digits()
+    def cached_overview(self) -> Dict:
+        """Resumo de todo o histórico em cache lido das tabelas agregadas (ver cached_overview)"""
+        return cached_overview(self.cache_manager, self.lottery_type)
+    
+    def _describe_period(self, total_draws: int) -> str:
+        if self.full_history:
+            return f"histórico completo ({total_draws} concursos)"
+        return f"{self.years} ano(s)" if self.years else f"{total_draws} concursos"
+    
+    def analyze_patterns(self, cancel_token: CancellationToken = None) -> Dict:
+        """Analisa diversos padrões estatísticos (reaproveitados enquanto self.results não muda)"""
+        cached = self._patterns_cache
+        if cached is not None and cached[0] is self.results and cached[1] == len(self.results):
+            return cached[2]
+        
+        analyses = [
+            ('pares_impares', self._analyze_parity),
+            ('baixos_altos', self._analyze_low_high),
+            ('somas', self._analyze_sums),
+            ('sequencias', self._analyze_sequences),
+            ('atrasos', self._analyze_delays),
+            ('intervalos', self._analyze_gaps),
+            ('consecutivos', self._analyze_consecutive),
+            ('distribuicao', self._analyze_distribution),
+            ('repeticao_anterior', self._analyze_repetition),
+            ('finais', self._analyze_last_digits),
+            ('aleatoriedade', self.randomness_tests)
+        ]
+        
+        patterns = {}
+        for key, analyze in analyses:
+            check_cancelled(cancel_token)
+            patterns[key] = analyze()
+        
+        self._patterns_cache = (self.results, len(self.results), patterns)
+        return patterns
+    
+    def randomness_tests(self) -> Dict:
+        """
+        Bateria de testes de aleatoriedade sobre os concursos carregados
+        
+        Uniformidade das frequências, sequências por número, correlação serial
+        das somas, intervalos entre aparições (geométrica) e independência entre
+        pares. Cada teste retorna estatística, p-valor e conclusão.
+        """
+        if len(self.results) < 3:
+            return {}
+        
+        matrix = self.draw_matrix()
+        values = np.array(self.numbers_range)
+        draw_size = int(np.median(matrix.sizes))
+        return randomness_battery(np.asarray(matrix.present[:, values]), values, draw_size)
+    
+    def null_model(self, simulations: int = NULL_MODEL_SIMULATIONS, workers: int = None,
+                   cancel_token: CancellationToken = None) -> Dict:
+        """
+        Compara as métricas dos padrões com históricos sintéticos de sorteios justos
+        
+        Cada histórico simulado tem o mesmo número de concursos e as mesmas regras
+        da loteria. As simulações ficam em cache por (loteria, concursos): relatórios
+        seguintes só leem o arquivo.
+        
+        Args:
+            simulations: Históricos sintéticos usados na comparação
+            workers: Processos para simular (padrão: um por núcleo)
+            cancel_token: Token verificado enquanto as simulações rodam
+            
+        Returns:
+            Por métrica: valor observado, esperado, faixa de 95% e p-valor empírico
+        """
+        if len(self.results) < 2:
+            return {}
+        
+        matrix = self.draw_matrix()
+        values = np.array(self.numbers_range)
+        low_max = low_high_midpoint(self.lottery_type)
+        observed = history_metrics(np.asarray(matrix.present[:, values])[None], values, low_max)
+        
+        # Tamanho típico do sorteio no histórico (a configuração pode divergir, ex.: Dupla Sena)
+        draw_size = int(np.median(matrix.sizes))
+        simulated = cached_simulations(
+            self.cache_manager.simulation_dir, self.lottery_type, len(matrix), values,
+            draw_size, low_max, simulations, workers=workers, cancel_token=cancel_token
+        )
+        
+        return {
+            'simulacoes': len(simulated['media_soma']),
+            'concursos': len(matrix),
+            'metricas': significance({key: float(value[0]) for key, value in observed.items()}, simulated)
         }
+    
+    def exact_distributions(self) -> Dict[str, Dict[int, float]]:
+        """
+        Distribuições exatas de soma, pares, baixos e maior sequência sob sorteios justos
         
-        return patterns
+        Calculadas por convolução na primeira vez para (faixa, dezenas) e lidas do
+        cache em disco depois.
+        """
+        return cached_distributions(self.cache_manager.distribution_dir, self.numbers_range,
+                                    self.draw_size, low_high_midpoint(self.lottery_type))
+    
+    def lookup_tables(self) -> LookupTables:
+        """Tabelas de consulta da loteria (compartilhadas entre instâncias)"""
+        return self.lottery.tables
     
     def _analyze_parity(self) -> Dict:
         """Analisa proporção de pares vs ímpares"""
-        stats = []
-        for result in self.results:
-            pares = sum(1 for n in result['numeros'] if n % 2 == 0)
-            impares = len(result['numeros']) - pares
-            stats.append({'pares': pares, 'impares': impares})
-        
-        avg_pares = np.mean([s['pares'] for s in stats])
-        avg_impares = np.mean([s['impares'] for s in stats])
+        pares = self.draw_features().pares
+        impares = self.draw_matrix().sizes - pares
         
         return {
-            'media_pares': avg_pares,
-            'media_impares': avg_impares,
+            'media_pares': np.mean(pares),
+            'media_impares': np.mean(impares),
+            'media_pares_teorica': mean_std(self.exact_distributions()['pares'])[0],
             'proporcao_ideal': f"{self.draw_size//2}:{self.draw_size - self.draw_size//2}",
-            'historico': stats[-10:]  # Últimos 10 concursos
+            'historico': [{'pares': int(p), 'impares': int(i)}  # Últimos 10 concursos
+                          for p, i in zip(pares[-10:], impares[-10:])]
         }
     
     def _analyze_low_high(self) -> Dict:
         """Analisa números baixos vs altos"""
-        if self.lottery_type == "lotomania":
-            mid = 50
-        else:
-            mid = max(self.numbers_range) // 2
-        
-        stats = []
-        for result in self.results:
-            baixos = sum(1 for n in result['numeros'] if n <= mid)
-            altos = len(result['numeros']) - baixos
-            stats.append({'baixos': baixos, 'altos': altos})
-        
-        avg_baixos = np.mean([s['baixos'] for s in stats])
-        avg_altos = np.mean([s['altos'] for s in stats])
+        mid = self.lookup_tables().ponto_medio
+        baixos = self.draw_features().baixos
+        altos = self.draw_matrix().sizes - baixos
         
         return {
             'ponto_medio': mid,
-            'media_baixos': avg_baixos,
-            'media_altos': avg_altos,
-            'historico': stats[-10:]
+            'media_baixos': np.mean(baixos),
+            'media_altos': np.mean(altos),
+            'media_baixos_teorica': mean_std(self.exact_distributions()['baixos'])[0],
+            'historico': [{'baixos': int(b), 'altos': int(a)} for b, a in zip(baixos[-10:], altos[-10:])]
         }
     
     def _analyze_sums(self) -> Dict:
         """Analisa as somas dos números sorteados"""
-        sums = []
-        for result in self.results:
-            total = sum(result['numeros'])
-            sums.append(total)
+        sums = self.draw_features().soma
         
-        min_sum = min(sums)
-        max_sum = max(sums)
+        min_sum = int(sums.min())
+        max_sum = int(sums.max())
         avg_sum = np.mean(sums)
         std_sum = np.std(sums)
         
         # Distribuição das somas
         hist, bins = np.histogram(sums, bins=10)
         
+        # Esperado para sorteios justos (distribuição exata das somas)
+        exact = self.exact_distributions()['soma']
+        expected_mean, expected_std = mean_std(exact)
+        
         return {
             'minimo': min_sum,
             'maximo': max_sum,
             'media': avg_sum,
             'desvio_padrao': std_sum,
             'faixa_ideal': [avg_sum - std_sum, avg_sum + std_sum],
-            'distribuicao': list(zip(bins[:-1], hist))
+            'distribuicao': list(zip(bins[:-1], hist)),
+            'media_teorica': expected_mean,
+            'desvio_teorico': expected_std,
+            'faixa_teorica': list(central_interval(exact))
         }
     
     def _analyze_sequences(self) -> Dict:
         """Analisa sequências de números consecutivos"""
-        seq_stats = []
-        for result in self.results:
-            sorted_nums = sorted(result['numeros'])
-            sequences = []
-            current_seq = [sorted_nums[0]]
-            
-            for i in range(1, len(sorted_nums)):
-                if sorted_nums[i] == sorted_nums[i-1] + 1:
-                    current_seq.append(sorted_nums[i])
-                else:
-                    if len(current_seq) > 1:
-                        sequences.append(current_seq)
-                    current_seq = [sorted_nums[i]]
-            
-            if len(current_seq) > 1:
-                sequences.append(current_seq)
-            
-            seq_stats.append({
-                'total_sequencias': len(sequences),
-                'sequencias': sequences,
-                'maior_sequencia': max([len(seq) for seq in sequences]) if sequences else 0
-            })
-        
-        avg_sequences = np.mean([s['total_sequencias'] for s in seq_stats])
+        features = self.draw_features()
+        total_draws = len(features)
+        
+        # Apenas sequências de 2+ números contam
+        by_length = features.sequencias[:, 2:]
+        totals = by_length.sum(axis=1, dtype=np.int64)
+        longest = np.where(features.sequencia >= 2, features.sequencia, 0)
+        
+        # Listas só para os últimos 5 concursos exibidos
+        first_shown = max(0, total_draws - 5)
+        run_rows, run_starts, run_lengths = consecutive_runs(self.draw_matrix().present[first_shown:])
+        sequences_by_row = defaultdict(list)
+        for row, start, length in zip(run_rows.tolist(), run_starts.tolist(), run_lengths.tolist()):
+            if length >= 2:
+                sequences_by_row[first_shown + row].append(list(range(start, start + length)))
+        history = [{
+            'total_sequencias': int(totals[row]),
+            'sequencias': sequences_by_row.get(row, []),
+            'maior_sequencia': int(longest[row])
+        } for row in range(first_shown, total_draws)]
+        
+        def table(counts):
+            return {int(value): int(count) for value, count in enumerate(counts) if count}
         
         return {
-            'media_sequencias_por_sorteio': avg_sequences,
-            'historico_sequencias': seq_stats[-5:],
-            'maior_sequencia_registrada': max([s['maior_sequencia'] for s in seq_stats])
+            'media_sequencias_por_sorteio': np.mean(totals),
+            'historico_sequencias': history,
+            'maior_sequencia_registrada': int(longest.max()),
+            'sequencias_por_concurso': totals,
+            'distribuicao_sequencias': table(np.bincount(totals)),
+            'distribuicao_maior_sequencia': table(np.bincount(longest)),
+            'frequencia_comprimentos': table(np.concatenate(([0, 0], by_length.sum(axis=0, dtype=np.int64)))),
+            'sem_consecutivos': float(np.mean(longest == 0)),
+            'sem_consecutivos_teorico': self.exact_distributions()['sequencia'].get(1, 0.0)
         }
     
     def _analyze_delays(self) -> Dict:
@@ -663,70 +1730,143 @@ class LotteryPatternAnalyzer:
         if not self.results:
             return {}
         
-        last_draw = set(self.results[-1]['numeros'])
-        delays = {}
+        # Concursos desde a última aparição, sem contar o último concurso
+        previous = self.draw_matrix().present[:-1][::-1]
+        if len(previous):
+            seen = previous.any(axis=0)
+            last_seen = np.where(seen, previous.argmax(axis=0), len(previous))
+        else:
+            # Um único concurso: nenhum número tem atraso
+            last_seen = np.zeros(previous.shape[1], dtype=np.int64)
         
-        for num in self.numbers_range:
-            delay = 0
-            for result in reversed(self.results[:-1]):
-                if num in result['numeros']:
-                    break
-                delay += 1
-            delays[num] = delay
+        numbers = list(self.numbers_range)
+        values = last_seen[numbers]
+        delays = {num: int(delay) for num, delay in zip(numbers, values)}
         
         # Números mais atrasados
-        most_delayed = sorted(delays.items(), key=lambda x: x[1], reverse=True)[:15]
+        most_delayed = rank_desc(values, numbers)[:15]
         
         return {
             'atrasos': delays,
             'mais_atrasados': most_delayed,
-            'media_atraso': np.mean(list(delays.values())),
-            'atraso_maximo': max(delays.values())
+            'media_atraso': np.mean(values),
+            'atraso_maximo': int(values.max())
+        }
+    
+    def _gap_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Intervalos entre aparições de todos os números em uma única passada (np.diff)
+        
+        Returns:
+            (números, índice do número de cada intervalo, intervalos em ordem
+            cronológica dentro de cada número, última linha em que cada número saiu ou -1)
+        """
+        values = np.array(self.numbers_range)
+        present = np.asarray(self.draw_matrix().present[:, values])
+        columns, rows = np.nonzero(present.T)
+        
+        same_number = columns[1:] == columns[:-1]
+        gap_columns = columns[1:][same_number]
+        gaps = np.diff(rows)[same_number]
+        
+        last_row = np.full(len(values), -1)
+        last_row[columns] = rows  # linhas em ordem crescente: fica a última
+        return values, gap_columns, gaps, last_row
+    
+    def gap_series(self) -> Dict[int, List[int]]:
+        """Série completa de intervalos (em concursos) entre aparições de cada número"""
+        if not self.results:
+            return {}
+        values, gap_columns, gaps, _ = self._gap_arrays()
+        bounds = np.searchsorted(gap_columns, np.arange(len(values) + 1))
+        return {num: gaps[bounds[i]:bounds[i + 1]].tolist() for i, num in enumerate(values.tolist())}
+    
+    def _analyze_gaps(self) -> Dict:
+        """Intervalos entre aparições de cada número e posição do atraso atual na própria história"""
+        if len(self.results) < 2:
+            return {}
+        
+        values, gap_columns, gaps, last_row = self._gap_arrays()
+        
+        # Ordena por número e, dentro de cada número, por tamanho do intervalo
+        order = np.lexsort((gaps, gap_columns))
+        gaps = gaps[order]
+        starts = np.searchsorted(gap_columns[order], np.arange(len(values) + 1))
+        counts = np.diff(starts)
+        has_gaps = counts > 0
+        total_draws = len(self.results)
+        
+        # Estatísticas por número a partir dos intervalos já ordenados dentro de cada grupo
+        sums = np.add.reduceat(gaps, starts[:-1][has_gaps]) if len(gaps) else np.array([])
+        means = np.zeros(len(values))
+        means[has_gaps] = sums / counts[has_gaps]
+        
+        def percentile(q):
+            index = starts[:-1] + np.floor(q * np.maximum(counts - 1, 0)).astype(np.int64)
+            return np.where(has_gaps, gaps[np.minimum(index, len(gaps) - 1)] if len(gaps) else 0, 0)
+        
+        maxima = percentile(1.0)
+        p50 = percentile(0.5)
+        p90 = percentile(0.9)
+        
+        # Atraso atual (concursos sem sair) e fração dos intervalos já superada por ele
+        delays = np.where(last_row >= 0, total_draws - 1 - last_row, total_draws)
+        keys = np.arange(len(values)).repeat(counts) * (total_draws + 2) + gaps
+        queries = np.arange(len(values)) * (total_draws + 2) + delays
+        exceeded = np.searchsorted(keys, queries, side='right') - starts[:-1]
+        ranks = np.where(has_gaps, exceeded / np.maximum(counts, 1) * 100, 0.0)
+        
+        by_number = {}
+        for i, num in enumerate(values.tolist()):
+            by_number[num] = {
+                'intervalos': int(counts[i]),
+                'media': float(means[i]),
+                'mediana': int(p50[i]),
+                'p90': int(p90[i]),
+                'maximo': int(maxima[i]),
+                'atraso_atual': int(delays[i]),
+                'percentil_atraso': float(ranks[i]),
+                'recorde': bool(has_gaps[i] and delays[i] >= maxima[i])
+            }
+        
+        # Atrasos mais incomuns para o próprio número (maior percentil, depois maior atraso)
+        unusual = sorted(by_number.items(), key=lambda x: (-x[1]['percentil_atraso'], -x[1]['atraso_atual']))
+        
+        return {
+            'por_numero': by_number,
+            'mais_incomuns': [(num, info['atraso_atual'], info['percentil_atraso']) for num, info in unusual[:10]],
+            'intervalo_medio': float(gaps.mean()) if len(gaps) else 0.0,
+            'intervalo_esperado': len(values) / self.draw_size,
+            'maior_intervalo': int(gaps.max()) if len(gaps) else 0
         }
     
     def _analyze_consecutive(self) -> Dict:
         """Analisa frequência de números consecutivos aparecendo juntos"""
-        pair_counts = defaultdict(int)
+        present = self.draw_matrix().present
         
-        for result in self.results:
-            sorted_nums = sorted(result['numeros'])
-            for i in range(len(sorted_nums) - 1):
-                for j in range(i + 1, len(sorted_nums)):
-                    diff = abs(sorted_nums[j] - sorted_nums[i])
-                    if diff <= 3:  # Considera "próximos" se diferença <= 3
-                        pair = tuple(sorted([sorted_nums[i], sorted_nums[j]]))
-                        pair_counts[pair] += 1
+        # Considera "próximos" se diferença <= 3
+        pair_labels = []
+        pair_values = []
+        for diff in (1, 2, 3):
+            together = (present[:, :-diff] & present[:, diff:]).sum(axis=0)
+            for low in np.flatnonzero(together):
+                pair_labels.append((int(low), int(low) + diff))
+                pair_values.append(together[low])
         
         # Pares mais frequentes
-        most_common_pairs = sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        most_common_pairs = rank_desc(np.array(pair_values, dtype=np.int64), pair_labels)[:10]
         
         return {
             'pares_proximos_frequentes': most_common_pairs,
-            'total_pares_unicos': len(pair_counts)
+            'total_pares_unicos': len(pair_labels)
         }
     
     def _analyze_distribution(self) -> Dict:
         """Analisa distribuição dos números por faixas"""
-        num_ranges = []
-        max_num = max(self.numbers_range)
-        
-        # Divide em 5 faixas
-        range_size = max_num // 5
-        for i in range(5):
-            start = i * range_size + 1
-            end = (i + 1) * range_size
-            if i == 4:  # Última faixa pega até o final
-                end = max_num
-            num_ranges.append((start, end))
-        
-        distribution = {f"{start}-{end}": 0 for start, end in num_ranges}
-        
-        for result in self.results:
-            for num in result['numeros']:
-                for start, end in num_ranges:
-                    if start <= num <= end:
-                        distribution[f"{start}-{end}"] += 1
-                        break
+        # 5 faixas de 1 ao maior número (a última pega até o final)
+        num_ranges = list(self.lookup_tables().faixas)
+        totals = self.draw_features().faixas.sum(axis=0, dtype=np.int64)
+        distribution = {f"{start}-{end}": int(total) for (start, end), total in zip(num_ranges, totals)}
         
         # Normaliza por quantidade de concursos
         total_draws = len(self.results)
@@ -743,12 +1883,7 @@ class LotteryPatternAnalyzer:
         if len(self.results) < 2:
             return {}
         
-        repetitions = []
-        for i in range(1, len(self.results)):
-            prev_set = set(self.results[i-1]['numeros'])
-            curr_set = set(self.results[i]['numeros'])
-            repeated = len(prev_set.intersection(curr_set))
-            repetitions.append(repeated)
+        repetitions = self.draw_features().repeticao[1:].tolist()
         
         return {
             'media_repeticao': np.mean(repetitions),
@@ -760,12 +1895,8 @@ class LotteryPatternAnalyzer:
     
     def _analyze_last_digits(self) -> Dict:
         """Analisa padrões nos últimos dígitos"""
-        last_digits_dist = {str(i): 0 for i in range(10)}
-        
-        for result in self.results:
-            for num in result['numeros']:
-                last_digit = str(num)[-1]
-                last_digits_dist[last_digit] += 1
+        by_digit = self.draw_features().finais.sum(axis=0, dtype=np.int64)
+        last_digits_dist = {str(i): int(by_digit[i]) for i in range(10)}
         
         total_numbers = sum(last_digits_dist.values())
         normalized = {k: v/total_numbers for k, v in last_digits_dist.items()}
@@ -776,21 +1907,24 @@ class LotteryPatternAnalyzer:
             'digitos_mais_comuns': sorted(last_digits_dist.items(), key=lambda x: x[1], reverse=True)[:3]
         }
     
-    def generate_suggested_numbers(self, strategy: str = "balanced", quantity: int = 10) -> List[List[int]]:
+    def generate_suggested_numbers(self, strategy: str = "balanced", quantity: int = 10,
+                                   cancel_token: CancellationToken = None) -> List[List[int]]:
         """
         Gera combinações sugeridas baseadas em diferentes estratégias
         
         Args:
             strategy: 'balanced', 'hot', 'cold', 'mixed', 'statistical'
             quantity: Quantidade de combinações a gerar
+            cancel_token: Token verificado entre as combinações geradas
         """
         
         stats = self.calculate_basic_statistics()
-        patterns = self.analyze_patterns()
+        patterns = self.analyze_patterns(cancel_token)
         
         suggestions = []
         
         for _ in range(quantity):
+            check_cancelled(cancel_token)
             if strategy == "balanced":
                 # Estratégia balanceada baseada em estatísticas
                 suggestion = self._generate_balanced_combination(stats, patterns)
@@ -911,10 +2045,13 @@ class LotteryPatternAnalyzer:
         """Combinação baseada em distribuição estatística ideal"""
         np.random.seed()
         
-        # Calcula distribuição ideal baseada em médias históricas
-        parity_ratio = patterns['pares_impares']
-        low_high_ratio = patterns['baixos_altos']
-        sum_range = patterns['somas']['faixa_ideal']
+        # Faixas centrais das distribuições exatas (combinações típicas de um sorteio justo)
+        exact = self.exact_distributions()
+        parity_range = central_interval(exact['pares'])
+        low_range = central_interval(exact['baixos'])
+        sum_range = central_interval(exact['soma'])
+        run_range = central_interval(exact['sequencia'])
+        mid = patterns['baixos_altos']['ponto_medio']
         
         all_numbers = list(self.numbers_range)
         max_attempts = 1000
@@ -924,28 +2061,37 @@ class LotteryPatternAnalyzer:
             
             # Verifica critérios estatísticos
             pares = sum(1 for n in combination if n % 2 == 0)
-            impares = self.draw_size - pares
-            
-            baixos = sum(1 for n in combination if n <= low_high_ratio['ponto_medio'])
-            altos = self.draw_size - baixos
-            
+            baixos = sum(1 for n in combination if n <= mid)
             total_sum = sum(combination)
+            longest_run = max(len(run) for run in self._consecutive_runs(combination))
             
             # Verifica se atende aos critérios
-            parity_ok = abs(pares - parity_ratio['media_pares']) <= 1
-            low_high_ok = abs(baixos - low_high_ratio['media_baixos']) <= 1
+            parity_ok = parity_range[0] <= pares <= parity_range[1]
+            low_high_ok = low_range[0] <= baixos <= low_range[1]
             sum_ok = sum_range[0] <= total_sum <= sum_range[1]
+            run_ok = run_range[0] <= longest_run <= run_range[1]
             
-            if parity_ok and low_high_ok and sum_ok:
+            if parity_ok and low_high_ok and sum_ok and run_ok:
                 return combination
         
         # Se não encontrou combinação ideal, retorna uma aleatória
         return sorted(np.random.choice(all_numbers, self.draw_size, replace=False))
     
-    def generate_report(self) -> str:
+    @staticmethod
+    def _consecutive_runs(combination: List[int]) -> List[List[int]]:
+        """Divide uma combinação ordenada em sequências de números consecutivos"""
+        runs = [[combination[0]]]
+        for num in combination[1:]:
+            if num == runs[-1][-1] + 1:
+                runs[-1].append(num)
+            else:
+                runs.append([num])
+        return runs
+    
+    def generate_report(self, cancel_token: CancellationToken = None) -> str:
         """Gera um relatório completo da análise"""
         stats = self.calculate_basic_statistics()
-        patterns = self.analyze_patterns()
+        patterns = self.analyze_patterns(cancel_token)
         
         report = []
         report.append("=" * 70)
@@ -986,21 +2132,54 @@ class LotteryPatternAnalyzer:
         for num, delay in patterns['atrasos']['mais_atrasados'][:10]:
             report.append(f"  Número {num:2d}: {delay} concursos sem sair")
         
+        if patterns.get('intervalos'):
+            report.append("")
+            report.append("⏳ ATRASOS INCOMUNS (comparados aos intervalos do próprio número):")
+            for num, delay, rank in patterns['intervalos']['mais_incomuns'][:5]:
+                info = patterns['intervalos']['por_numero'][num]
+                report.append(f"  Número {num:2d}: {delay} concursos sem sair, maior que {rank:.0f}% dos "
+                              f"{info['intervalos']} intervalos (médio {info['media']:.1f}, máximo {info['maximo']})")
+        
         # Padrões
         report.append("")
         report.append("🎭 PADRÕES IDENTIFICADOS:")
-        report.append(f"• Proporção média Pares/Ímpares: {patterns['pares_impares']['media_pares']:.1f}/{patterns['pares_impares']['media_impares']:.1f}")
-        report.append(f"• Proporção média Baixos/Altos: {patterns['baixos_altos']['media_baixos']:.1f}/{patterns['baixos_altos']['media_altos']:.1f}")
-        report.append(f"• Média da soma: {patterns['somas']['media']:.1f} ± {patterns['somas']['desvio_padrao']:.1f}")
+        report.append(f"• Proporção média Pares/Ímpares: {patterns['pares_impares']['media_pares']:.1f}/{patterns['pares_impares']['media_impares']:.1f} "
+                      f"(teórico {patterns['pares_impares']['media_pares_teorica']:.1f} pares)")
+        report.append(f"• Proporção média Baixos/Altos: {patterns['baixos_altos']['media_baixos']:.1f}/{patterns['baixos_altos']['media_altos']:.1f} "
+                      f"(teórico {patterns['baixos_altos']['media_baixos_teorica']:.1f} baixos)")
+        report.append(f"• Média da soma: {patterns['somas']['media']:.1f} ± {patterns['somas']['desvio_padrao']:.1f} "
+                      f"(teórico {patterns['somas']['media_teorica']:.1f} ± {patterns['somas']['desvio_teorico']:.1f})")
+        report.append(f"• Sorteios sem números consecutivos: {patterns['sequencias']['sem_consecutivos']:.1%} "
+                      f"(teórico {patterns['sequencias']['sem_consecutivos_teorico']:.1%})")
         report.append(f"• Repetição média do anterior: {patterns['repeticao_anterior']['media_repeticao']:.1f} números")
         
+        # Comparação com sorteios justos simulados
+        null_model = self.null_model(cancel_token=cancel_token)
+        if null_model:
+            report.append("")
+            report.append(f"🎲 COMPARAÇÃO COM O ACASO ({null_model['simulacoes']} históricos simulados):")
+            for metric in null_model['metricas'].values():
+                low, high = metric['faixa_95']
+                flag = " ⚠️" if metric['p_valor'] < 0.05 else ""
+                report.append(f"• {metric['descricao']}: {metric['observado']:.2f} "
+                              f"(esperado {metric['esperado']:.2f}, 95%: {low:.2f}-{high:.2f}, "
+                              f"p={metric['p_valor']:.3f}){flag}")
+            report.append("  ⚠️ = fora do esperado ao acaso (p < 0,05); com 10 métricas, ~1 alarme falso é comum")
+        
+        if patterns.get('aleatoriedade'):
+            report.append("")
+            report.append("🧪 TESTES DE ALEATORIEDADE:")
+            for test in patterns['aleatoriedade'].values():
+                report.append(f"• {test['descricao']}: p={test['p_valor']:.3f} ({test['conclusao']})")
+        
         # Sugestões
         report.append("")
         report.append("🎯 SUGESTÕES DE COMBINAÇÕES (apenas para estudo):")
         
         strategies = ['balanced', 'hot', 'cold', 'mixed']
         for strategy in strategies:
-            suggestions = self.generate_suggested_numbers(strategy=strategy, quantity=2)
+            suggestions = self.generate_suggested_numbers(strategy=strategy, quantity=2,
+                                                          cancel_token=cancel_token)
             report.append(f"\nEstratégia '{strategy}':")
             for i, comb in enumerate(suggestions, 1):
                 report.append(f"  Combinação {i}: {comb}")
@@ -1111,23 +2290,12 @@ def show_lottery_types():
     print("\n🎰 LOTERIAS SUPORTADOS:")
     print("=" * 50)
     
-    loterias = [
-        ("megasena", "Mega-Sena", "60 números, sorteios às quartas e sábados"),
-        ("lotofacil", "Lotofácil", "25 números, sorteios às segundas, quartas e sextas"),
-        ("quina", "Quina", "80 números, sorteios de segunda a sábado"),
-        ("lotomania", "Lotomania", "100 números (0-99), sorteios às terças e sextas"),
-        ("duplasena", "Dupla Sena", "50 números, sorteios às terças, quintas e sábados"),
-        ("diadesorte", "Dia de Sorte", "31 números, sorteios às terças e sextas"),
-        ("timemania", "Timemania", "80 números, sorteios às terças, quintas e sábados")
-    ]
-    
-    for codigo, nome, descricao in loterias:
-        print(f"\n📋 {nome.upper()} ({codigo})")
-        print(f"   {descricao}")
-        
-        # Mostra exemplos de anos
-        analyzer = LotteryPatternAnalyzer(codigo, years=1)
-        concursos_1_ano = analyzer.last_n_games
+    for codigo, loteria in LOTTERIES.items():
+        print(f"\n📋 {loteria.name.upper()} ({codigo})")
+        print(f"   {loteria.description.split(': ', 1)[-1]}")
+        
+        # Mostra exemplos de anos (direto do registro, sem instanciar analisadores)
+        concursos_1_ano = loteria.games_per_year
         print(f"   1 ano ≈ {concursos_1_ano} concursos")
         print(f"   3 anos ≈ {concursos_1_ano * 3} concursos")
         print(f"   5 anos ≈ {concursos_1_ano * 5} concursos")
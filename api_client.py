@@ -2,10 +2,12 @@
 import requests
 import time
 import json
+from lotteries import lottery_by_name
+from sources import MIRROR_API_URL, normalize_payload
 
 class LotteryAPIClient:
     def __init__(self):
-        self.base_url = "https://loteriascaixa-api.herokuapp.com/api"
+        self.base_url = MIRROR_API_URL
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -15,21 +17,12 @@ class LotteryAPIClient:
         """Buscar últimos resultados - CORRIGIDO para API real"""
         print(f"🔍 Buscando até {limite} concursos de {loteria}...")
         
-        # Mapear nomes para formato CORRETO da API
-        loteria_map = {
-            "Mega-Sena": "megasena",
-            "Lotofácil": "lotofacil",
-            "Quina": "quina",
-            "Lotomania": "lotomania",
-            "Dupla Sena": "duplasena",
-            "Dia de Sorte": "diadesorte",
-            "Timemania": "timemania"
-        }
-        
-        api_name = loteria_map.get(loteria)
-        if not api_name:
+        # Nome de exibição → caminho da loteria na API (registro em lotteries.py)
+        lottery = lottery_by_name(loteria)
+        if not lottery:
             print(f"❌ Loteria {loteria} não mapeada")
             return []
+        api_name = lottery.api_slug
         
         # URL CORRETA: sem /latest, apenas nome da loteria
         url = f"{self.base_url}/{api_name}"
@@ -68,31 +61,16 @@ class LotteryAPIClient:
     def _processar_resultado(self, item, loteria: str):
         """Processar um item da API"""
         try:
-            # Extrair dados
-            concurso = item.get('concurso', 0)
-            data = item.get('data', '')
-            
-            # Extrair dezenas
-            dezenas = item.get('dezenas', [])
-            if not dezenas:
-                # Tentar campo alternativo
-                dezenas = item.get('dezenasSorteadasOrdemSorteio', [])
-            
-            # Converter para inteiros se necessário
-            dezenas_int = []
-            for d in dezenas:
-                try:
-                    dezenas_int.append(int(d))
-                except:
-                    # Se for string com zeros à esquerda
-                    if isinstance(d, str) and d.isdigit():
-                        dezenas_int.append(int(d))
+            # Mesmo normalizador usado pelo analisador (aceita os dois formatos de API)
+            registro = normalize_payload(item, loteria, "espelho")
+            if registro is None:
+                return None
             
             return {
                 'loteria': loteria,
-                'concurso': concurso,
-                'data': data,
-                'dezenas': sorted(dezenas_int),
+                'concurso': registro.concurso,
+                'data': registro.data,
+                'dezenas': sorted(registro.numeros),
                 'premiacao': item.get('premiacoes', {})
             }
             
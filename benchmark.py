@@ -0,0 +1,64 @@
+# benchmark.py - Mede carga e análise do histórico completo (sem rede)
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from analizador import LotteryCacheManager, LotteryPatternAnalyzer
+from lotteries import LOTTERIES
+from mock_api import MOCK_LATEST, MockConfig, MockLotteryData
+
+
+def build_cache(db_path: str, lottery_type: str, total: int):
+    """Preenche um cache temporário com `total` concursos sintéticos"""
+    data = MockLotteryData(MockConfig(latest={lottery_type: total}))
+    results = []
+    for concurso in range(1, total + 1):
+        date_text, numbers = data.draw(lottery_type, concurso)
+        results.append({'concurso': concurso, 'data': date_text, 'numeros': numbers})
+    LotteryCacheManager(db_path).save_results(lottery_type, results)
+
+
+def timed(label: str, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"   {label:<28} {elapsed * 1000:8.1f} ms   pico {peak / 1024 / 1024:6.1f} MB")
+    return value
+
+
+def run(lottery_type: str, total: int):
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = os.path.join(folder, "benchmark.db")
+        print(f"\n⏱️  {lottery_type}: {total} concursos")
+        build_cache(db_path, lottery_type, total)
+
+        analyzer = LotteryPatternAnalyzer(lottery_type, full_history=True,
+                                          cache_manager=LotteryCacheManager(db_path))
+        analyzer.console_subscription.cancel()
+
+        analyzer.results = timed("carga do cache", lambda: analyzer.cache_manager.get_cached_results(
+            lottery_type, 1, total))
+        matrix = timed("matriz de incidência", analyzer.draw_matrix)
+        timed("estatísticas básicas", analyzer.calculate_basic_statistics)
+        timed("padrões (9 análises)", analyzer.analyze_patterns)
+        print(f"   matriz: {matrix.nbytes / 1024:.0f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do histórico completo")
+    parser.add_argument("--lottery", choices=list(LOTTERIES), help="apenas uma loteria")
+    parser.add_argument("--total", type=int, help="concursos (padrão: tamanho real aproximado)")
+    args = parser.parse_args()
+
+    lotteries = [args.lottery] if args.lottery else list(LOTTERIES)
+    for lottery_type in lotteries:
+        run(lottery_type, args.total or MOCK_LATEST[lottery_type])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# combinatorics.py - Distribuições exatas (sorteios justos) de soma, pares, baixos e sequências
+import json
+import os
+import threading
+from math import comb
+from typing import Dict, Iterable, Tuple
+
+DISTRIBUTIONS_VERSION = 1
+
+# Distribuições já calculadas nesta sessão: (diretório, primeiro, último, dezenas, ponto médio)
+_memory_cache: Dict[tuple, Dict[str, Dict[int, float]]] = {}
+
+
+def sum_counts(values: Iterable[int], draw_size: int) -> Dict[int, int]:
+    """
+    Quantidade de combinações de `draw_size` números com cada soma
+
+    Programação dinâmica equivalente a extrair o coeficiente de x^k·y^s do
+    polinômio ∏(1 + x·y^v): ways[k][s] acumula um número por vez.
+    """
+    ways = [dict() for _ in range(draw_size + 1)]
+    ways[0][0] = 1
+    for value in values:
+        for size in range(draw_size, 0, -1):
+            target = ways[size]
+            for total, count in ways[size - 1].items():
+                target[total + value] = target.get(total + value, 0) + count
+    return dict(sorted(ways[draw_size].items()))
+
+
+def hypergeometric_counts(marked: int, total: int, draw_size: int) -> Dict[int, int]:
+    """Combinações com j números de um grupo de `marked` dentre `total` (ex.: pares)"""
+    return {j: comb(marked, j) * comb(total - marked, draw_size - j)
+            for j in range(draw_size + 1) if comb(marked, j) and comb(total - marked, draw_size - j)}
+
+
+def longest_run_counts(total: int, draw_size: int) -> Dict[int, int]:
+    """
+    Combinações de `draw_size` números consecutivos de 1..total por maior sequência
+
+    Para cada limite L conta as combinações sem sequência maior que L (estado:
+    escolhidos até agora × tamanho da sequência atual); a diferença entre limites
+    vizinhos é a distribuição.
+    """
+    def at_most(limit: int) -> int:
+        # states[(escolhidos, sequência atual)] = combinações
+        states = {(0, 0): 1}
+        for _ in range(total):
+            following = {}
+            for (chosen, run), count in states.items():
+                following[(chosen, 0)] = following.get((chosen, 0), 0) + count
+                if chosen < draw_size and run < limit:
+                    key = (chosen + 1, run + 1)
+                    following[key] = following.get(key, 0) + count
+            states = following
+        return sum(count for (chosen, _), count in states.items() if chosen == draw_size)
+
+    cumulative = [0] + [at_most(limit) for limit in range(1, draw_size + 1)]
+    return {limit: cumulative[limit] - cumulative[limit - 1]
+            for limit in range(1, draw_size + 1) if cumulative[limit] > cumulative[limit - 1]}
+
+
+def exact_distributions(values: Iterable[int], draw_size: int, low_max: int) -> Dict[str, Dict[int, float]]:
+    """Probabilidades exatas de soma, pares, baixos e maior sequência para um sorteio justo"""
+    values = sorted(values)
+    total = comb(len(values), draw_size)
+    counts = {
+        "soma": sum_counts(values, draw_size),
+        "pares": hypergeometric_counts(sum(1 for v in values if v % 2 == 0), len(values), draw_size),
+        "baixos": hypergeometric_counts(sum(1 for v in values if v <= low_max), len(values), draw_size),
+        "sequencia": longest_run_counts(len(values), draw_size),
+    }
+    return {name: {key: count / total for key, count in dist.items()} for name, dist in counts.items()}
+
+
+def _cache_path(base_dir: str, values: list, draw_size: int, low_max: int) -> str:
+    return os.path.join(base_dir, f"{values[0]}-{values[-1]}_{draw_size}_{low_max}.json")
+
+
+def _save(path: str, distributions: Dict[str, Dict[int, float]]):
+    """Grava as distribuições (arquivo temporário + rename)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"versao": DISTRIBUTIONS_VERSION, "distribuicoes": distributions}, f)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def cached_distributions(base_dir: str, values: Iterable[int], draw_size: int,
+                         low_max: int) -> Dict[str, Dict[int, float]]:
+    """Distribuições exatas lidas do cache em disco (calculadas e gravadas na primeira vez)"""
+    values = sorted(values)
+    key = (base_dir, values[0], values[-1], draw_size, low_max)
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    path = _cache_path(base_dir, values, draw_size, low_max)
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("versao") != DISTRIBUTIONS_VERSION:
+            raise ValueError("versão antiga")
+        distributions = {name: {int(k): p for k, p in dist.items()}
+                         for name, dist in stored["distribuicoes"].items()}
+    except (OSError, ValueError, KeyError):
+        distributions = exact_distributions(values, draw_size, low_max)
+        try:
+            _save(path, distributions)
+        except OSError as e:
+            # Sem o arquivo as distribuições continuam valendo nesta sessão
+            print(f"⚠️  Não foi possível gravar as distribuições em {path}: {e}")
+
+    _memory_cache[key] = distributions
+    return distributions
+
+
+def mean_std(distribution: Dict[int, float]) -> Tuple[float, float]:
+    """Média e desvio padrão de uma distribuição {valor: probabilidade}"""
+    mean = sum(value * p for value, p in distribution.items())
+    variance = sum((value - mean) ** 2 * p for value, p in distribution.items())
+    return mean, variance ** 0.5
+
+
+def central_interval(distribution: Dict[int, float], mass: float = 0.68) -> Tuple[int, int]:
+    """Menor e maior valor da faixa central que concentra pelo menos `mass` da probabilidade"""
+    tail = (1 - mass) / 2
+    cumulative = 0.0
+    low = high = None
+    for value, p in sorted(distribution.items()):
+        cumulative += p
+        if low is None and cumulative > tail:
+            low = value
+        if cumulative >= 1 - tail:
+            high = value
+            break
+    return low, high if high is not None else max(distribution)
@@ -0,0 +1,75 @@
+# draw_calendar.py - Calendário de sorteios para decidir quando pode haver concurso novo
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+# Os sorteios acontecem às 20h (Brasília); o resultado costuma estar na API pouco depois
+DRAW_PUBLISH_HOUR = 21
+
+
+def parse_draw_date(text: str) -> Optional[date]:
+    """Converte a data de um concurso ('dd/mm/aaaa' da API ou ISO) em date"""
+    if not text:
+        return None
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text[:10], fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def date_ordinal(text: str) -> Optional[int]:
+    """Data do concurso como ordinal (date.toordinal), indexável e comparável no SQLite"""
+    day = parse_draw_date(text)
+    return day.toordinal() if day else None
+
+
+def years_before(day: date, years: int) -> date:
+    """Mesma data `years` anos antes (29/02 vira 28/02 em anos não bissextos)"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def next_draw_after(moment: datetime, draw_days: Iterable[int],
+                    publish_hour: int = DRAW_PUBLISH_HOUR) -> datetime:
+    """
+    Primeiro horário de publicação de resultado estritamente posterior a `moment`
+
+    Args:
+        moment: Instante de referência (horário local)
+        draw_days: Dias da semana com sorteio (segunda=0 ... domingo=6)
+        publish_hour: Hora em que o resultado passa a estar disponível
+    """
+    days = set(draw_days)
+    if not days:
+        return moment + timedelta(days=7)
+
+    for offset in range(0, 8):
+        day = moment.date() + timedelta(days=offset)
+        if day.weekday() in days:
+            candidate = datetime.combine(day, datetime.min.time()).replace(hour=publish_hour)
+            if candidate > moment:
+                return candidate
+    return moment + timedelta(days=7)
+
+
+def is_new_draw_due(last_draw_date: Optional[date], last_check: Optional[datetime],
+                    draw_days: Iterable[int], now: datetime = None) -> bool:
+    """
+    Indica se pode existir um concurso mais novo que o último em cache
+
+    Um concurso novo só pode existir se um horário de publicação passou depois
+    do último sorteio conhecido e depois da última consulta à API (feriados e
+    sorteios cancelados não geram consultas repetidas).
+    """
+    if last_draw_date is None:
+        return True
+    now = now or datetime.now()
+
+    reference = datetime.combine(last_draw_date, datetime.min.time()).replace(hour=DRAW_PUBLISH_HOUR)
+    if last_check and last_check > reference:
+        reference = last_check
+
+    return next_draw_after(reference, draw_days) <= now
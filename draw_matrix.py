@@ -0,0 +1,108 @@
+# draw_matrix.py - Representação matricial dos concursos para análises vetorizadas
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class DrawMatrix:
+    """
+    Concursos de uma loteria em forma de matriz de incidência
+
+    Uma linha por concurso (em ordem crescente) e uma coluna por número de 0 a
+    `max_number`. Ocupa N × (max_number + 1) bytes: o histórico completo da
+    Quina (~6.500 concursos × 81 colunas) cabe em ~530 KB.
+    """
+    concursos: np.ndarray           # int32 (N,)
+    counts: np.ndarray              # uint8 (N, max_number + 1): vezes que o número saiu no concurso
+    sizes: np.ndarray               # int16 (N,): dezenas sorteadas em cada concurso
+
+    @classmethod
+    def from_results(cls, results: List[Dict], max_number: int) -> 'DrawMatrix':
+        """Monta a matriz a partir da lista de resultados do analisador (uma única passada)"""
+        n = len(results)
+        sizes = np.fromiter((len(r['numeros']) for r in results), dtype=np.int16, count=n)
+        flat = np.fromiter((num for r in results for num in r['numeros']), dtype=np.int64,
+                           count=int(sizes.sum()))
+        rows = np.repeat(np.arange(n, dtype=np.int64), sizes)
+
+        width = max_number + 1
+        counts = np.bincount(rows * width + flat, minlength=n * width).astype(np.uint8)
+        concursos = np.fromiter((r['concurso'] for r in results), dtype=np.int32, count=n)
+        return cls(concursos=concursos, counts=counts.reshape(n, width), sizes=sizes)
+
+    @property
+    def present(self) -> np.ndarray:
+        """Matriz booleana: o número saiu no concurso"""
+        return self.counts > 0
+
+    @property
+    def values(self) -> np.ndarray:
+        """Valor de cada coluna (0..max_number)"""
+        return np.arange(self.counts.shape[1])
+
+    def __len__(self) -> int:
+        return len(self.concursos)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays"""
+        return self.concursos.nbytes + self.counts.nbytes + self.sizes.nbytes
+
+
+def consecutive_runs(present: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sequências de números consecutivos de todos os concursos (incluindo as de tamanho 1)
+
+    Os números de cada linha saem ordenados de np.nonzero; uma sequência continua
+    onde a diferença para o anterior da mesma linha é 1 (máscara np.diff == 1).
+
+    Returns:
+        (linha, primeiro número, comprimento) de cada sequência, em ordem de linha
+    """
+    rows, numbers = np.nonzero(present)
+    if not len(rows):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    continues = (np.diff(numbers) == 1) & (rows[1:] == rows[:-1])
+    starts = np.flatnonzero(np.concatenate(([True], ~continues)))
+    lengths = np.diff(np.append(starts, len(rows)))
+    return rows[starts], numbers[starts], lengths
+
+
+def row_maximum(rows: np.ndarray, values: np.ndarray, n_rows: int) -> np.ndarray:
+    """Maior valor de cada linha para pares (linha, valor) já ordenados por linha (0 se ausente)"""
+    result = np.zeros(n_rows, dtype=np.int16)
+    if len(rows):
+        firsts = np.flatnonzero(np.concatenate(([True], rows[1:] != rows[:-1])))
+        result[rows[firsts]] = np.maximum.reduceat(values, firsts)
+    return result
+
+
+def pack_rows(present: np.ndarray) -> np.ndarray:
+    """Cada linha booleana vira palavras uint64 com o bit n ligado se a coluna n é True"""
+    n, width = present.shape
+    words = (width + 63) // 64
+    # Bytes com o bit menos significativo na menor coluna; 8 bytes little-endian formam cada palavra
+    packed = np.zeros((n, words * 8), dtype=np.uint8)
+    packed[:, :(width + 7) // 8] = np.packbits(present, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64)
+
+
+# Bits ligados em cada valor de byte (fallback para numpy < 2.0, sem np.bitwise_count)
+_BYTE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Bits ligados por linha de uma matriz uint64 (N, palavras)"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int16)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return _BYTE_BITS[as_bytes].sum(axis=-1, dtype=np.int16)
+
+
+def rank_desc(values: np.ndarray, labels) -> List:
+    """Pares (rótulo, valor) em ordem decrescente de valor, estável nos empates"""
+    order = np.argsort(-values, kind='stable')
+    return [(labels[i], int(values[i])) for i in order]
@@ -0,0 +1,132 @@
+# draw_query.py - Consultas com predicados combinados sobre o histórico de concursos
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from draw_matrix import DrawMatrix, consecutive_runs, pack_rows, popcount, row_maximum
+from lookup_tables import LookupTables
+
+# Valor exato ou faixa (mínimo, máximo) inclusiva; None em um dos lados deixa a faixa aberta
+RangeSpec = Union[int, Tuple[Optional[int], Optional[int]]]
+
+
+@dataclass(frozen=True)
+class DrawFeatures:
+    """
+    Tabela de atributos por concurso e bitmaps por número
+
+    Todas as colunas saem de uma única passada sobre a matriz de incidência: um
+    produto pelas tabelas de consulta (pares, baixos, soma, faixas e finais), uma
+    extração das sequências e um AND entre bitmasks vizinhas (repetição). As
+    análises de padrões são reduções sobre essas colunas.
+
+    Cada predicado de consulta vira uma máscara booleana sobre todas as linhas
+    de uma vez; o bitmap de um número tem um bit por concurso (np.packbits),
+    então "contém" e "exclui" combinam vários números com AND/OR sobre N/8
+    bytes. `masks` guarda cada concurso como bitmask para a busca de sorteios
+    parecidos.
+    """
+    concursos: np.ndarray           # int32 (N,)
+    soma: np.ndarray                # int32 (N,): soma das dezenas
+    pares: np.ndarray               # int16 (N,): quantidade de números pares
+    baixos: np.ndarray              # int16 (N,): números até a metade da faixa
+    sequencia: np.ndarray           # int16 (N,): maior sequência de consecutivos
+    decadas: np.ndarray             # int16 (N,): dezenas (0-9, 10-19, ...) distintas ocupadas
+    faixas: np.ndarray              # int16 (N, faixas): números em cada faixa da distribuição
+    finais: np.ndarray              # int16 (N, 10): números com cada último dígito
+    sequencias: np.ndarray          # int16 (N, maior + 1): sequências de cada comprimento
+    repeticao: np.ndarray           # int16 (N,): números repetidos do concurso anterior (0 no primeiro)
+    bitmaps: np.ndarray             # uint8 (ceil(N/8), max_number + 1): coluna n = bitmap do número n
+    masks: np.ndarray               # uint64 (N, palavras): bit n ligado se o número n saiu no concurso
+
+    @classmethod
+    def from_matrix(cls, matrix: DrawMatrix, tables: LookupTables) -> 'DrawFeatures':
+        """Calcula as colunas a partir da matriz de incidência e das tabelas da loteria"""
+        counts = np.asarray(matrix.counts)
+        present = counts > 0
+        n = len(counts)
+        histograms = tables.histograms(counts)
+
+        # Sequências por (concurso, comprimento) com um único bincount
+        run_rows, _, lengths = consecutive_runs(present)
+        longest = int(lengths.max()) if len(lengths) else 0
+        by_length = np.bincount(run_rows * (longest + 1) + lengths, minlength=n * (longest + 1))
+
+        masks = pack_rows(present)
+        repetition = np.zeros(n, dtype=np.int16)
+        repetition[1:] = popcount(masks[1:] & masks[:-1])
+
+        return cls(
+            concursos=np.asarray(matrix.concursos, dtype=np.int32),
+            soma=histograms['soma'],
+            pares=histograms['pares'],
+            baixos=histograms['baixos'],
+            sequencia=row_maximum(run_rows, lengths, n),
+            decadas=(histograms['dezenas'] > 0).sum(axis=1, dtype=np.int16),
+            faixas=histograms['faixas'],
+            finais=histograms['finais'],
+            sequencias=by_length.reshape(n, longest + 1).astype(np.int16),
+            repeticao=repetition,
+            bitmaps=np.packbits(present, axis=0),
+            masks=masks,
+        )
+
+    def __len__(self) -> int:
+        return len(self.concursos)
+
+    def ticket_mask(self, numbers: Iterable[int]) -> np.ndarray:
+        """Bitmask (palavras,) de um bilhete no mesmo formato das linhas de `masks`"""
+        present = np.zeros((1, self.bitmaps.shape[1]), dtype=bool)
+        present[0, self._numbers(numbers)] = True
+        return pack_rows(present)[0]
+
+    def overlaps(self, numbers: Iterable[int]) -> np.ndarray:
+        """Acertos do bilhete em cada concurso (um único popcount vetorizado)"""
+        return popcount(self.masks & self.ticket_mask(numbers))
+
+    def _unpack(self, bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bits, count=len(self)).astype(bool)
+
+    def _numbers(self, numbers: Iterable[int]) -> list:
+        numbers = sorted(set(numbers))
+        width = self.bitmaps.shape[1]
+        if any(num < 0 or num >= width for num in numbers):
+            raise ValueError(f"Números fora da faixa 0-{width - 1}: {numbers}")
+        return numbers
+
+    def mask(self, total_sum: RangeSpec = None, evens: RangeSpec = None, lows: RangeSpec = None,
+             max_run: RangeSpec = None, decades: RangeSpec = None, contains: Iterable[int] = None,
+             contains_any: Iterable[int] = None, excludes: Iterable[int] = None) -> np.ndarray:
+        """Máscara booleana (N,) dos concursos que satisfazem todos os predicados informados"""
+        selected = np.ones(len(self), dtype=bool)
+
+        for column, spec in ((self.soma, total_sum), (self.pares, evens), (self.baixos, lows),
+                             (self.sequencia, max_run), (self.decadas, decades)):
+            if spec is not None:
+                selected &= _range_mask(column, spec)
+
+        if contains:
+            columns = self.bitmaps[:, self._numbers(contains)]
+            selected &= self._unpack(np.bitwise_and.reduce(columns, axis=1))
+        if contains_any:
+            columns = self.bitmaps[:, self._numbers(contains_any)]
+            selected &= self._unpack(np.bitwise_or.reduce(columns, axis=1))
+        if excludes:
+            columns = self.bitmaps[:, self._numbers(excludes)]
+            selected &= ~self._unpack(np.bitwise_or.reduce(columns, axis=1))
+
+        return selected
+
+
+def _range_mask(column: np.ndarray, spec: RangeSpec) -> np.ndarray:
+    """Máscara de um valor exato ou de uma faixa (mínimo, máximo) inclusiva"""
+    if isinstance(spec, (tuple, list)):
+        low, high = spec
+        selected = np.ones(len(column), dtype=bool)
+        if low is not None:
+            selected &= column >= low
+        if high is not None:
+            selected &= column <= high
+        return selected
+    return column == spec
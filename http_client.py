@@ -0,0 +1,215 @@
+# http_client.py - Requisições HTTP com limite de taxa compartilhado e retentativas
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+
+from task_manager import CancellationToken, OperationCancelled, check_cancelled
+
+
+class FetchError(Exception):
+    """Requisição falhou mesmo após todas as retentativas"""
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Balde de fichas thread-safe
+
+        Args:
+            rate: Fichas repostas por segundo (requisições/s em regime)
+            capacity: Rajada máxima permitida
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Consome uma ficha e retorna quantos segundos esperar antes de usá-la"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def release(self):
+        """Devolve uma ficha reservada que não chegou a ser usada"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def try_acquire(self) -> bool:
+        """Consome uma ficha se houver uma disponível, sem esperar"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def acquire(self, cancel_token: CancellationToken = None):
+        """Bloqueia até que uma ficha esteja disponível (devolve a ficha se for cancelado)"""
+        check_cancelled(cancel_token)
+        wait = self.reserve()
+        if wait <= 0:
+            return
+        if cancel_token:
+            try:
+                cancel_token.sleep(wait)
+            except OperationCancelled:
+                # Sem a devolução, cada espera cancelada deixaria o balde em dívida
+                self.release()
+                raise
+        else:
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    def __init__(self, rate: float = 10.0, capacity: float = 5.0, min_rate: float = 0.5,
+                 max_rate: float = 40.0, target_latency: float = 1.0):
+        """
+        Limitador que ajusta a taxa pelo comportamento do servidor (AIMD)
+
+        A taxa sobe aos poucos enquanto as respostas chegam rápidas e cai pela
+        metade em 429, erros 5xx, timeouts ou latência acima de `target_latency`.
+        """
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.latency_ewma: Optional[float] = None
+
+    def _set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, min(self.max_rate, rate))
+
+    def record_success(self, latency: float):
+        """Registra uma resposta bem-sucedida e sua latência"""
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+
+        if self.latency_ewma > self.target_latency:
+            self._set_rate(self.rate * 0.9)
+        else:
+            self._set_rate(self.rate + 0.5)
+
+    def record_failure(self, throttled: bool = False):
+        """Registra 429/5xx/timeout; um 429 reduz a taxa de forma mais agressiva"""
+        self._set_rate(self.rate * (0.3 if throttled else 0.5))
+
+
+# Limitador único do processo para servicebus2.caixa.gov.br (compartilhado por todos os analisadores)
+caixa_rate_limiter = AdaptiveRateLimiter()
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class ResilientHttpClient:
+    def __init__(self, limiter: AdaptiveRateLimiter = None, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_cap: float = 20.0):
+        """
+        Cliente HTTP com limite de taxa e retentativas com backoff exponencial e jitter
+
+        Args:
+            limiter: Limitador compartilhado (padrão: caixa_rate_limiter)
+            max_retries: Retentativas após a primeira tentativa
+            backoff_base: Espera base em segundos (dobra a cada tentativa)
+            backoff_cap: Espera máxima entre tentativas
+        """
+        self.limiter = limiter or caixa_rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Espera antes da próxima tentativa ("full jitter"), respeitando Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return min(delay, self.backoff_cap)
+
+    def get(self, url: str, timeout: float = 10,
+            cancel_token: CancellationToken = None) -> Optional[requests.Response]:
+        """
+        GET com retentativas em 429/5xx/timeouts/erros de conexão
+
+        Returns:
+            A resposta 200, ou None para 404 (concurso inexistente)
+
+        Raises:
+            FetchError: quando todas as tentativas falham
+            OperationCancelled: quando o token é cancelado durante a espera
+        """
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            check_cancelled(cancel_token)
+            self.limiter.acquire(cancel_token)
+            if cancel_token and cancel_token.cancelled:
+                # Cancelado logo após a espera: a requisição não sai e a ficha volta
+                self.limiter.release()
+                raise OperationCancelled()
+
+            retry_after = None
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, timeout=timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                self.limiter.record_failure()
+                last_error = e
+            else:
+                if response.status_code == 200:
+                    self.limiter.record_success(time.monotonic() - started)
+                    return response
+                if response.status_code == 404:
+                    self.limiter.record_success(time.monotonic() - started)
+                    return None
+                if response.status_code not in RETRY_STATUS:
+                    raise FetchError(f"HTTP {response.status_code} em {url}")
+
+                self.limiter.record_failure(throttled=response.status_code == 429)
+                retry_after = response.headers.get('Retry-After')
+                last_error = FetchError(f"HTTP {response.status_code}")
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                if cancel_token:
+                    cancel_token.sleep(delay)
+                else:
+                    time.sleep(delay)
+
+        raise FetchError(f"Falha após {self.max_retries + 1} tentativas em {url}: {last_error}")
+
+
+_shared_client: Optional[ResilientHttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client() -> ResilientHttpClient:
+    """Cliente único do processo, para que todos os analisadores dividam o mesmo limite"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = ResilientHttpClient()
+        return _shared_client
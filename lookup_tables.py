@@ -0,0 +1,79 @@
+# lookup_tables.py - Tabelas de consulta número → faixa, final, paridade e baixo/alto
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Faixas usadas na análise de distribuição
+BUCKET_COUNT = 5
+
+
+def bucket_ranges(max_number: int, buckets: int = BUCKET_COUNT) -> Tuple[Tuple[int, int], ...]:
+    """Faixas (início, fim) inclusivas de 1 a max_number; a última pega até o final"""
+    size = max_number // buckets
+    return tuple((i * size + 1, max_number if i == buckets - 1 else (i + 1) * size)
+                 for i in range(buckets))
+
+
+@dataclass(frozen=True)
+class LookupTables:
+    """
+    Tabelas indexadas pelo número (uma posição por coluna da matriz de incidência)
+
+    `pesos` junta as tabelas em colunas (par, baixo, o próprio número e colunas
+    0/1 por faixa, por final e por dezena 0-9, 10-19...): um único produto
+    contagens @ pesos dá a soma e todos os histogramas por concurso de uma vez.
+    """
+    faixas: Tuple[Tuple[int, int], ...]
+    ponto_medio: int                # maior número considerado "baixo"
+    faixa: np.ndarray               # int8 (max_number + 1,): faixa do número (len(faixas) se fora delas)
+    final: np.ndarray               # int8 (max_number + 1,): último dígito
+    par: np.ndarray                 # bool (max_number + 1,)
+    baixo: np.ndarray               # bool (max_number + 1,)
+    pesos: np.ndarray               # float32 (max_number + 1, 3 + faixas + 10 + dezenas)
+
+    @classmethod
+    def build(cls, max_number: int, low_max: int) -> 'LookupTables':
+        """Monta as tabelas para números de 0 a max_number"""
+        values = np.arange(max_number + 1)
+        ranges = bucket_ranges(max_number)
+
+        bucket = np.full(len(values), len(ranges), dtype=np.int8)
+        for i, (start, end) in enumerate(ranges):
+            bucket[start:end + 1] = i
+        digit = (values % 10).astype(np.int8)
+        even = values % 2 == 0
+        low = values <= low_max
+
+        weights = np.column_stack([
+            even, low, values,
+            bucket[:, None] == np.arange(len(ranges)),
+            digit[:, None] == np.arange(10),
+            (values // 10)[:, None] == np.arange(max_number // 10 + 1),
+        ]).astype(np.float32)
+        for array in (bucket, digit, even, low, weights):
+            array.setflags(write=False)
+
+        return cls(faixas=ranges, ponto_medio=low_max, faixa=bucket, final=digit,
+                   par=even, baixo=low, pesos=weights)
+
+    def histograms(self, counts: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Soma e histogramas por concurso de uma matriz de contagens (N, max_number + 1)
+
+        Returns:
+            'pares', 'baixos' e 'soma' (N,), 'faixas' (N, faixas), 'finais' (N, 10)
+            e 'dezenas' (N, max_number // 10 + 1)
+        """
+        # Produto em float32 (BLAS): exato para contagens e somas inteiras pequenas
+        table = np.asarray(counts, dtype=np.float32) @ self.pesos
+        buckets = 3 + len(self.faixas)
+        digits = buckets + 10
+        return {
+            'pares': table[:, 0].astype(np.int16),
+            'baixos': table[:, 1].astype(np.int16),
+            'soma': table[:, 2].astype(np.int32),
+            'faixas': table[:, 3:buckets].astype(np.int16),
+            'finais': table[:, buckets:digits].astype(np.int16),
+            'dezenas': table[:, digits:].astype(np.int16),
+        }
@@ -0,0 +1,83 @@
+# lotteries.py - Registro imutável das loterias suportadas (montado uma vez na importação)
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+
+from lookup_tables import LookupTables
+
+
+@dataclass(frozen=True)
+class Lottery:
+    """
+    Definição de uma loteria e artefatos pré-calculados a partir dela
+
+    As instâncias do registro são compartilhadas por todos os analisadores e
+    telas; arrays e tabelas são somente leitura.
+    """
+    code: str                       # código interno e caminho nas APIs (Caixa e espelho)
+    name: str                       # nome de exibição
+    range: range
+    draw_size: int
+    weekly_draws: int
+    draw_days: Tuple[int, ...]      # dias da semana (segunda=0)
+    low_max: int                    # maior número considerado "baixo"
+    color: str                      # cor na interface (nome de cor do Flet)
+    description: str
+    values: np.ndarray = field(init=False, repr=False)         # int64: números da loteria em ordem
+    tables: LookupTables = field(init=False, repr=False)
+
+    def __post_init__(self):
+        values = np.arange(self.range.start, self.range.stop)
+        values.setflags(write=False)
+        object.__setattr__(self, 'values', values)
+        object.__setattr__(self, 'tables', LookupTables.build(self.max_number, self.low_max))
+
+    @property
+    def max_number(self) -> int:
+        return self.range[-1]
+
+    @property
+    def api_slug(self) -> str:
+        """Caminho da loteria nas URLs da Caixa e do espelho"""
+        return self.code
+
+    @property
+    def games_per_year(self) -> int:
+        """Concursos aproximados por ano (52 semanas)"""
+        return self.weekly_draws * 52
+
+
+LOTTERIES: Mapping[str, Lottery] = MappingProxyType({lottery.code: lottery for lottery in (
+    Lottery("megasena", "Mega-Sena", range(1, 61), 6, 2, (2, 5), 30, "blue",
+            "Mega-Sena: 60 números, sorteios às quartas e sábados"),
+    Lottery("lotofacil", "Lotofácil", range(1, 26), 15, 3, (0, 2, 4), 12, "green",
+            "Lotofácil: 25 números, sorteios às segundas, quartas e sextas"),
+    Lottery("quina", "Quina", range(1, 81), 5, 6, (0, 1, 2, 3, 4, 5), 40, "orange",
+            "Quina: 80 números, sorteios de segunda a sábado"),
+    Lottery("lotomania", "Lotomania", range(0, 100), 20, 2, (1, 4), 50, "purple",
+            "Lotomania: 100 números (0-99), sorteios às terças e sextas"),
+    Lottery("duplasena", "Dupla Sena", range(1, 51), 6, 3, (1, 3, 5), 25, "red",
+            "Dupla Sena: 50 números, sorteios às terças, quintas e sábados"),
+    Lottery("diadesorte", "Dia de Sorte", range(1, 32), 7, 2, (1, 4), 15, "amber",
+            "Dia de Sorte: 31 números, sorteios às terças e sextas"),
+    Lottery("timemania", "Timemania", range(1, 81), 7, 3, (1, 3, 5), 40, "cyan",
+            "Timemania: 80 números, sorteios às terças, quintas e sábados"),
+)})
+
+# Formato usado para códigos desconhecidos (mesmos padrões da Mega-Sena)
+DEFAULT_LOTTERY = LOTTERIES["megasena"]
+
+
+def get_lottery(code: str) -> Lottery:
+    """Definição da loteria (a da Mega-Sena para códigos desconhecidos)"""
+    return LOTTERIES.get(code, DEFAULT_LOTTERY)
+
+
+def lottery_by_name(name: str) -> Optional[Lottery]:
+    """Loteria pelo nome de exibição ("Mega-Sena", "Dupla Sena"...)"""
+    for lottery in LOTTERIES.values():
+        if lottery.name == name:
+            return lottery
+    return None
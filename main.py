@@ -1,9 +1,24 @@
 import flet as ft
-from analizador import LotteryPatternAnalyzer
+from analizador import LotteryCacheManager, LotteryPatternAnalyzer, cached_overview, refresh_tasks
 import asyncio
 import time
 from datetime import datetime
-import threading
+from task_manager import BackgroundTaskManager, OperationCancelled
+from prewarm import PrewarmScheduler
+from lotteries import LOTTERIES
+
+# Máximo de redesenhos da tela de carregamento por segundo durante downloads
+UI_PROGRESS_MAX_RATE = 4.0
+
+# Baixa em segundo plano os concursos novos logo após cada sorteio
+PREWARM_ENABLED = True
+PREWARM_LOTTERIES = list(LOTTERIES)
+
+# Operações que leem self.analyzer: enquanto uma delas roda, concursos pré-aquecidos não são incorporados
+ANALYZER_OPERATIONS = ("fetch_data", "generate_suggestions", "full_report")
+
+# Valor de selected_years para analisar do concurso 1 ao último
+FULL_HISTORY = "completo"
 
 class LotteryAnalyzerApp:
     def __init__(self, page: ft.Page):
@@ -21,6 +36,23 @@ class LotteryAnalyzerApp:
         self.is_loading = False
         self.loading_message = ""
         self.progress_details = ""
+        self.current_operation = None
+        
+        # Cache compartilhado pelas telas que só leem os agregados (sem criar analisadores)
+        self.cache_manager = LotteryCacheManager()
+        
+        # Executor compartilhado para operações em segundo plano
+        self.task_manager = BackgroundTaskManager(max_workers=3)
+        
+        # Pré-aquecimento do cache guiado pelo calendário de sorteios
+        self.prewarm = PrewarmScheduler(PREWARM_LOTTERIES, on_update=self.on_prewarm_update)
+        if PREWARM_ENABLED:
+            self.prewarm.start()
+        
+        # As threads dos executores não são daemon: sem encerrá-las o processo não termina
+        self.page.on_disconnect = lambda e: self.shutdown_background()
+        self.page.window_prevent_close = True
+        self.page.on_window_event = self.on_window_event
         
         # Controles principais
         self.progress_bar = ft.ProgressBar(width=400, visible=False)
@@ -104,16 +136,8 @@ class LotteryAnalyzerApp:
         if not lottery_code:
             return "Loteria"
         
-        names = {
-            "megasena": "Mega-Sena",
-            "lotofacil": "Lotofácil",
-            "quina": "Quina",
-            "lotomania": "Lotomania",
-            "duplasena": "Dupla Sena",
-            "diadesorte": "Dia de Sorte",
-            "timemania": "Timemania"
-        }
-        return names.get(lottery_code.lower(), lottery_code.upper())
+        lottery = LOTTERIES.get(lottery_code.lower())
+        return lottery.name if lottery else lottery_code.upper()
 
     async def copy_to_clipboard(self, text):
         """Copia texto para área de transferência"""
@@ -200,11 +224,41 @@ class LotteryAnalyzerApp:
         self.page.update()
      
     def cancel_current_operation(self):
-        """Cancela a operação atual em andamento"""
+        """Cancela a operação atual em andamento (as demais, como uma comparação em paralelo, continuam)"""
+        if self.current_operation and self.current_operation != "cancelled":
+            self.task_manager.cancel(self.current_operation)
         self.is_loading = False
         self.current_operation = "cancelled"
         self.page.update()
     
+    def shutdown_background(self):
+        """Cancela as operações em andamento e encerra os executores (pré-aquecimento incluso)"""
+        self.prewarm.close()
+        self.task_manager.shutdown()
+        refresh_tasks.shutdown()
+    
+    def on_window_event(self, e):
+        """Encerra o trabalho em segundo plano antes de fechar a janela"""
+        if e.data == "close":
+            self.shutdown_background()
+            self.page.window_destroy()
+    
+    def start_background_operation(self, key, target):
+        """Agenda uma operação no executor compartilhado; ignora cliques repetidos"""
+        token = self.task_manager.submit(key, target)
+        if token is None:
+            self.show_snackbar("⏳ Esta operação já está em andamento")
+            return False
+        self.current_operation = key
+        return True
+    
+    def is_operation_running(self, key):
+        """Verifica (e avisa) se a operação já está em andamento"""
+        if self.task_manager.is_running(key):
+            self.show_snackbar("⏳ Esta operação já está em andamento")
+            return True
+        return False
+    
     def show_loading_with_details(self, message="Processando...", details=""):
         """Mostra indicador de carregamento com detalhes"""
         self.clear_results()
@@ -255,6 +309,34 @@ class LotteryAnalyzerApp:
                             self.page.update()
                             break
     
+    def follow_progress(self, analyzer, prefix=""):
+        """Liga o canal de progresso do analisador à tela de carregamento (coalescido)"""
+        def on_progress(event):
+            details = event.format()
+            self.update_loading_details(f"{prefix}\n{details}" if prefix else details)
+        
+        return analyzer.subscribe_progress(on_progress, max_rate=UI_PROGRESS_MAX_RATE)
+    
+    def on_prewarm_update(self, lottery_type, new_results):
+        """Leva os concursos pré-aquecidos para a análise aberta da mesma loteria (no laço da interface)"""
+        analyzer = self.analyzer
+        if analyzer and analyzer.lottery_type == lottery_type:
+            self.page.run_task(self.merge_prewarm_async, analyzer, new_results)
+    
+    async def merge_prewarm_async(self, analyzer, new_results):
+        """Incorpora concursos pré-aquecidos se nenhuma operação estiver usando o analisador"""
+        # Os concursos já estão no cache: se o analisador estiver ocupado, a próxima busca os traz
+        if analyzer is not self.analyzer or any(self.task_manager.is_running(key) for key in ANALYZER_OPERATIONS):
+            return
+        added = analyzer.merge_results(new_results)
+        if added:
+            await self.show_status_async(f"🆕 {added} concurso(s) novo(s) de {analyzer.lottery_type} incorporado(s)")
+    
+    async def show_status_async(self, message):
+        """Atualiza a linha de status a partir de uma thread de segundo plano"""
+        self.status_text.value = message
+        self.page.update()
+    
     def clear_results(self):
         """Limpa a área de resultados"""
         self.results_display.controls.clear()
@@ -320,6 +402,8 @@ class LotteryAnalyzerApp:
                     elevation=5,
                 ),
                 ft.Divider(height=30),
+                self.build_cache_summary_card(),
+                ft.Divider(height=30),
                 ft.Container(
                     content=ft.Column([
                         ft.Text("⚠️ AVISO IMPORTANTE", size=18, color=ft.colors.RED, weight=ft.FontWeight.BOLD),
@@ -340,6 +424,48 @@ class LotteryAnalyzerApp:
             ], spacing=15)
         )
     
+    def build_cache_summary_card(self):
+        """Resumo do histórico em cache de cada loteria (lido das tabelas agregadas)"""
+        rows = []
+        for lottery in PREWARM_LOTTERIES:
+            try:
+                overview = cached_overview(self.cache_manager, lottery)
+            except Exception as ex:
+                print(f"Erro ao ler resumo de {lottery}: {ex}")
+                continue
+            if not overview:
+                continue
+            hot = overview['mais_frequentes'][0]
+            late = overview['mais_atrasados'][0]
+            rows.append(
+                ft.ListTile(
+                    leading=ft.Icon(ft.icons.STORAGE, color=self.get_lottery_color(lottery)),
+                    title=ft.Text(
+                        f"{self.get_lottery_display_name(lottery)}: {overview['total_concursos']} concursos "
+                        f"(até o {overview['ultimo_concurso']})"
+                    ),
+                    subtitle=ft.Text(
+                        f"Mais sorteado: {hot[0]} ({hot[1]}x) • Mais atrasado: {late[0]} ({late[1]} concursos) • "
+                        f"Soma média: {overview['media_soma']:.1f}"
+                    ),
+                )
+            )
+        
+        if not rows:
+            rows.append(ft.Text("Nenhum concurso em cache ainda. Faça uma análise para começar.",
+                                size=14, color=ft.colors.BLUE_GREY))
+        
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column([
+                    ft.Text("🗄️ Resumo do cache", size=18, weight=ft.FontWeight.BOLD),
+                    *rows,
+                ]),
+                padding=ft.padding.all(20),
+            ),
+            elevation=3,
+        )
+    
     def show_year_analysis(self, e):
         """Mostra interface para análise por anos"""
         self.clear_results()
@@ -349,15 +475,8 @@ class LotteryAnalyzerApp:
         self.selected_years = None
         
         # Opções de loterias
-        loterias = [
-            ("megasena", "Mega-Sena", "2x/semana"),
-            ("lotofacil", "Lotofácil", "3x/semana"),
-            ("quina", "Quina", "6x/semana"),
-            ("lotomania", "Lotomania", "2x/semana"),
-            ("duplasena", "Dupla Sena", "3x/semana"),
-            ("diadesorte", "Dia de Sorte", "2x/semana"),
-            ("timemania", "Timemania", "3x/semana"),
-        ]
+        loterias = [(code, lottery.name, f"{lottery.weekly_draws}x/semana")
+                    for code, lottery in LOTTERIES.items()]
         
         # Criar Radio buttons
         radio_buttons = []
@@ -404,6 +523,16 @@ class LotteryAnalyzerApp:
         
         year_buttons_row.controls.append(self.custom_year_field)
         
+        # Histórico completo (do concurso 1 ao último)
+        full_history_btn = ft.ElevatedButton(
+            text="Histórico completo",
+            icon=ft.icons.HISTORY,
+            data=FULL_HISTORY,
+            on_click=self.on_year_clicked,
+        )
+        self.year_buttons[FULL_HISTORY] = full_history_btn
+        year_buttons_row.controls.append(full_history_btn)
+        
         # Botão de iniciar análise
         self.start_analysis_btn = ft.ElevatedButton(
             text="Iniciar Análise",
@@ -471,11 +600,17 @@ class LotteryAnalyzerApp:
         
         self.update_start_button()
     
+    def describe_selected_period(self):
+        """Texto do período selecionado ('3 anos', 'histórico completo')"""
+        if self.selected_years == FULL_HISTORY:
+            return "histórico completo"
+        return f"{self.selected_years} ano{'s' if self.selected_years > 1 else ''}"
+    
     def update_start_button(self):
         """Atualiza estado do botão de iniciar análise"""
         if self.selected_lottery and self.selected_years:
             self.start_analysis_btn.disabled = False
-            self.start_analysis_btn.text = f" Analisar {self.selected_lottery.upper()} ({self.selected_years} ano{'s' if self.selected_years > 1 else ''})"
+            self.start_analysis_btn.text = f" Analisar {self.selected_lottery.upper()} ({self.describe_selected_period()})"
         else:
             self.start_analysis_btn.disabled = True
             self.start_analysis_btn.text = " Iniciar Análise"
@@ -488,13 +623,16 @@ class LotteryAnalyzerApp:
             return
         
         self.show_loading_with_details(
-            f"Configurando análise de {self.selected_years} ano(s) de {self.selected_lottery}...",
+            f"Configurando análise de {self.describe_selected_period()} de {self.selected_lottery}...",
             "Inicializando analisador..."
         )
         
         try:
             # Criar analisador
-            self.analyzer = LotteryPatternAnalyzer(self.selected_lottery, years=self.selected_years)
+            if self.selected_years == FULL_HISTORY:
+                self.analyzer = LotteryPatternAnalyzer(self.selected_lottery, full_history=True)
+            else:
+                self.analyzer = LotteryPatternAnalyzer(self.selected_lottery, years=self.selected_years)
             self.current_lottery = self.selected_lottery
             self.current_years = self.selected_years
             
@@ -504,7 +642,7 @@ class LotteryAnalyzerApp:
             self.clear_results()
             self.add_result(
                 ft.Column([
-                    ft.Text(f"📊 {info['tipo'].upper()} - {self.selected_years} ano(s)", 
+                    ft.Text(f"📊 {info['tipo'].upper()} - {self.describe_selected_period()}", 
                            size=22, weight=ft.FontWeight.BOLD),
                     ft.Divider(height=10),
                     ft.DataTable(
@@ -545,49 +683,42 @@ class LotteryAnalyzerApp:
     
     def fetch_data(self, e):
         """Busca dados da API com progresso detalhado"""
-        if not self.analyzer:
+        if not self.analyzer or self.is_operation_running("fetch_data"):
             return
         
-        self.current_operation = "fetch_data"
-        
-        # Configurar callback de progresso
-        def progress_callback(message):
-            # Usar a função de update diretamente
-            self.update_loading_details(message)
-        
-        self.analyzer.set_progress_callback(progress_callback)
+        # Acompanhar progresso (no máximo UI_PROGRESS_MAX_RATE atualizações/s)
+        if getattr(self, 'progress_subscription', None):
+            self.progress_subscription.cancel()
+        self.progress_subscription = self.follow_progress(self.analyzer)
         
         self.show_loading_with_details(
             "Buscando dados da Caixa Econômica...",
-            f"📅 Configurado para analisar aproximadamente {self.selected_years} ano(s) "
-            f"({self.analyzer.last_n_games} concursos) de {self.selected_lottery}\n"
-            f"🔍 Buscando {self.analyzer.last_n_games} concursos "
-            f"(≈{self.selected_years} ano(s)) de {self.selected_lottery}..."
+            f"📅 Configurado para analisar {self.describe_selected_period()} "
+            f"(≈{self.analyzer.last_n_games} concursos) de {self.selected_lottery}\n"
+            f"🔍 Buscando {self.analyzer.last_n_games} concursos de {self.selected_lottery}..."
         )
         
         try:
             # Executar em thread separada para não bloquear UI
-            def fetch_thread():
+            def fetch_thread(token):
                 try:
                     # Pequeno delay para mostrar a mensagem inicial
-                    time.sleep(0.5)
-                    
-                    if self.current_operation == "cancelled":
-                        return
+                    token.sleep(0.5)
                     
                     # Buscar dados
-                    results = self.analyzer.fetch_results()
+                    results = self.analyzer.fetch_results(cancel_token=token)
                     
-                    if self.current_operation != "cancelled":
+                    if not token.cancelled:
                         # Atualizar UI após conclusão
                         self.page.run_task(self.show_analysis_results_async)
                         
+                except OperationCancelled:
+                    raise
                 except Exception as ex:
-                    if self.current_operation != "cancelled":
+                    if not token.cancelled:
                         self.page.run_task(self.show_error_async, f"Erro ao buscar dados: {str(ex)}")
             
-            self.operation_thread = threading.Thread(target=fetch_thread)
-            self.operation_thread.start()
+            self.start_background_operation("fetch_data", fetch_thread)
             
         except Exception as ex:
             self.show_error(f"Erro ao iniciar busca: {str(ex)}")
@@ -830,6 +961,58 @@ class LotteryAnalyzerApp:
                 )
             )
             
+            # Intervalos entre aparições
+            gaps = patterns.get('intervalos', {})
+            if gaps:
+                patterns_list.controls.append(
+                    ft.Card(
+                        content=ft.Container(
+                            content=ft.Column([
+                                ft.Text("Intervalos entre Aparições", size=18, weight=ft.FontWeight.BOLD),
+                                ft.Text(f"Intervalo médio: {gaps['intervalo_medio']:.1f} concursos "
+                                        f"(esperado {gaps['intervalo_esperado']:.1f}) • "
+                                        f"maior: {gaps['maior_intervalo']}", size=14),
+                                ft.Text("Atrasos mais incomuns para o próprio número:", size=14, weight=ft.FontWeight.BOLD),
+                                *[
+                                    ft.Text(f"Número {num}: {delay} concursos sem sair "
+                                            f"(maior que {rank:.0f}% dos seus intervalos"
+                                            f"{', recorde' if gaps['por_numero'][num]['recorde'] else ''})", size=14)
+                                    for num, delay, rank in gaps['mais_incomuns'][:5]
+                                ],
+                            ]),
+                            padding=ft.padding.all(15),
+                        )
+                    )
+                )
+            
+            # Testes de aleatoriedade
+            tests = patterns.get('aleatoriedade', {})
+            if tests:
+                patterns_list.controls.append(
+                    ft.Card(
+                        content=ft.Container(
+                            content=ft.Column([
+                                ft.Text("Testes de Aleatoriedade", size=18, weight=ft.FontWeight.BOLD),
+                                *[
+                                    ft.Row([
+                                        ft.Icon(
+                                            ft.icons.CHECK_CIRCLE if test['p_valor'] >= 0.05 else ft.icons.WARNING,
+                                            color=ft.colors.GREEN if test['p_valor'] >= 0.05 else ft.colors.ORANGE,
+                                            size=18,
+                                        ),
+                                        ft.Text(f"{test['descricao']}: p = {test['p_valor']:.3f}", size=14),
+                                    ])
+                                    for test in tests.values()
+                                ],
+                                ft.Text("p < 0,05 indica desvio do esperado para sorteios justos "
+                                        "(com vários testes, um alarme isolado pode ser acaso)",
+                                        size=12, color=ft.colors.BLUE_GREY),
+                            ]),
+                            padding=ft.padding.all(15),
+                        )
+                    )
+                )
+            
             self.add_result(patterns_list)
             
         except Exception as ex:
@@ -904,6 +1087,9 @@ class LotteryAnalyzerApp:
     
     def generate_suggestions(self, e):
         """Gera e mostra sugestões - Atualizado para análise rápida"""
+        if self.is_operation_running("generate_suggestions"):
+            return
+        
         try:
             # Verificar se temos analisador e dados
             if not self.analyzer or not self.analyzer.results:
@@ -936,33 +1122,34 @@ class LotteryAnalyzerApp:
         )
         
         # Gerar sugestões em thread
-        def generate_in_thread():
+        def generate_in_thread(token):
             try:
                 # Pequeno delay para mostrar o loading
-                time.sleep(0.5)
-                
-                if self.current_operation == "cancelled":
-                    return
+                token.sleep(0.5)
                 
                 # Gerar as sugestões
                 suggestions = self.analyzer.generate_suggested_numbers(
                     strategy=self.selected_strategy,
-                    quantity=qty
+                    quantity=qty,
+                    cancel_token=token
                 )
                 
-                if self.current_operation != "cancelled":
+                # Concursos passados mais parecidos com cada combinação
+                similar = [self.analyzer.similar_draws(comb, k=3) for comb in suggestions]
+                
+                if not token.cancelled:
                     # Mostrar resultados
-                    self.page.run_task(self.display_suggestions_async, suggestions, qty)
+                    self.page.run_task(self.display_suggestions_async, suggestions, qty, similar)
                     
+            except OperationCancelled:
+                raise
             except Exception as ex:
-                if self.current_operation != "cancelled":
+                if not token.cancelled:
                     self.page.run_task(self.show_error_async, f"Erro ao gerar sugestões: {str(ex)}")
         
-        self.current_operation = "generate_suggestions"
-        self.operation_thread = threading.Thread(target=generate_in_thread)
-        self.operation_thread.start()
+        self.start_background_operation("generate_suggestions", generate_in_thread)
     
-    async def display_suggestions_async(self, suggestions, qty):
+    async def display_suggestions_async(self, suggestions, qty, similar=None):
         """Mostra as sugestões geradas (async)"""
         if self.current_operation == "cancelled":
             return
@@ -978,6 +1165,7 @@ class LotteryAnalyzerApp:
         for i, comb in enumerate(suggestions, 1):
             pares = sum(1 for n in comb if n % 2 == 0)
             soma_total = sum(comb)
+            similar_text = self.describe_similar_draws(similar[i - 1]) if similar else ""
             
             # CORREÇÃO: Usar ft.Text dentro do ft.Chip ou usar ft.Container como alternativa
             suggestions_list.controls.append(
@@ -1007,6 +1195,7 @@ class LotteryAnalyzerApp:
                                     border_radius=ft.border_radius.all(20),
                                 ),
                             ], spacing=10),
+                            ft.Text(similar_text, size=12, color=ft.colors.BLUE_GREY, visible=bool(similar_text)),
                         ]),
                         padding=ft.padding.all(15),
                     )
@@ -1023,6 +1212,16 @@ class LotteryAnalyzerApp:
         
         self.add_result(suggestions_list)
     
+    def describe_similar_draws(self, similar):
+        """Texto curto com os concursos mais parecidos e o histograma de acertos"""
+        if not similar or not similar['similares']:
+            return ""
+        matches = ", ".join(f"{s['concurso']} ({s['acertos']} acertos)" for s in similar['similares'])
+        histogram = similar['histograma']
+        best = max(hits for hits, count in histogram.items() if count)
+        return (f"🔎 Mais parecidos no período: {matches}\n"
+                f"Máximo já alcançado: {best} acertos em {histogram[best]} concurso(s)")
+    
     def show_full_report(self, e=None):
         """Mostra relatório completo - CORRIGIDO"""
         # Verificar se temos um analisador com dados
@@ -1036,6 +1235,9 @@ class LotteryAnalyzerApp:
             )
             return
         
+        if self.is_operation_running("full_report"):
+            return
+        
         self.show_loading_with_details(
             "Gerando relatório completo...",
             "Processando estatísticas e padrões..."
@@ -1060,23 +1262,20 @@ class LotteryAnalyzerApp:
                     self.current_years = 1  # Padrão
             
             # Gerar relatório em thread
-            def generate_report_thread():
+            def generate_report_thread(token):
                 try:
-                    if self.current_operation == "cancelled":
-                        return
-                    
-                    report = self.analyzer.generate_report()
+                    report = self.analyzer.generate_report(cancel_token=token)
                     
-                    if self.current_operation != "cancelled":
+                    if not token.cancelled:
                         self.page.run_task(self.display_full_report_async, report)
                         
+                except OperationCancelled:
+                    raise
                 except Exception as ex:
-                    if self.current_operation != "cancelled":
+                    if not token.cancelled:
                         self.page.run_task(self.show_error_async, f"Erro ao gerar relatório: {str(ex)}")
             
-            self.current_operation = "full_report"
-            self.operation_thread = threading.Thread(target=generate_report_thread)
-            self.operation_thread.start()
+            self.start_background_operation("full_report", generate_report_thread)
             
         except Exception as ex:
             self.show_error(f"Erro ao iniciar geração de relatório: {str(ex)}")
@@ -1096,7 +1295,7 @@ class LotteryAnalyzerApp:
             lottery_name = self.current_lottery.upper()
         
         if hasattr(self, 'current_years') and self.current_years:
-            years_text = f"{self.current_years} ano(s)"
+            years_text = "Histórico completo" if self.current_years == FULL_HISTORY else f"{self.current_years} ano(s)"
         
         # Dividir relatório em partes para melhor visualização
         report_lines = report.split('\n')
@@ -1200,23 +1399,6 @@ class LotteryAnalyzerApp:
         
         self.add_result(report_content)
 
-    # Também adicione este método auxiliar para obter nome da loteria
-    def get_lottery_display_name(self, lottery_code):
-        """Retorna nome amigável da loteria"""
-        if not lottery_code:
-            return "LOTERIA"
-        
-        names = {
-            "megasena": "MEGA-SENA",
-            "lotofacil": "LOTOFÁCIL",
-            "quina": "QUINA",
-            "lotomania": "LOTOMANIA",
-            "duplasena": "DUPLA SENA",
-            "diadesorte": "DIA DE SORTE",
-            "timemania": "TIMEMANIA"
-        }
-        return names.get(lottery_code.lower(), lottery_code.upper())
-
     def print_report(self, report):
         """Prepara o relatório para impressão"""
         try:
@@ -1245,7 +1427,7 @@ class LotteryAnalyzerApp:
             <body>
                 <div class="header">
                     <h1>📄 Relatório Completo - {self.current_lottery.upper()}</h1>
-                    <p><strong>Período:</strong> {self.current_years} ano(s)</p>
+                    <p><strong>Período:</strong> {"histórico completo" if self.current_years == FULL_HISTORY else f"{self.current_years} ano(s)"}</p>
                     <p><strong>Data:</strong> {datetime.now().strftime('%d/%m/%Y %H:%M')}</p>
                 </div>
                 <div class="content">{report.replace('\n', '<br>')}</div>
@@ -1489,20 +1671,15 @@ class LotteryAnalyzerApp:
 
     def run_quick_3years(self, lottery):
         """Executa análise rápida de 3 anos da loteria especificada"""
+        operation_key = f"3years_analysis:{lottery}"
+        if self.is_operation_running(operation_key):
+            return
+        
         self.selected_lottery = lottery
         self.selected_years = 3  # SEMPRE 3 anos para análise rápida
         
         # Obter nome amigável da loteria
-        lottery_names = {
-            "megasena": "Mega-Sena",
-            "lotofacil": "Lotofácil", 
-            "quina": "Quina",
-            "lotomania": "Lotomania",
-            "duplasena": "Dupla Sena",
-            "diadesorte": "Dia de Sorte",
-            "timemania": "Timemania"
-        }
-        lottery_name = lottery_names.get(lottery, lottery)
+        lottery_name = self.get_lottery_display_name(lottery)
         
         self.show_loading_with_details(
             f"Analisando 3 anos de {lottery_name}...",
@@ -1511,37 +1688,37 @@ class LotteryAnalyzerApp:
             f"🔄 Preparando busca de dados..."
         )
         
-        def start_3years_analysis():
+        def start_3years_analysis(token):
             try:
                 # Criar analisador para 3 anos
                 self.analyzer = LotteryPatternAnalyzer(lottery, years=3)
                 
-                # Configurar callback de progresso detalhado
-                def progress_callback(message):
-                    self.update_loading_details(f"{message}")
-                
-                self.analyzer.set_progress_callback(progress_callback)
-                
-                # Atualizar status
-                self.update_loading_details(f"🔍 Buscando dados históricos de {lottery_name}...")
-                
-                # Buscar dados (com cache)
-                self.analyzer.fetch_results(use_cache=True)
+                # Acompanhar progresso detalhado (coalescido) só durante a busca
+                subscription = self.follow_progress(self.analyzer)
+                try:
+                    # Atualizar status
+                    self.update_loading_details(f"🔍 Buscando dados históricos de {lottery_name}...")
+                    
+                    # Buscar dados (com cache)
+                    self.analyzer.fetch_results(use_cache=True, cancel_token=token)
+                finally:
+                    subscription.cancel()
                 
                 # Calcular estatísticas básicas para mostrar informações
                 stats = self.analyzer.calculate_basic_statistics()
                 
-                if self.current_operation != "cancelled":
+                if not token.cancelled:
                     # Mostrar tela de sugestões diretamente
                     self.page.run_task(self.show_quick_analysis_results, lottery_name, stats)
                     
+            except OperationCancelled:
+                raise
             except Exception as ex:
-                if self.current_operation != "cancelled":
+                if not token.cancelled:
                     self.page.run_task(self.show_error_async, f"Erro na análise de 3 anos: {str(ex)}")
         
-        # Iniciar thread para análise
-        self.current_operation = "3years_analysis"
-        threading.Thread(target=start_3years_analysis).start()
+        # Iniciar análise no executor compartilhado
+        self.start_background_operation(operation_key, start_3years_analysis)
 
     async def show_quick_analysis_results(self, lottery_name, stats):
         """Mostra resultados da análise rápida de 3 anos"""
@@ -1739,6 +1916,9 @@ class LotteryAnalyzerApp:
     
     def run_quick_analysis(self, lottery):
         """Executa análise rápida"""
+        if self.is_operation_running("quick_analysis"):
+            return
+        
         self.show_loading_with_details(
             f"Analisando 1 ano de {lottery}...",
             "Inicializando análise rápida..."
@@ -1748,29 +1928,26 @@ class LotteryAnalyzerApp:
             analyzer = LotteryPatternAnalyzer(lottery, years=1)
             
             # Buscar dados em thread
-            def fetch_quick_data():
+            def fetch_quick_data(token):
                 try:
-                    if self.current_operation == "cancelled":
-                        return
-                    
                     self.update_loading_details("Buscando dados da Caixa...")
-                    analyzer.fetch_results()
+                    analyzer.fetch_results(cancel_token=token)
                     
-                    if self.current_operation != "cancelled":
-                        stats = analyzer.calculate_basic_statistics()
-                        patterns = analyzer.analyze_patterns()
-                        
+                    stats = analyzer.calculate_basic_statistics()
+                    patterns = analyzer.analyze_patterns(cancel_token=token)
+                    
+                    if not token.cancelled:
                         self.page.run_task(lambda: self.display_quick_results_async(
                             analyzer, lottery, stats, patterns
                         ))
                         
+                except OperationCancelled:
+                    raise
                 except Exception as ex:
-                    if self.current_operation != "cancelled":
+                    if not token.cancelled:
                         self.page.run_task(self.show_error_async, f"Erro na análise rápida: {str(ex)}")
             
-            self.current_operation = "quick_analysis"
-            self.operation_thread = threading.Thread(target=fetch_quick_data)
-            self.operation_thread.start()
+            self.start_background_operation("quick_analysis", fetch_quick_data)
             
         except Exception as ex:
             self.show_error(f"Erro na análise rápida: {str(ex)}")
@@ -1828,10 +2005,8 @@ class LotteryAnalyzerApp:
         
         # Opções de loterias para comparação
         loterias_comparacao = [
-            ("megasena", "Mega-Sena", ft.colors.BLUE, "60 números"),
-            ("lotofacil", "Lotofácil", ft.colors.GREEN, "25 números"),
-            ("quina", "Quina", ft.colors.ORANGE, "80 números"),
-            ("lotomania", "Lotomania", ft.colors.PURPLE, "100 números"),
+            (code, LOTTERIES[code].name, LOTTERIES[code].color, f"{len(LOTTERIES[code].range)} números")
+            for code in ("megasena", "lotofacil", "quina", "lotomania")
         ]
         
         # Checkboxes para seleção
@@ -1856,6 +2031,7 @@ class LotteryAnalyzerApp:
                 ft.dropdown.Option("2", "2 anos"),
                 ft.dropdown.Option("3", "3 anos"),
                 ft.dropdown.Option("5", "5 anos"),
+                ft.dropdown.Option(FULL_HISTORY, "Todo o histórico em cache"),
             ],
             value="1",  # Padrão: 1 ano
         )
@@ -1929,45 +2105,71 @@ class LotteryAnalyzerApp:
             self.show_error("Selecione pelo menos uma loteria para comparar")
             return
         
+        if self.is_operation_running("comparison"):
+            return
+        
         # Obter período
-        try:
-            years = int(self.comparison_period.value)
-        except:
-            years = 1
+        if self.comparison_period.value == FULL_HISTORY:
+            years = FULL_HISTORY
+            period_text = "todo o histórico em cache"
+        else:
+            try:
+                years = int(self.comparison_period.value)
+            except:
+                years = 1
+            period_text = f"{years} ano(s)"
         
         self.show_loading_with_details(
             "Comparando loterias...",
-            f"Preparando análise de {len(selected_lotteries)} loteria(s) por {years} ano(s)..."
+            f"Preparando análise de {len(selected_lotteries)} loteria(s) por {period_text}..."
         )
         
         # Iniciar comparação em thread
-        def comparison_thread():
+        def comparison_thread(token):
             results = []
             
             for i, lottery in enumerate(selected_lotteries):
-                if self.current_operation == "cancelled":
-                    break
+                token.raise_if_cancelled()
                 
                 try:
                     # Atualizar progresso
                     progress_msg = f"Analisando {lottery} ({i+1}/{len(selected_lotteries)})..."
                     self.update_loading_details(progress_msg)
                     
+                    if years == FULL_HISTORY:
+                        # Agregados mantidos pelo cache: sem baixar nem percorrer os concursos
+                        overview = cached_overview(self.cache_manager, lottery)
+                        if not overview:
+                            print(f"ℹ️  {lottery}: nenhum concurso em cache para comparar")
+                            continue
+                        results.append({
+                            "loteria": lottery.upper(),
+                            "nome": self.get_lottery_display_name(lottery),
+                            "concursos": overview['total_concursos'],
+                            "freq_media": overview['frequencia_media'],
+                            "freq_desvio": overview['frequencia_desvio'],
+                            "mais_freq": overview['mais_frequentes'][0],
+                            "mais_atrasado": overview['mais_atrasados'][0],
+                            "media_pares": overview['media_pares'],
+                            "media_soma": overview['media_soma'],
+                            "cor": self.get_lottery_color(lottery),
+                            "years": years,
+                        })
+                        continue
+                    
                     # Criar analisador
                     analyzer = LotteryPatternAnalyzer(lottery, years=years)
                     
-                    # Configurar callback de progresso
-                    def progress_callback(message):
-                        self.update_loading_details(f"{progress_msg}\n{message}")
-                    
-                    analyzer.set_progress_callback(progress_callback)
-                    
-                    # Buscar dados
-                    analyzer.fetch_results(use_cache=True)
+                    # Acompanhar progresso desta loteria (coalescido) só durante a busca
+                    subscription = self.follow_progress(analyzer, prefix=progress_msg)
+                    try:
+                        analyzer.fetch_results(use_cache=True, cancel_token=token)
+                    finally:
+                        subscription.cancel()
                     
                     # Calcular estatísticas
                     stats = analyzer.calculate_basic_statistics()
-                    patterns = analyzer.analyze_patterns()
+                    patterns = analyzer.analyze_patterns(cancel_token=token)
                     
                     # Armazenar resultados
                     results.append({
@@ -1984,42 +2186,21 @@ class LotteryAnalyzerApp:
                         "years": years,
                     })
                     
+                except OperationCancelled:
+                    raise
                 except Exception as ex:
                     print(f"Erro ao analisar {lottery}: {ex}")
                     # Continua com as outras loterias
             
-            if self.current_operation != "cancelled" and results:
+            if not token.cancelled and results:
                 self.page.run_task(self.display_comparison_results_async, results, years)
         
-        self.current_operation = "comparison"
-        self.operation_thread = threading.Thread(target=comparison_thread)
-        self.operation_thread.start()
-
-    def get_lottery_display_name(self, lottery_code):
-        """Retorna o nome amigável da loteria"""
-        names = {
-            "megasena": "Mega-Sena",
-            "lotofacil": "Lotofácil",
-            "quina": "Quina",
-            "lotomania": "Lotomania",
-            "duplasena": "Dupla Sena",
-            "diadesorte": "Dia de Sorte",
-            "timemania": "Timemania"
-        }
-        return names.get(lottery_code, lottery_code.upper())
+        self.start_background_operation("comparison", comparison_thread)
 
     def get_lottery_color(self, lottery_code):
         """Retorna a cor associada à loteria"""
-        colors = {
-            "megasena": ft.colors.BLUE,
-            "lotofacil": ft.colors.GREEN,
-            "quina": ft.colors.ORANGE,
-            "lotomania": ft.colors.PURPLE,
-            "duplasena": ft.colors.RED,
-            "diadesorte": ft.colors.AMBER,
-            "timemania": ft.colors.CYAN
-        }
-        return colors.get(lottery_code, ft.colors.BLUE)
+        lottery = LOTTERIES.get(lottery_code)
+        return lottery.color if lottery else ft.colors.BLUE
 
     async def display_comparison_results_async(self, results, years):
         """Mostra resultados da comparação (async)"""
@@ -2031,7 +2212,11 @@ class LotteryAnalyzerApp:
         
         comparison_content = ft.Column([
             ft.Text("📈 Resultados da Comparação", size=24, weight=ft.FontWeight.BOLD),
-            ft.Text(f"Período analisado: {years} ano(s)", size=16, color=ft.colors.BLUE_GREY),
+            ft.Text(
+                "Período analisado: todo o histórico em cache" if years == FULL_HISTORY
+                else f"Período analisado: {years} ano(s)",
+                size=16, color=ft.colors.BLUE_GREY
+            ),
             ft.Divider(height=20),
         ])
         
@@ -2201,16 +2386,15 @@ class LotteryAnalyzerApp:
         """Mostra todas as loterias suportadas"""
         self.clear_results()
         
-        # Obter informações das loterias
-        loterias_info = []
-        
-        for lottery in ["megasena", "lotofacil", "quina", "lotomania", "duplasena", "diadesorte", "timemania"]:
-            try:
-                analyzer = LotteryPatternAnalyzer(lottery, years=1)
-                info = analyzer.get_lottery_info()
-                loterias_info.append(info)
-            except:
-                continue
+        # Informações direto do registro (sem criar analisadores nem abrir o banco)
+        loterias_info = [{
+            "tipo": code,
+            "faixa_numeros": f"{lottery.range[0]}-{lottery.range[-1]}",
+            "numeros_por_sorteio": lottery.draw_size,
+            "sorteios_semana": lottery.weekly_draws,
+            "descricao": lottery.description,
+            "concursos_configurados": lottery.games_per_year,
+        } for code, lottery in LOTTERIES.items()]
         
         # Criar cards para cada loteria
         lottery_cards = ft.Column([
@@ -0,0 +1,328 @@
+# mock_api.py - Servidor local que imita a API da Caixa e o espelho (testes de carga sem rede)
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from http_client import TokenBucket
+from lotteries import LOTTERIES
+
+# Último concurso "publicado" de cada loteria (faixa, dezenas e dias de sorteio vêm do registro)
+MOCK_LATEST = {
+    "megasena": 2800,
+    "lotofacil": 3200,
+    "quina": 6500,
+    "lotomania": 2700,
+    "duplasena": 2750,
+    "diadesorte": 1000,
+    "timemania": 2200,
+}
+
+CAIXA_PREFIX = "/portaldeloterias/api"
+MIRROR_PREFIX = "/api"
+
+
+@dataclass
+class MockConfig:
+    """Comportamento simulado do servidor"""
+    latency: float = 0.0            # segundos por resposta
+    latency_jitter: float = 0.0     # variação uniforme somada à latência
+    error_rate: float = 0.0         # fração de respostas 503
+    rate_limit: float = 0.0         # requisições/s antes de responder 429 (0 = sem limite)
+    burst: float = 10.0             # rajada permitida pelo limite
+    retry_after: int = 1            # valor do cabeçalho Retry-After nas respostas 429
+    seed: int = 42                  # semente dos sorteios sintéticos e da injeção de falhas
+    fixtures_dir: Optional[str] = None
+    latest: Dict[str, int] = field(default_factory=dict)
+
+
+class MockLotteryData:
+    def __init__(self, config: MockConfig):
+        """
+        Fonte dos concursos servidos
+
+        Usa as respostas gravadas em `fixtures_dir/<loteria>/<concurso>.json`
+        quando existem e gera sorteios sintéticos determinísticos (mesma semente,
+        mesmos números) para os demais.
+        """
+        self.config = config
+        self._fixtures: Dict[Tuple[str, int], Dict] = {}
+        if config.fixtures_dir:
+            self._load_fixtures(config.fixtures_dir)
+
+    def _load_fixtures(self, fixtures_dir: str):
+        for lottery_type in os.listdir(fixtures_dir):
+            folder = os.path.join(fixtures_dir, lottery_type)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                stem, ext = os.path.splitext(name)
+                if ext == ".json" and stem.isdigit():
+                    with open(os.path.join(folder, name), encoding="utf-8") as f:
+                        self._fixtures[(lottery_type, int(stem))] = json.load(f)
+
+        for (lottery_type, concurso) in self._fixtures:
+            if concurso > self.latest(lottery_type):
+                self.config.latest[lottery_type] = concurso
+
+    def latest(self, lottery_type: str) -> int:
+        """Último concurso "publicado" da loteria"""
+        if lottery_type in self.config.latest:
+            return self.config.latest[lottery_type]
+        return MOCK_LATEST[lottery_type]
+
+    def _draw_date(self, lottery_type: str, concurso: int) -> date:
+        """Data do concurso contando dias de sorteio para trás a partir de hoje"""
+        draw_days = LOTTERIES[lottery_type].draw_days
+        day = date.today()
+        while day.weekday() not in draw_days:
+            day -= timedelta(days=1)
+
+        weeks, remainder = divmod(self.latest(lottery_type) - concurso, len(draw_days))
+        day -= timedelta(weeks=weeks)
+        for _ in range(remainder):
+            day -= timedelta(days=1)
+            while day.weekday() not in draw_days:
+                day -= timedelta(days=1)
+        return day
+
+    def draw(self, lottery_type: str, concurso: int) -> Optional[Tuple[str, list]]:
+        """(data 'dd/mm/aaaa', dezenas na ordem do sorteio) ou None se o concurso não existe"""
+        if lottery_type not in LOTTERIES or not 1 <= concurso <= self.latest(lottery_type):
+            return None
+
+        lottery = LOTTERIES[lottery_type]
+        rng = random.Random(f"{self.config.seed}:{lottery_type}:{concurso}")
+        numbers = rng.sample(lottery.range, lottery.draw_size)
+        return self._draw_date(lottery_type, concurso).strftime("%d/%m/%Y"), numbers
+
+    def payload(self, lottery_type: str, concurso: int, style: str) -> Optional[Dict]:
+        """Resposta no formato da Caixa ('caixa') ou do espelho ('espelho')"""
+        fixture = self._fixtures.get((lottery_type, concurso))
+        if fixture is not None:
+            return fixture
+
+        draw = self.draw(lottery_type, concurso)
+        if draw is None:
+            return None
+        data, numbers = draw
+        dezenas = [f"{n:02d}" for n in numbers]
+
+        if style == "caixa":
+            return {
+                "tipoJogo": lottery_type.upper(),
+                "numero": concurso,
+                "dataApuracao": data,
+                "dezenasSorteadasOrdemSorteio": dezenas,
+                "listaDezenas": sorted(dezenas),
+                "numeroConcursoAnterior": concurso - 1,
+                "numeroConcursoProximo": concurso + 1,
+                "ultimoConcurso": concurso == self.latest(lottery_type),
+                "listaRateioPremio": [],
+            }
+        return {
+            "loteria": lottery_type,
+            "concurso": concurso,
+            "data": data,
+            "dezenasOrdemSorteio": dezenas,
+            "dezenas": sorted(dezenas),
+            "premiacoes": [],
+        }
+
+
+class MockCaixaServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, config: MockConfig = None):
+        """
+        Servidor HTTP local com as rotas das duas APIs
+
+        Caixa:   /portaldeloterias/api/<loteria>[/<concurso>]
+        Espelho: /api/<loteria>/<concurso>, /api/<loteria>/latest e /api/<loteria> (lista completa)
+
+        Args:
+            host: Interface de escuta
+            port: Porta (0 escolhe uma livre)
+            config: Latência, taxa de erros e limite de requisições simulados
+        """
+        self.config = config or MockConfig()
+        self.data = MockLotteryData(self.config)
+        self.limiter = TokenBucket(self.config.rate_limit, self.config.burst) if self.config.rate_limit > 0 else None
+        self.stats = {"requests": 0, "ok": 0, "not_found": 0, "errors": 0, "throttled": 0}
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def caixa_url(self) -> str:
+        return self.base_url + CAIXA_PREFIX
+
+    @property
+    def mirror_url(self) -> str:
+        return self.base_url + MIRROR_PREFIX
+
+    def env(self) -> Dict[str, str]:
+        """Variáveis de ambiente que apontam o aplicativo para este servidor"""
+        return {"DEUSORTE_CAIXA_API_URL": self.caixa_url, "DEUSORTE_MIRROR_API_URL": self.mirror_url}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _fault(self) -> Optional[int]:
+        """Status de falha a simular nesta requisição (429 ou 503) ou None"""
+        if self.limiter and not self.limiter.try_acquire():
+            return 429
+        with self._lock:
+            failed = self._rng.random() < self.config.error_rate
+        return 503 if failed else None
+
+    def route(self, path: str) -> Tuple[int, object]:
+        """Resolve uma rota em (status, corpo JSON)"""
+        path = path.split("?", 1)[0].rstrip("/")
+        style = "caixa" if path.startswith(CAIXA_PREFIX + "/") else "espelho"
+        prefix = CAIXA_PREFIX if style == "caixa" else MIRROR_PREFIX
+
+        match = re.fullmatch(re.escape(prefix) + r"/([a-z]+)(?:/(\d+|latest))?", path)
+        if not match or match.group(1) not in LOTTERIES:
+            return 404, {"erro": "rota inexistente"}
+
+        lottery_type, suffix = match.groups()
+        latest = self.data.latest(lottery_type)
+
+        if suffix is None and style == "espelho":
+            # O espelho devolve todos os concursos, do mais recente para o mais antigo
+            return 200, [self.data.payload(lottery_type, n, style) for n in range(latest, 0, -1)]
+
+        concurso = latest if suffix in (None, "latest") else int(suffix)
+        payload = self.data.payload(lottery_type, concurso, style)
+        if payload is None:
+            return 404, {"erro": f"concurso {concurso} não encontrado"}
+        return 200, payload
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._count("requests")
+                delay = server.config.latency + random.uniform(0, server.config.latency_jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+                fault = server._fault()
+                if fault == 429:
+                    server._count("throttled")
+                    self._reply(429, {"erro": "limite de requisições"}, {"Retry-After": str(server.config.retry_after)})
+                    return
+                if fault == 503:
+                    server._count("errors")
+                    self._reply(503, {"erro": "serviço indisponível"})
+                    return
+
+                status, body = server.route(self.path)
+                server._count("ok" if status == 200 else "not_found")
+                self._reply(status, body)
+
+            def _reply(self, status: int, body, headers: Dict[str, str] = None):
+                content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'MockCaixaServer':
+        """Inicia o servidor em uma thread daemon"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="deusorte-mock-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def record_fixtures(db_path: str, fixtures_dir: str, lottery_type: str = None) -> int:
+    """Exporta as respostas brutas arquivadas no cache como fixtures do servidor"""
+    from analizador import LotteryCacheManager
+
+    cache = LotteryCacheManager(db_path)
+    lotteries = [lottery_type] if lottery_type else list(LOTTERIES)
+    total = 0
+
+    for lottery in lotteries:
+        folder = os.path.join(fixtures_dir, lottery)
+        for concurso, _, payload in cache.iter_raw_payloads(lottery):
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"{concurso}.json"), "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            total += 1
+
+    print(f"💾 {total} respostas gravadas em {fixtures_dir}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API local de loterias para testes sem rede")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência por resposta (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="variação de latência (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requisições/s antes de 429")
+    parser.add_argument("--burst", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fixtures", help="pasta com <loteria>/<concurso>.json")
+    parser.add_argument("--record", metavar="DB", help="exporta o arquivo bruto do cache DB para --fixtures e sai")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures or "fixtures")
+        return
+
+    config = MockConfig(latency=args.latency, latency_jitter=args.jitter, error_rate=args.error_rate,
+                        rate_limit=args.rate_limit, burst=args.burst, seed=args.seed,
+                        fixtures_dir=args.fixtures)
+    server = MockCaixaServer(args.host, args.port, config)
+
+    print(f"🧪 API simulada em {server.base_url}")
+    for name, value in server.env().items():
+        print(f"   export {name}={value}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# null_model.py - Modelo nulo (Monte Carlo) para a significância dos padrões observados
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Optional
+
+import numpy as np
+
+from task_manager import CancellationToken, check_cancelled
+
+NULL_MODEL_VERSION = 1
+
+# Métricas simuladas (mesmas definições das análises _analyze_* do analisador)
+NULL_MODEL_METRICS = {
+    "media_pares": "Média de pares por sorteio",
+    "media_baixos": "Média de baixos por sorteio",
+    "media_soma": "Média da soma",
+    "desvio_soma": "Desvio padrão da soma",
+    "media_sequencias": "Sequências por sorteio",
+    "media_repeticao": "Repetição do concurso anterior",
+    "media_atraso": "Atraso médio",
+    "atraso_maximo": "Maior atraso",
+    "par_proximo_max": "Par próximo mais frequente",
+    "desvio_frequencia": "Desvio padrão da frequência",
+}
+
+# Células (históricos × concursos × números) por lote e abaixo das quais não vale abrir processos
+_BATCH_CELLS = 2_000_000
+_INLINE_CELLS = 20_000_000
+
+# Simulações já carregadas nesta sessão: (diretório, loteria, concursos, dezenas) -> métricas
+_memory_cache: Dict[tuple, Dict[str, np.ndarray]] = {}
+
+
+def history_metrics(present: np.ndarray, values: np.ndarray, low_max: int) -> Dict[str, np.ndarray]:
+    """
+    Métricas de cada histórico de uma pilha (B, N, R) de matrizes de incidência
+
+    As colunas são os números da loteria em ordem (`values`), consecutivos.
+    Retorna um array (B,) por métrica.
+    """
+    counts = present.astype(np.int16)
+    draws = present.shape[1]
+
+    sums = counts @ values
+    pairs = present[..., :-1] & present[..., 1:]
+    before = np.zeros(pairs.shape, dtype=bool)
+    before[..., 1:] = present[..., :-2]
+
+    # Atraso de cada número ao fim do histórico, sem contar o último concurso
+    previous = present[:, :-1][:, ::-1]
+    seen = previous.any(axis=1)
+    delays = np.where(seen, previous.argmax(axis=1), draws - 1)
+
+    near = [(present[..., :-diff] & present[..., diff:]).sum(axis=1).max(axis=1) for diff in (1, 2, 3)]
+    repetition = (present[:, 1:] & present[:, :-1]).sum(axis=2)
+
+    return {
+        "media_pares": counts[..., values % 2 == 0].sum(axis=2).mean(axis=1),
+        "media_baixos": counts[..., values <= low_max].sum(axis=2).mean(axis=1),
+        "media_soma": sums.mean(axis=1),
+        "desvio_soma": sums.std(axis=1),
+        "media_sequencias": (pairs & ~before).sum(axis=2).mean(axis=1),
+        "media_repeticao": repetition.mean(axis=1) if draws > 1 else np.zeros(len(present)),
+        "media_atraso": delays.mean(axis=1),
+        "atraso_maximo": delays.max(axis=1).astype(np.float64),
+        "par_proximo_max": np.max(near, axis=0).astype(np.float64),
+        "desvio_frequencia": counts.sum(axis=1).std(axis=1),
+    }
+
+
+def random_histories(rng: np.random.Generator, histories: int, draws: int,
+                     numbers: int, draw_size: int) -> np.ndarray:
+    """Pilha (histories, draws, numbers) de sorteios justos sem reposição"""
+    keys = rng.random((histories, draws, numbers), dtype=np.float32)
+    # As posições dos draw_size menores valores aleatórios de cada linha são os números sorteados
+    chosen = np.argpartition(keys, draw_size - 1, axis=2)[..., :draw_size]
+    present = np.zeros(keys.shape, dtype=bool)
+    np.put_along_axis(present, chosen, True, axis=2)
+    return present
+
+
+def simulate_chunk(seed, histories: int, draws: int, values: np.ndarray,
+                   draw_size: int, low_max: int, cancel_token: CancellationToken = None) -> Dict[str, np.ndarray]:
+    """
+    Simula `histories` históricos em lotes (nos processos auxiliares ou inline)
+
+    O token só é usado na execução inline (não atravessa processos): é verificado a cada lote.
+    """
+    rng = np.random.default_rng(seed)
+    batch = max(1, _BATCH_CELLS // max(1, draws * len(values)))
+    parts = []
+    for start in range(0, histories, batch):
+        check_cancelled(cancel_token)
+        present = random_histories(rng, min(batch, histories - start), draws, len(values), draw_size)
+        parts.append(history_metrics(present, values, low_max))
+    return {key: np.concatenate([part[key] for part in parts]) for key in NULL_MODEL_METRICS}
+
+
+def simulate(histories: int, draws: int, values: np.ndarray, draw_size: int, low_max: int,
+             seed=None, workers: Optional[int] = None,
+             cancel_token: CancellationToken = None) -> Dict[str, np.ndarray]:
+    """
+    Métricas de `histories` históricos sintéticos de `draws` concursos
+
+    Trabalhos grandes são divididos entre processos (um bloco de históricos por
+    processo, cada um com sua semente derivada de `seed`).
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if histories <= 0:
+        return {key: np.empty(0) for key in NULL_MODEL_METRICS}
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or histories * draws * len(values) <= _INLINE_CELLS:
+        return simulate_chunk(seed, histories, draws, values, draw_size, low_max, cancel_token)
+
+    chunks = min(histories, workers * 4)
+    sizes = [histories // chunks + (1 if i < histories % chunks else 0) for i in range(chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+
+    parts = [None] * chunks
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = {pool.submit(simulate_chunk, chunk_seed, size, draws, values, draw_size, low_max): i
+                   for i, (chunk_seed, size) in enumerate(zip(seeds, sizes))}
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                check_cancelled(cancel_token)
+                for future in done:
+                    parts[pending.pop(future)] = future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return {key: np.concatenate([part[key] for part in parts]) for key in NULL_MODEL_METRICS}
+
+
+def _cache_path(base_dir: str, lottery_type: str, draws: int) -> str:
+    return os.path.join(base_dir, f"{lottery_type}_{draws}.npz")
+
+
+def load_simulations(base_dir: str, lottery_type: str, draws: int,
+                     draw_size: int) -> Dict[str, np.ndarray]:
+    """Simulações guardadas para (loteria, concursos); vazio se ausentes ou de outra versão"""
+    key = (base_dir, lottery_type, draws, draw_size)
+    if key in _memory_cache:
+        return _memory_cache[key]
+    try:
+        with np.load(_cache_path(base_dir, lottery_type, draws)) as data:
+            if int(data["versao"]) != NULL_MODEL_VERSION or int(data["draw_size"]) != draw_size:
+                return {}
+            simulated = {name: data[name] for name in NULL_MODEL_METRICS}
+    except (OSError, KeyError, ValueError):
+        return {}
+    _memory_cache[key] = simulated
+    return simulated
+
+
+def save_simulations(base_dir: str, lottery_type: str, draws: int, draw_size: int,
+                     simulated: Dict[str, np.ndarray]):
+    """Grava as simulações (arquivo temporário + rename) e as mantém em memória"""
+    os.makedirs(base_dir, exist_ok=True)
+    path = _cache_path(base_dir, lottery_type, draws)
+    temp_path = path[:-4] + ".tmp.npz"
+    np.savez(temp_path, versao=NULL_MODEL_VERSION, draw_size=draw_size, **simulated)
+    os.replace(temp_path, path)
+    _memory_cache[(base_dir, lottery_type, draws, draw_size)] = simulated
+
+
+def cached_simulations(base_dir: str, lottery_type: str, draws: int, values: np.ndarray,
+                       draw_size: int, low_max: int, histories: int, workers: Optional[int] = None,
+                       cancel_token: CancellationToken = None) -> Dict[str, np.ndarray]:
+    """
+    Pelo menos `histories` simulações para (loteria, concursos), reaproveitando o cache
+
+    Se o cache tem menos históricos que o pedido, só a diferença é simulada.
+    """
+    simulated = load_simulations(base_dir, lottery_type, draws, draw_size)
+    have = len(simulated.get("media_soma", ()))
+    if have >= histories:
+        return {key: array[:histories] for key, array in simulated.items()}
+
+    # Semente determinística por (loteria, concursos, já simulados)
+    seed = [draws, have, sum(lottery_type.encode())]
+    extra = simulate(histories - have, draws, values, draw_size, low_max, seed=seed,
+                     workers=workers, cancel_token=cancel_token)
+    if have:
+        extra = {key: np.concatenate([simulated[key], extra[key]]) for key in NULL_MODEL_METRICS}
+    save_simulations(base_dir, lottery_type, draws, draw_size, extra)
+    return extra
+
+
+def significance(observed: Dict[str, float], simulated: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    """P-valor empírico bilateral e faixa de 95% de cada métrica"""
+    result = {}
+    for key, label in NULL_MODEL_METRICS.items():
+        sims = simulated[key]
+        value = observed[key]
+        below = np.count_nonzero(sims <= value)
+        above = np.count_nonzero(sims >= value)
+        low, high = np.percentile(sims, [2.5, 97.5])
+        result[key] = {
+            "descricao": label,
+            "observado": float(value),
+            "esperado": float(sims.mean()),
+            "faixa_95": [float(low), float(high)],
+            "p_valor": min(1.0, 2 * (min(below, above) + 1) / (len(sims) + 1)),
+        }
+    return result
@@ -0,0 +1,83 @@
+# number_index.py - Índice invertido número → concursos para consultas de coocorrência
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from draw_matrix import DrawMatrix
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+class NumberIndex:
+    def __init__(self, postings: Dict[int, np.ndarray] = None):
+        """
+        Índice invertido de uma loteria: para cada número, os concursos (int32, em
+        ordem crescente) em que ele saiu
+
+        Interseções e uniões trabalham só sobre as listas dos números consultados,
+        sem percorrer os resultados.
+        """
+        self.postings: Dict[int, np.ndarray] = postings or {}
+
+    @classmethod
+    def from_matrix(cls, matrix: DrawMatrix) -> 'NumberIndex':
+        """Monta o índice a partir da matriz de incidência (uma única passada)"""
+        numbers, rows = np.nonzero(matrix.present.T)
+        bounds = np.searchsorted(numbers, np.arange(matrix.counts.shape[1] + 1))
+        concursos = np.asarray(matrix.concursos, dtype=np.int32)[rows]
+        return cls({num: concursos[bounds[num]:bounds[num + 1]]
+                    for num in range(matrix.counts.shape[1]) if bounds[num + 1] > bounds[num]})
+
+    def contests(self, number: int) -> np.ndarray:
+        """Concursos em que o número saiu"""
+        return self.postings.get(number, _EMPTY)
+
+    def intersect(self, numbers: Iterable[int]) -> np.ndarray:
+        """Concursos em que todos os números saíram juntos"""
+        lists = sorted((self.contests(num) for num in set(numbers)), key=len)
+        if not lists:
+            return _EMPTY
+        result = lists[0]
+        for other in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def union(self, numbers: Iterable[int]) -> np.ndarray:
+        """Concursos em que saiu pelo menos um dos números"""
+        lists = [self.contests(num) for num in set(numbers)]
+        if not lists:
+            return _EMPTY
+        return np.unique(np.concatenate(lists))
+
+    def add(self, results: List[Dict]):
+        """Acrescenta concursos novos ao índice (sem reconstruí-lo)"""
+        additions = defaultdict(list)
+        for result in results:
+            for num in set(result['numeros']):
+                additions[num].append(result['concurso'])
+
+        for num, concursos in additions.items():
+            new = np.array(sorted(concursos), dtype=np.int32)
+            current = self.contests(num)
+            if not len(current) or new[0] > current[-1]:
+                self.postings[num] = np.concatenate([current, new])
+            else:
+                self.postings[num] = np.union1d(current, new).astype(np.int32)
+
+    def trim_before(self, concurso: int):
+        """Descarta concursos anteriores a `concurso` (janela deslizante)"""
+        for num in list(self.postings):
+            current = self.postings[num]
+            start = int(np.searchsorted(current, concurso, side='left'))
+            if start == len(current):
+                del self.postings[num]
+            elif start:
+                self.postings[num] = current[start:]
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelas listas"""
+        return sum(array.nbytes for array in self.postings.values())
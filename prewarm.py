@@ -0,0 +1,173 @@
+# prewarm.py - Pré-aquecimento do cache logo após cada sorteio publicado
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from analizador import LotteryPatternAnalyzer
+from draw_calendar import DRAW_PUBLISH_HOUR, next_draw_after, parse_draw_date
+from http_client import FetchError
+from lotteries import get_lottery
+from task_manager import BackgroundTaskManager, CancellationToken, OperationCancelled
+
+# Erros que indicam falta de conexão (o agendador pausa em silêncio)
+OFFLINE_ERRORS = (FetchError, requests.ConnectionError, requests.Timeout, OSError)
+
+
+class PrewarmScheduler:
+    def __init__(self, lottery_types: Iterable[str], publish_delay: float = 20 * 60,
+                 jitter: float = 10 * 60, retry_interval: float = 15 * 60,
+                 max_retry_interval: float = 3 * 3600, publish_grace: float = 6 * 3600,
+                 on_update: Callable[[str, List[Dict]], None] = None):
+        """
+        Agendador em segundo plano que baixa os concursos novos assim que publicados
+
+        Cada loteria é consultada só depois do horário de publicação do próximo
+        sorteio do seu calendário (mais `publish_delay` e um atraso aleatório de até
+        `jitter`, para não consultar todas ao mesmo tempo). Se o resultado ainda não
+        saiu, tenta de novo a cada `retry_interval` por até `publish_grace`. Sem
+        conexão, pausa em silêncio com espera crescente até `max_retry_interval`.
+
+        Args:
+            lottery_types: Loterias a manter aquecidas
+            publish_delay: Segundos após o horário de publicação antes da consulta
+            jitter: Atraso aleatório máximo (segundos) somado a cada agendamento
+            retry_interval: Intervalo entre consultas enquanto o resultado não sai
+            max_retry_interval: Espera máxima entre tentativas quando offline
+            publish_grace: Tempo após o sorteio durante o qual ainda se espera o resultado
+            on_update: Chamado com (loteria, concursos novos) após cada download
+        """
+        self.lottery_types = list(lottery_types)
+        self.publish_delay = publish_delay
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.publish_grace = publish_grace
+        self.on_update = on_update
+
+        self.offline = False
+        self.next_run: Dict[str, datetime] = {}
+        self._analyzers: Dict[str, LotteryPatternAnalyzer] = {}
+        self._offline_backoff = retry_interval
+        self._tasks = BackgroundTaskManager(max_workers=1)
+
+    def _analyzer(self, lottery_type: str) -> LotteryPatternAnalyzer:
+        if lottery_type not in self._analyzers:
+            self._analyzers[lottery_type] = LotteryPatternAnalyzer(lottery_type)
+        return self._analyzers[lottery_type]
+
+    def _jittered(self, moment: datetime, spread: float = None) -> datetime:
+        return moment + timedelta(seconds=random.uniform(0, self.jitter if spread is None else spread))
+
+    def _expected_publication(self, lottery_type: str) -> Optional[datetime]:
+        """Horário de publicação do primeiro sorteio posterior ao último concurso em cache"""
+        analyzer = self._analyzer(lottery_type)
+        state = analyzer.cache_manager.get_sync_state(lottery_type)
+        last_draw = parse_draw_date(state['data_ultimo_concurso']) if state else None
+        if last_draw is None:
+            return None
+
+        draw_days = get_lottery(lottery_type).draw_days
+        reference = datetime.combine(last_draw, datetime.min.time()).replace(hour=DRAW_PUBLISH_HOUR)
+        return next_draw_after(reference, draw_days)
+
+    def _schedule(self, lottery_type: str, now: datetime, found_new: bool = False):
+        """Define a próxima consulta de uma loteria a partir do calendário"""
+        expected = self._expected_publication(lottery_type)
+        if expected is None:
+            # Sem histórico no cache: o primeiro aquecimento fica para a abertura da análise
+            self.next_run[lottery_type] = now + timedelta(seconds=self.max_retry_interval)
+            return
+
+        due = expected + timedelta(seconds=self.publish_delay)
+        if due > now:
+            self.next_run[lottery_type] = self._jittered(due)
+        elif not found_new and (now - expected).total_seconds() < self.publish_grace:
+            # Sorteio realizado, mas o resultado ainda não apareceu na API
+            self.next_run[lottery_type] = self._jittered(now + timedelta(seconds=self.retry_interval))
+        elif found_new:
+            # Mais de um sorteio pendente (ex.: app fechado por dias): continua em seguida
+            self.next_run[lottery_type] = self._jittered(now, spread=60)
+        else:
+            # Sorteio sem resultado publicado (feriado/adiado): espera o próximo do calendário
+            draw_days = get_lottery(lottery_type).draw_days
+            self.next_run[lottery_type] = self._jittered(
+                next_draw_after(now, draw_days) + timedelta(seconds=self.publish_delay)
+            )
+
+    def _warm(self, lottery_type: str, token: CancellationToken) -> bool:
+        """Baixa os concursos novos de uma loteria; False quando não há conexão"""
+        now = datetime.now()
+        try:
+            new_results = self._analyzer(lottery_type).refresh_latest(token)
+        except OperationCancelled:
+            raise
+        except OFFLINE_ERRORS:
+            return False
+        except Exception as e:
+            print(f"⚠️  Pré-aquecimento de {lottery_type} falhou: {e}")
+            self.next_run[lottery_type] = self._jittered(now + timedelta(seconds=self.retry_interval))
+            return True
+
+        if self.offline:
+            print("🌐 Conexão restabelecida: pré-aquecimento retomado")
+            self.offline = False
+            self._offline_backoff = self.retry_interval
+
+        self._schedule(lottery_type, datetime.now(), found_new=bool(new_results))
+        if new_results:
+            print(f"🔥 Cache de {lottery_type} aquecido com {len(new_results)} concurso(s) novo(s)")
+            if self.on_update:
+                try:
+                    self.on_update(lottery_type, new_results)
+                except Exception as e:
+                    print(f"Erro ao notificar atualização de {lottery_type}: {e}")
+        return True
+
+    def _loop(self, token: CancellationToken):
+        now = datetime.now()
+        for lottery_type in self.lottery_types:
+            # Na abertura, consultas atrasadas saem espalhadas no primeiro minuto
+            self._schedule(lottery_type, now)
+            if self.next_run[lottery_type] <= now:
+                self.next_run[lottery_type] = self._jittered(now, spread=60)
+
+        while True:
+            lottery_type = min(self.next_run, key=self.next_run.get)
+            wait = (self.next_run[lottery_type] - datetime.now()).total_seconds()
+            if wait > 0:
+                # Acorda periodicamente para acompanhar mudanças de relógio/suspensão
+                token.sleep(min(wait, 300))
+                continue
+
+            if self._warm(lottery_type, token):
+                continue
+
+            if not self.offline:
+                print("📴 Sem conexão: pré-aquecimento pausado")
+                self.offline = True
+            # Uma única sonda por vez enquanto offline, com espera crescente
+            retry_at = self._jittered(datetime.now() + timedelta(seconds=self._offline_backoff),
+                                      spread=self._offline_backoff * 0.2)
+            for name in self.next_run:
+                self.next_run[name] = max(self.next_run[name], retry_at)
+            self._offline_backoff = min(self.max_retry_interval, self._offline_backoff * 2)
+
+    def start(self) -> bool:
+        """Inicia o agendador (sem efeito se já estiver ativo)"""
+        if not self.lottery_types:
+            return False
+        return self._tasks.submit("prewarm", self._loop) is not None
+
+    def stop(self):
+        """Interrompe o agendador e qualquer download em andamento"""
+        self._tasks.cancel("prewarm")
+
+    def close(self):
+        """Interrompe o agendador de vez e libera sua thread (fechamento do aplicativo)"""
+        self._tasks.shutdown()
+
+    @property
+    def running(self) -> bool:
+        return self._tasks.is_running("prewarm")
@@ -0,0 +1,194 @@
+# progress.py - Canal de progresso com eventos tipados e entrega limitada por taxa
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Estado de progresso de uma operação longa"""
+    phase: str                      # 'consulta', 'cache', 'download', 'analise', 'concluido'
+    done: int = 0
+    total: int = 0
+    bytes: int = 0
+    rate: float = 0.0               # itens por segundo
+    eta: Optional[float] = None     # segundos restantes estimados
+    message: str = ""
+    lottery_type: str = ""
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Fração concluída (0-1) ou None se o total é desconhecido"""
+        if self.total <= 0:
+            return None
+        return min(1.0, self.done / self.total)
+
+    def format(self) -> str:
+        """Representação textual usada pelo console e pela interface"""
+        if self.total <= 0:
+            return self.message
+
+        text = f"{self.done}/{self.total} concursos"
+        if self.rate > 0:
+            text += f" • {self.rate:.1f}/s"
+        if self.bytes:
+            text += f" • {self.bytes / 1024:.0f} KB"
+        if self.eta is not None and self.done < self.total:
+            text += f" • restam ~{self.eta:.0f}s"
+
+        return f"{self.message}\n{text}" if self.message else text
+
+
+class _Subscription:
+    def __init__(self, bus: 'ProgressBus', callback: Callable[[ProgressEvent], None], max_rate: float):
+        self.bus = bus
+        self.callback = callback
+        self.interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.last_delivery = 0.0
+        self.pending: Optional[ProgressEvent] = None
+        self.timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+        self.active = True
+
+    def offer(self, event: ProgressEvent, force: bool = False):
+        """Entrega o evento agora ou guarda apenas o mais recente para a próxima janela"""
+        with self.lock:
+            if not self.active:
+                return
+
+            now = time.monotonic()
+            wait = self.last_delivery + self.interval - now
+            if force or wait <= 0:
+                self.pending = None
+                if self.timer:
+                    self.timer.cancel()
+                    self.timer = None
+                self.last_delivery = now
+            else:
+                # Coalescência: eventos intermediários são descartados
+                self.pending = event
+                if not self.timer:
+                    self.timer = threading.Timer(wait, self._flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+
+        self._deliver(event)
+
+    def _flush(self):
+        """Entrega o último evento pendente ao fim da janela de espera"""
+        with self.lock:
+            event = self.pending
+            self.pending = None
+            self.timer = None
+            if event is None or not self.active:
+                return
+            self.last_delivery = time.monotonic()
+
+        self._deliver(event)
+
+    def _deliver(self, event: ProgressEvent):
+        try:
+            self.callback(event)
+        except Exception as e:
+            print(f"Erro no consumidor de progresso: {e}")
+
+    def cancel(self):
+        """Remove a inscrição e descarta eventos pendentes"""
+        with self.lock:
+            self.active = False
+            self.pending = None
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+        self.bus._remove(self)
+
+
+class ProgressBus:
+    def __init__(self, default_max_rate: float = 4.0):
+        """
+        Canal de progresso compartilhado entre o motor de download e as visualizações
+
+        Args:
+            default_max_rate: Atualizações por segundo entregues a cada consumidor
+        """
+        self.default_max_rate = default_max_rate
+        self._subscriptions: List[_Subscription] = []
+        self._lock = threading.Lock()
+        self.latest: Optional[ProgressEvent] = None
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None],
+                  max_rate: float = None) -> _Subscription:
+        """Inscreve um consumidor; cada um recebe no máximo `max_rate` eventos por segundo"""
+        subscription = _Subscription(self, callback, self.default_max_rate if max_rate is None else max_rate)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _remove(self, subscription: _Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, event: ProgressEvent, force: bool = False):
+        """
+        Publica um evento de progresso
+
+        Eventos com force=True (início/fim de fase, erros) são entregues imediatamente.
+        """
+        self.latest = event
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.offer(event, force=force)
+
+    def message(self, text: str, phase: str = "info", lottery_type: str = ""):
+        """Publica uma mensagem avulsa sem contadores"""
+        self.publish(ProgressEvent(phase=phase, message=text, lottery_type=lottery_type), force=True)
+
+    def tracker(self, phase: str, total: int, message: str = "", lottery_type: str = "") -> 'ProgressTracker':
+        """Cria um rastreador que calcula taxa e ETA para uma fase com total conhecido"""
+        return ProgressTracker(self, phase, total, message, lottery_type)
+
+
+class ProgressTracker:
+    def __init__(self, bus: ProgressBus, phase: str, total: int, message: str = "", lottery_type: str = ""):
+        """Acumula contadores de uma fase e publica eventos com taxa e ETA"""
+        self.bus = bus
+        self.started = time.monotonic()
+        self.message = message
+        self.event = ProgressEvent(phase=phase, total=total, message=message, lottery_type=lottery_type)
+        self.bus.publish(self.event, force=True)
+
+    def advance(self, count: int = 1, nbytes: int = 0, message: str = None):
+        """Registra itens concluídos na fase; `message` vale só para este evento"""
+        done = self.event.done + count
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = done / elapsed
+        eta = (self.event.total - done) / rate if rate > 0 else None
+
+        self.event = replace(
+            self.event,
+            done=done,
+            bytes=self.event.bytes + nbytes,
+            rate=rate,
+            eta=eta,
+            message=self.message if message is None else message
+        )
+        self.bus.publish(self.event, force=done >= self.event.total)
+
+    def finish(self, message: str = None):
+        """Publica o estado final da fase imediatamente"""
+        self.event = replace(
+            self.event,
+            phase="concluido",
+            eta=0.0,
+            message=self.message if message is None else message
+        )
+        self.bus.publish(self.event, force=True)
+
+
+def console_printer(event: ProgressEvent):
+    """Consumidor padrão para uso em linha de comando"""
+    print(f"   {event.format()}".replace("\n", " | "))
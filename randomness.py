@@ -0,0 +1,191 @@
+# randomness.py - Bateria de testes de aleatoriedade sobre a matriz de incidência
+import math
+from typing import Dict
+
+import numpy as np
+
+SIGNIFICANCE_LEVEL = 0.05
+
+
+def chi2_sf(statistic: float, dof: float) -> float:
+    """P(X ≥ statistic) para X ~ qui-quadrado com `dof` graus de liberdade"""
+    if dof <= 0:
+        return float("nan")
+    if statistic <= 0:
+        return 1.0
+    return _gamma_q(dof / 2, statistic / 2)
+
+
+def _gamma_q(a: float, x: float) -> float:
+    """Função gama incompleta superior regularizada Q(a, x)"""
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        # Série para P(a, x)
+        term = total = 1 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1 - total * math.exp(log_prefix))
+
+    # Fração contínua (Lentz) para Q(a, x)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def normal_two_sided(z: float) -> float:
+    """P-valor bilateral de uma estatística z"""
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def _result(description: str, statistic: float, p_value: float, **details) -> Dict:
+    return {
+        "descricao": description,
+        "estatistica": float(statistic),
+        "p_valor": float(p_value),
+        "conclusao": "desvio detectado" if p_value < SIGNIFICANCE_LEVEL else "compatível com o acaso",
+        **details,
+    }
+
+
+def frequency_uniformity(present: np.ndarray, draw_size: int) -> Dict:
+    """Qui-quadrado das frequências contra a uniforme (corrigido para sorteio sem reposição)"""
+    draws, numbers = present.shape
+    frequencies = present.sum(axis=0, dtype=np.int64)
+    expected = draws * draw_size / numbers
+    # Sem reposição a variância de cada frequência é menor: fator (R - 1) / (R - k)
+    statistic = ((frequencies - expected) ** 2).sum() / expected * (numbers - 1) / (numbers - draw_size)
+    dof = numbers - 1
+    return _result("Uniformidade das frequências (qui-quadrado)", statistic, chi2_sf(statistic, dof),
+                   graus_liberdade=dof, frequencia_esperada=expected)
+
+
+def runs_per_number(present: np.ndarray, values: np.ndarray) -> Dict:
+    """Teste de sequências (Wald-Wolfowitz) da presença de cada número ao longo dos concursos"""
+    draws = present.shape[0]
+    ones = present.sum(axis=0, dtype=np.float64)
+    zeros = draws - ones
+    runs = 1 + (present[1:] != present[:-1]).sum(axis=0)
+
+    product = 2 * ones * zeros
+    mean = product / draws + 1
+    variance = product * (product - draws) / (draws ** 2 * (draws - 1))
+    valid = variance > 0
+    z = np.zeros(len(values))
+    z[valid] = (runs[valid] - mean[valid]) / np.sqrt(variance[valid])
+
+    p_values = np.array([normal_two_sided(value) if ok else 1.0 for value, ok in zip(z, valid)])
+    rejected = int(np.count_nonzero(p_values < SIGNIFICANCE_LEVEL))
+    # Combina os z (aprox. independentes) em um qui-quadrado com um grau por número
+    statistic = float((z[valid] ** 2).sum())
+    worst = np.argsort(p_values, kind="stable")[:5]
+    return _result("Sequências por número (Wald-Wolfowitz)", statistic,
+                   chi2_sf(statistic, int(valid.sum())),
+                   graus_liberdade=int(valid.sum()), numeros_rejeitados=rejected,
+                   rejeicoes_esperadas=SIGNIFICANCE_LEVEL * int(valid.sum()),
+                   mais_extremos=[(int(values[i]), float(p_values[i])) for i in worst])
+
+
+def serial_correlation(sums: np.ndarray, max_lag: int = 10) -> Dict:
+    """Autocorrelação das somas (Ljung-Box até `max_lag`)"""
+    draws = len(sums)
+    max_lag = min(max_lag, draws - 2)
+    centered = sums - sums.mean()
+    denominator = float((centered ** 2).sum())
+    if max_lag < 1 or denominator == 0:
+        return _result("Correlação serial das somas (Ljung-Box)", 0.0, 1.0, autocorrelacoes={})
+
+    lags = np.arange(1, max_lag + 1)
+    correlations = np.array([(centered[lag:] * centered[:-lag]).sum() for lag in lags]) / denominator
+    statistic = draws * (draws + 2) * float((correlations ** 2 / (draws - lags)).sum())
+    return _result("Correlação serial das somas (Ljung-Box)", statistic, chi2_sf(statistic, max_lag),
+                   graus_liberdade=max_lag,
+                   autocorrelacoes={int(lag): float(r) for lag, r in zip(lags, correlations)})
+
+
+def gap_distribution(present: np.ndarray, draw_size: int) -> Dict:
+    """Intervalos entre aparições de um número contra a distribuição geométrica"""
+    numbers = present.shape[1]
+    p = draw_size / numbers
+    columns, rows = np.nonzero(present.T)
+    same_number = columns[1:] == columns[:-1]
+    gaps = np.diff(rows)[same_number]
+    if not len(gaps):
+        return _result("Intervalos entre aparições (geométrica)", 0.0, 1.0, intervalos=0)
+
+    # Classes 1..m e "m + 1 ou mais", com pelo menos 5 intervalos esperados em cada
+    total = len(gaps)
+    m = 1
+    if total * p > 5:
+        m = max(1, int(1 + math.log(5 / (total * p)) / math.log(1 - p)))
+    while m > 1 and total * (1 - p) ** m < 5:
+        m -= 1
+    expected = np.append(total * p * (1 - p) ** np.arange(m), total * (1 - p) ** m)
+    observed = np.bincount(np.minimum(gaps, m + 1) - 1, minlength=m + 1)
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    dof = m
+    return _result("Intervalos entre aparições (geométrica)", statistic, chi2_sf(statistic, dof),
+                   graus_liberdade=dof, intervalos=int(total), intervalo_medio=float(gaps.mean()),
+                   intervalo_medio_esperado=1 / p)
+
+
+def pairwise_independence(present: np.ndarray, values: np.ndarray, draw_size: int) -> Dict:
+    """Coocorrência de cada par de números contra o esperado para sorteios independentes"""
+    draws, numbers = present.shape
+    matrix = present.astype(np.float32)
+    together = (matrix.T @ matrix).astype(np.int64)
+    upper = np.triu_indices(numbers, k=1)
+    counts = together[upper]
+
+    falling = lambda j: math.prod((draw_size - i) / (numbers - i) for i in range(j))
+    q = falling(2)
+    expected = draws * q
+    z = (counts - expected) / math.sqrt(draws * q * (1 - q))
+    statistic = float((z ** 2).sum())
+
+    # Pares com números em comum são correlacionados (trio ou quarteto no mesmo sorteio):
+    # a soma dos z² é aproximada por c·qui-quadrado(ν) (Satterthwaite) com as covariâncias exatas
+    pairs = len(counts)
+    sharing = 2 * (numbers - 2)
+    rho_shared = (falling(3) - q ** 2) / (q * (1 - q))
+    rho_disjoint = (falling(4) - q ** 2) / (q * (1 - q)) if draw_size >= 4 else -q / (1 - q)
+    trace_squared = pairs * (1 + sharing * rho_shared ** 2 + (pairs - 1 - sharing) * rho_disjoint ** 2)
+    scale = trace_squared / pairs
+    dof = pairs ** 2 / trace_squared
+    top = int(np.argmax(z))
+    return _result("Independência entre pares (qui-quadrado ajustado)", statistic,
+                   chi2_sf(statistic / scale, dof), graus_liberdade=dof, coocorrencia_esperada=expected,
+                   par_mais_frequente=((int(values[upper[0][top]]), int(values[upper[1][top]])),
+                                       int(counts[top])))
+
+
+def randomness_battery(present: np.ndarray, values: np.ndarray, draw_size: int) -> Dict[str, Dict]:
+    """Todos os testes sobre uma matriz de incidência (N, R) com colunas `values`"""
+    values = np.asarray(values)
+    sums = present.astype(np.int64) @ values
+    return {
+        "uniformidade": frequency_uniformity(present, draw_size),
+        "sequencias_por_numero": runs_per_number(present, values),
+        "correlacao_serial": serial_correlation(sums.astype(np.float64)),
+        "intervalos": gap_distribution(present, draw_size),
+        "pares": pairwise_independence(present, values, draw_size),
+    }
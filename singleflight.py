@@ -0,0 +1,65 @@
+# singleflight.py - Deduplicação de downloads simultâneos entre analisadores
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Tuple
+
+
+class ContestSingleFlight:
+    def __init__(self):
+        """
+        Registro, por processo, dos concursos com download em andamento
+
+        Cada (loteria, concurso) tem no máximo um download ativo. Um pedido por
+        um intervalo assume os concursos livres e aguarda os que já estão sendo
+        baixados por outro analisador, então intervalos sobrepostos compartilham
+        a mesma requisição.
+        """
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, int], Future] = {}
+
+    def claim(self, lottery_type: str, concursos: Iterable[int]) -> Tuple[List[int], Dict[int, Future]]:
+        """
+        Reserva os concursos livres de um intervalo
+
+        Returns:
+            (concursos que o chamador deve baixar, {concurso: Future} já em andamento)
+        """
+        owned = []
+        waiting = {}
+        with self._lock:
+            for concurso in concursos:
+                key = (lottery_type, concurso)
+                future = self._inflight.get(key)
+                if future is None:
+                    self._inflight[key] = Future()
+                    owned.append(concurso)
+                else:
+                    waiting[concurso] = future
+        return owned, waiting
+
+    def resolve(self, lottery_type: str, concurso: int, result):
+        """Publica o resultado de um concurso reservado para quem estiver aguardando"""
+        with self._lock:
+            future = self._inflight.pop((lottery_type, concurso), None)
+        if future is not None:
+            future.set_result(result)
+
+    def abandon(self, lottery_type: str, concursos: Iterable[int], error: BaseException):
+        """Libera concursos reservados que não serão baixados (erro ou cancelamento)"""
+        futures = []
+        with self._lock:
+            for concurso in concursos:
+                future = self._inflight.pop((lottery_type, concurso), None)
+                if future is not None:
+                    futures.append(future)
+        for future in futures:
+            future.set_exception(error)
+
+    def in_flight(self, lottery_type: str) -> int:
+        """Quantidade de concursos da loteria com download em andamento"""
+        with self._lock:
+            return sum(1 for key in self._inflight if key[0] == lottery_type)
+
+
+# Instância única do processo, compartilhada por todos os analisadores
+download_flights = ContestSingleFlight()
@@ -0,0 +1,249 @@
+# snapshot.py - Snapshot colunar (.npy, memory-mapped) dos concursos de cada loteria
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from draw_matrix import DrawMatrix, pack_rows
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_COLUMNS = ("concursos", "datas", "numeros", "counts", "bitmask")
+# Índice de datas: só as linhas com data conhecida, em ordem de data (tamanho = manifesto 'datados')
+DATE_INDEX_COLUMNS = ("datas_ordenadas", "linhas_por_data")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Gravações da mesma loteria no processo (pré-aquecimento e análise) uma de cada vez
+_write_locks: Dict[str, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DrawSnapshot:
+    """
+    Colunas de uma loteria abertas com np.load(mmap_mode='r')
+
+    As páginas são compartilhadas pelo sistema operacional entre a interface e
+    qualquer processo que abra o mesmo snapshot (nada é copiado na abertura).
+    """
+    concursos: np.ndarray           # int32 (N,), em ordem crescente
+    datas: np.ndarray               # int32 (N,): date.toordinal() (0 = data desconhecida)
+    numeros: np.ndarray             # int16 (N, K): dezenas na ordem do sorteio, -1 completa
+    counts: np.ndarray              # uint8 (N, max_number + 1): matriz de incidência
+    bitmask: np.ndarray             # uint64 (N, palavras): bit n ligado se o número n saiu
+    datas_ordenadas: np.ndarray     # int32 (D,): ordinais das linhas com data, crescentes
+    linhas_por_data: np.ndarray     # int32 (D,): linha de cada posição de datas_ordenadas
+
+    def __len__(self) -> int:
+        return len(self.concursos)
+
+    def window(self, start_concurso: int, end_concurso: int) -> slice:
+        """Faixa de linhas dos concursos entre start e end (busca binária)"""
+        start = int(np.searchsorted(self.concursos, start_concurso, side='left'))
+        end = int(np.searchsorted(self.concursos, end_concurso, side='right'))
+        return slice(start, end)
+
+    def date_window(self, start: date, end: date) -> np.ndarray:
+        """Linhas (em ordem de concurso) sorteadas entre duas datas, inclusive (busca binária)"""
+        first = int(np.searchsorted(self.datas_ordenadas, start.toordinal(), side='left'))
+        last = int(np.searchsorted(self.datas_ordenadas, end.toordinal(), side='right'))
+        return np.sort(self.linhas_por_data[first:last])
+
+    def to_results(self, rows: Union[slice, np.ndarray]) -> List[Dict]:
+        """Linhas no formato de resultado do analisador"""
+        concursos = self.concursos[rows].tolist()
+        datas = format_ordinals(self.datas[rows])
+        numeros = np.asarray(self.numeros[rows])
+        ragged = bool((numeros < 0).any())
+        ordered = np.sort(numeros, axis=1).tolist()
+
+        results = []
+        for concurso, data, numbers, sorted_numbers in zip(concursos, datas, numeros.tolist(), ordered):
+            if ragged:
+                numbers = [n for n in numbers if n >= 0]
+                sorted_numbers = [n for n in sorted_numbers if n >= 0]
+            results.append({
+                'concurso': concurso,
+                'data': data,
+                'numeros': numbers,
+                'numeros_ordenados': sorted_numbers
+            })
+        return results
+
+    def matrix(self, rows: slice, max_number: int) -> DrawMatrix:
+        """DrawMatrix das linhas pedidas sem copiar a matriz de incidência (quando a largura confere)"""
+        counts = self.counts[rows]
+        width = max_number + 1
+        if counts.shape[1] < width:
+            counts = np.pad(counts, ((0, 0), (0, width - counts.shape[1])))
+        elif counts.shape[1] > width:
+            counts = counts[:, :width]
+        sizes = counts.sum(axis=1, dtype=np.int16)
+        return DrawMatrix(concursos=self.concursos[rows], counts=counts, sizes=sizes)
+
+
+def format_ordinals(ordinals: np.ndarray) -> List[str]:
+    """Ordinais de data em 'dd/mm/aaaa' (vetorizado; 0 vira '')"""
+    iso = np.datetime_as_string((np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype('datetime64[D]'))
+    return [f"{text[8:10]}/{text[5:7]}/{text[:4]}" if ordinal else ''
+            for text, ordinal in zip(iso.tolist(), ordinals.tolist())]
+
+
+def snapshot_dir(base_dir: str, lottery_type: str) -> str:
+    return os.path.join(base_dir, lottery_type)
+
+
+def write_snapshot(base_dir: str, lottery_type: str,
+                   rows: Iterable[Tuple[int, Optional[int], List[int]]]) -> int:
+    """
+    Grava o snapshot de uma loteria a partir de (concurso, data_ordinal, numeros)
+
+    Cada coluna é escrita em arquivo temporário de nome único e renomeada; o
+    manifesto vai por último, então um leitor nunca aceita um snapshot pela
+    metade.
+    """
+    folder = snapshot_dir(base_dir, lottery_type)
+    with _write_locks_guard:
+        lock = _write_locks.setdefault(folder, threading.Lock())
+    with lock:
+        return _write_snapshot(base_dir, lottery_type, rows)
+
+
+def _write_snapshot(base_dir: str, lottery_type: str,
+                    rows: Iterable[Tuple[int, Optional[int], List[int]]]) -> int:
+    return _write_columns(base_dir, lottery_type, _build_columns(sorted(rows, key=lambda row: row[0])))
+
+
+def merge_snapshot(base_dir: str, lottery_type: str,
+                   rows: Iterable[Tuple[int, Optional[int], List[int]]]) -> Optional[int]:
+    """
+    Incorpora (concurso, data_ordinal, numeros) novos ou regravados ao snapshot existente
+
+    Só as linhas novas são montadas; as demais vêm das colunas já gravadas, sem
+    reler o SQLite. Retorna None (nada gravado) se não houver snapshot válido.
+    """
+    folder = snapshot_dir(base_dir, lottery_type)
+    with _write_locks_guard:
+        lock = _write_locks.setdefault(folder, threading.Lock())
+    with lock:
+        snapshot = load_snapshot(base_dir, lottery_type)
+        if snapshot is None:
+            return None
+        added = _build_columns(sorted(rows, key=lambda row: row[0]))
+        # Linhas regravadas saem das antigas; a união volta à ordem de concurso
+        keep = ~np.isin(snapshot.concursos, added["concursos"])
+        concursos = np.concatenate([snapshot.concursos[keep], added["concursos"]])
+        order = np.argsort(concursos, kind='stable')
+
+        width_k = max(snapshot.numeros.shape[1], added["numeros"].shape[1])
+        width = max(snapshot.counts.shape[1], added["counts"].shape[1])
+        numeros = np.concatenate([_pad(snapshot.numeros[keep], width_k, -1), _pad(added["numeros"], width_k, -1)])
+        counts = np.concatenate([_pad(snapshot.counts[keep], width, 0), _pad(added["counts"], width, 0)])[order]
+        columns = {
+            "concursos": concursos[order],
+            "datas": np.concatenate([snapshot.datas[keep], added["datas"]])[order],
+            "numeros": numeros[order],
+            "counts": counts,
+            "bitmask": pack_rows(counts > 0),
+        }
+        # Libera os mapeamentos antes de substituir os arquivos
+        del snapshot
+        return _write_columns(base_dir, lottery_type, columns)
+
+
+def _pad(array: np.ndarray, width: int, fill: int) -> np.ndarray:
+    """Completa as colunas de um array 2D até `width`"""
+    if array.shape[1] >= width:
+        return np.asarray(array)
+    return np.pad(array, ((0, 0), (0, width - array.shape[1])), constant_values=fill)
+
+
+def _build_columns(rows: List[Tuple[int, Optional[int], List[int]]]) -> Dict[str, np.ndarray]:
+    """Colunas do snapshot a partir de linhas já ordenadas por concurso"""
+    n = len(rows)
+    width_k = max((len(numbers) for _, _, numbers in rows), default=0)
+    max_number = max((max(numbers) for _, _, numbers in rows if numbers), default=0)
+    width = max_number + 1
+
+    concursos = np.fromiter((row[0] for row in rows), dtype=np.int32, count=n)
+    datas = np.fromiter((row[1] or 0 for row in rows), dtype=np.int32, count=n)
+    numeros = np.full((n, width_k), -1, dtype=np.int16)
+    sizes = np.fromiter((len(row[2]) for row in rows), dtype=np.int64, count=n)
+    flat = np.fromiter((num for row in rows for num in row[2]), dtype=np.int64, count=int(sizes.sum()))
+    row_index = np.repeat(np.arange(n, dtype=np.int64), sizes)
+    if n:
+        positions = np.arange(len(flat)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        numeros[row_index, positions] = flat
+
+    counts = np.bincount(row_index * width + flat, minlength=n * width).astype(np.uint8).reshape(n, width)
+    bitmask = pack_rows(counts > 0)
+    return {"concursos": concursos, "datas": datas, "numeros": numeros, "counts": counts, "bitmask": bitmask}
+
+
+def _write_columns(base_dir: str, lottery_type: str, columns: Dict[str, np.ndarray]) -> int:
+    folder = snapshot_dir(base_dir, lottery_type)
+    os.makedirs(folder, exist_ok=True)
+    invalidate_snapshot(base_dir, lottery_type)
+
+    for name, array in columns.items():
+        _replace_atomically(folder, f"{name}.npy", lambda f, array=array: np.save(f, array))
+
+    # Linhas sem data (ordinal 0) ficam fora do índice e nunca entram em uma janela de datas
+    datas = columns["datas"]
+    dated = np.flatnonzero(datas > 0)
+    by_date = dated[np.argsort(datas[dated], kind='stable')].astype(np.int32)
+    date_index = {"datas_ordenadas": datas[by_date], "linhas_por_data": by_date}
+    for name, array in date_index.items():
+        _replace_atomically(folder, f"{name}.npy", lambda f, array=array: np.save(f, array))
+
+    concursos = columns["concursos"]
+    n = len(concursos)
+    manifest = {"version": SNAPSHOT_VERSION, "total": n, "datados": len(by_date),
+                "ultimo_concurso": int(concursos[-1]) if n else 0}
+    _replace_atomically(folder, "manifest.json", lambda f: f.write(json.dumps(manifest).encode("utf-8")))
+    return n
+
+
+def _replace_atomically(folder: str, name: str, write):
+    """Escreve em um temporário exclusivo (mkstemp) e renomeia para `name`"""
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(temp_path, os.path.join(folder, name))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_snapshot(base_dir: str, lottery_type: str) -> Optional[DrawSnapshot]:
+    """Abre o snapshot (memory-mapped) ou retorna None se ausente, desatualizado ou incompleto"""
+    folder = snapshot_dir(base_dir, lottery_type)
+    try:
+        with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != SNAPSHOT_VERSION or not manifest.get("total"):
+            return None
+        arrays = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode='r')
+                  for name in SNAPSHOT_COLUMNS + DATE_INDEX_COLUMNS}
+    except (OSError, ValueError):
+        return None
+
+    if any(len(arrays[name]) != manifest["total"] for name in SNAPSHOT_COLUMNS):
+        return None
+    if any(len(arrays[name]) != manifest.get("datados") for name in DATE_INDEX_COLUMNS):
+        return None
+    return DrawSnapshot(**arrays)
+
+
+def invalidate_snapshot(base_dir: str, lottery_type: str):
+    """Descarta o manifesto; o snapshot volta a valer só depois de regravado"""
+    try:
+        os.remove(os.path.join(snapshot_dir(base_dir, lottery_type), "manifest.json"))
+    except FileNotFoundError:
+        pass
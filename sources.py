@@ -0,0 +1,225 @@
+# sources.py - Fontes de resultados (Caixa e espelho) com requisições "hedged" e failover
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from http_client import AdaptiveRateLimiter, FetchError, ResilientHttpClient, get_shared_client
+from task_manager import CancellationToken, OperationCancelled, check_cancelled
+
+# Sobrescrevíveis por variável de ambiente (ex.: apontar para o mock_api.py local)
+CAIXA_API_URL = os.environ.get("DEUSORTE_CAIXA_API_URL", "https://servicebus2.caixa.gov.br/portaldeloterias/api")
+MIRROR_API_URL = os.environ.get("DEUSORTE_MIRROR_API_URL", "https://loteriascaixa-api.herokuapp.com/api")
+
+
+@dataclass(frozen=True)
+class DrawRecord:
+    """Concurso normalizado, independente da fonte que o forneceu"""
+    lottery_type: str
+    concurso: int
+    data: str                       # 'dd/mm/aaaa'
+    numeros: Tuple[int, ...]        # ordem do sorteio (quando a fonte informa)
+    source: str
+    raw: Dict = field(default=None, compare=False, repr=False)
+
+    def to_result(self) -> Dict:
+        """Formato de resultado usado pelo analisador e pelo cache"""
+        numbers = list(self.numeros)
+        return {
+            'concurso': self.concurso,
+            'data': self.data,
+            'numeros': numbers,
+            'numeros_ordenados': sorted(numbers)
+        }
+
+
+def normalize_payload(payload: Dict, lottery_type: str, source: str) -> Optional[DrawRecord]:
+    """
+    Converte uma resposta de qualquer uma das APIs em DrawRecord
+
+    Caixa: numero / dataApuracao / dezenasSorteadasOrdemSorteio
+    Espelho: concurso / data / dezenasOrdemSorteio ou dezenas
+    """
+    if not isinstance(payload, dict):
+        return None
+
+    concurso = payload.get('numero') or payload.get('concurso')
+    dezenas = (payload.get('dezenasSorteadasOrdemSorteio')
+               or payload.get('dezenasOrdemSorteio')
+               or payload.get('dezenas')
+               or payload.get('listaDezenas')
+               or [])
+
+    numbers = []
+    for d in dezenas:
+        try:
+            numbers.append(int(d))
+        except (TypeError, ValueError):
+            continue
+
+    if not concurso or not numbers:
+        return None
+
+    return DrawRecord(
+        lottery_type=lottery_type,
+        concurso=int(concurso),
+        data=payload.get('dataApuracao') or payload.get('data') or '',
+        numeros=tuple(numbers),
+        source=source,
+        raw=payload
+    )
+
+
+class ResultSource:
+    def __init__(self, name: str, base_url: str, client: ResilientHttpClient, latest_suffix: str = ""):
+        """
+        Uma API de resultados
+
+        Args:
+            name: Identificador da fonte ('caixa', 'espelho')
+            base_url: URL base da API
+            client: Cliente HTTP (com o limitador de taxa desta fonte)
+            latest_suffix: Sufixo da rota do último concurso ('' na Caixa, '/latest' no espelho)
+        """
+        self.name = name
+        self.base_url = base_url
+        self.client = client
+        self.latest_suffix = latest_suffix
+        self._latencies = deque(maxlen=200)
+        self._lock = threading.Lock()
+
+    def contest_url(self, lottery_type: str, concurso: int) -> str:
+        return f"{self.base_url}/{lottery_type}/{concurso}"
+
+    def latest_url(self, lottery_type: str) -> str:
+        return f"{self.base_url}/{lottery_type}{self.latest_suffix}"
+
+    def get(self, url: str, lottery_type: str, timeout: float,
+            cancel_token: CancellationToken = None) -> Tuple[Optional[DrawRecord], int]:
+        """Busca e normaliza uma resposta; levanta FetchError se a fonte falhar"""
+        started = time.monotonic()
+        response = self.client.get(url, timeout=timeout, cancel_token=cancel_token)
+        if response is None:
+            return None, 0
+
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+
+        record = normalize_payload(response.json(), lottery_type, self.name)
+        if record is None:
+            raise FetchError(f"Resposta sem dezenas em {url}")
+        return record, len(response.content)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Percentil da latência das respostas recentes (None com poucas amostras)"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < 10:
+            return None
+        index = min(len(samples) - 1, int(percentile * len(samples)))
+        return samples[index]
+
+
+class MultiSourceFetcher:
+    def __init__(self, sources: List[ResultSource], hedge_percentile: float = 0.9,
+                 default_hedge_delay: float = 1.0, min_hedge_delay: float = 0.2,
+                 max_hedge_delay: float = 5.0):
+        """
+        Busca concursos na fonte principal com cópia "hedged" e failover nas demais
+
+        Se a fonte principal não responder dentro do percentil `hedge_percentile`
+        da sua própria latência, a mesma requisição é enviada à próxima fonte e
+        vale a primeira resposta válida. Se a principal falhar, a próxima é usada
+        imediatamente.
+        """
+        self.sources = sources
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="deusorte-fonte")
+
+    def _hedge_delay(self, source: ResultSource) -> float:
+        delay = source.latency_percentile(self.hedge_percentile)
+        if delay is None:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, min(self.max_hedge_delay, delay))
+
+    def _hedged(self, lottery_type: str, build_url: Callable[[ResultSource], str], timeout: float,
+                cancel_token: CancellationToken = None) -> Tuple[Optional[DrawRecord], int]:
+        """Executa a requisição nas fontes em sequência escalonada e devolve a primeira válida"""
+        check_cancelled(cancel_token)
+
+        # Cancelado quando houver vencedor, para encerrar retentativas das demais fontes;
+        # a fonte que ainda esperava no limitador devolve a ficha (não é cobrada)
+        race_token = CancellationToken()
+        running = {}
+        errors = []
+        next_source = 0
+
+        def launch():
+            nonlocal next_source
+            source = self.sources[next_source]
+            next_source += 1
+            future = self._executor.submit(source.get, build_url(source), lottery_type, timeout, race_token)
+            running[future] = source
+
+        try:
+            launch()
+            while running:
+                hedge_at = time.monotonic() + self._hedge_delay(running[next(iter(running))])
+                while True:
+                    check_cancelled(cancel_token)
+                    done, _ = wait(list(running), timeout=0.1, return_when=FIRST_COMPLETED)
+                    if done or time.monotonic() >= hedge_at:
+                        break
+
+                for future in done:
+                    source = running.pop(future)
+                    try:
+                        return future.result()
+                    except OperationCancelled:
+                        continue
+                    except Exception as e:
+                        errors.append(f"{source.name}: {e}")
+
+                # Falha (failover) ou lentidão (hedge): aciona a próxima fonte
+                if next_source < len(self.sources) and (not done or not running):
+                    launch()
+        finally:
+            race_token.cancel()
+
+        raise FetchError("; ".join(errors) or "Nenhuma fonte respondeu")
+
+    def fetch_contest(self, lottery_type: str, concurso: int, timeout: float = 10,
+                      cancel_token: CancellationToken = None) -> Tuple[Optional[DrawRecord], int]:
+        """Um concurso (DrawRecord ou None se não existe) e os bytes recebidos"""
+        return self._hedged(lottery_type, lambda source: source.contest_url(lottery_type, concurso),
+                            timeout, cancel_token)
+
+    def fetch_latest(self, lottery_type: str, timeout: float = 15,
+                     cancel_token: CancellationToken = None) -> Optional[DrawRecord]:
+        """Último concurso publicado"""
+        record, _ = self._hedged(lottery_type, lambda source: source.latest_url(lottery_type),
+                                 timeout, cancel_token)
+        return record
+
+
+_shared_fetcher: Optional[MultiSourceFetcher] = None
+_shared_fetcher_lock = threading.Lock()
+
+
+def get_shared_fetcher() -> MultiSourceFetcher:
+    """Fetcher único do processo: Caixa como principal, espelho como hedge/failover"""
+    global _shared_fetcher
+    with _shared_fetcher_lock:
+        if _shared_fetcher is None:
+            mirror_client = ResilientHttpClient(limiter=AdaptiveRateLimiter(rate=5.0), max_retries=2)
+            _shared_fetcher = MultiSourceFetcher([
+                ResultSource("caixa", CAIXA_API_URL, get_shared_client()),
+                ResultSource("espelho", MIRROR_API_URL, mirror_client, latest_suffix="/latest"),
+            ])
+        return _shared_fetcher
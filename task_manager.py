@@ -0,0 +1,105 @@
+# task_manager.py - Executor compartilhado para operações em segundo plano
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Optional, Tuple
+
+
+class OperationCancelled(Exception):
+    """Operação interrompida pelo usuário através de um CancellationToken"""
+    pass
+
+
+class CancellationToken:
+    def __init__(self):
+        """Sinal de cancelamento cooperativo compartilhado entre UI e trabalho em segundo plano"""
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Solicita o cancelamento da operação"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Indica se o cancelamento foi solicitado"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Interrompe a operação atual se o cancelamento foi solicitado"""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def sleep(self, seconds: float):
+        """Pausa que é interrompida imediatamente por um cancelamento"""
+        if self._event.wait(seconds):
+            raise OperationCancelled()
+
+
+def check_cancelled(cancel_token: Optional[CancellationToken]):
+    """Atalho para verificar um token opcional dentro de laços longos"""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+
+class BackgroundTaskManager:
+    def __init__(self, max_workers: int = 3):
+        """
+        Executor limitado para as operações disparadas pela interface
+
+        Args:
+            max_workers: Quantidade máxima de operações executando ao mesmo tempo
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deusorte")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Tuple[Future, CancellationToken]] = {}
+
+    def submit(self, key: str, target: Callable[[CancellationToken], None]) -> Optional[CancellationToken]:
+        """
+        Agenda uma operação identificada por `key`
+
+        A função recebe o CancellationToken da operação como único argumento.
+        Retorna None (sem agendar nada) se já houver uma operação ativa com a mesma chave.
+        """
+        with self._lock:
+            current = self._jobs.get(key)
+            if current and not current[0].done() and not current[1].cancelled:
+                return None
+
+            token = CancellationToken()
+            future = self._executor.submit(self._run, key, target, token)
+            self._jobs[key] = (future, token)
+            return token
+
+    def _run(self, key: str, target: Callable[[CancellationToken], None], token: CancellationToken):
+        """Executa a operação tratando o cancelamento como término normal"""
+        try:
+            target(token)
+        except OperationCancelled:
+            print(f"⏹️  Operação '{key}' cancelada")
+        except Exception as e:
+            print(f"Erro na operação '{key}': {e}")
+        finally:
+            with self._lock:
+                job = self._jobs.get(key)
+                if job and job[1] is token:
+                    del self._jobs[key]
+
+    def is_running(self, key: str) -> bool:
+        """Indica se há uma operação ativa (não cancelada) com a chave informada"""
+        with self._lock:
+            job = self._jobs.get(key)
+            return bool(job and not job[0].done() and not job[1].cancelled)
+
+    def cancel(self, key: str = None):
+        """Cancela uma operação específica ou todas as operações ativas"""
+        with self._lock:
+            if key is None:
+                jobs = list(self._jobs.values())
+            else:
+                jobs = [self._jobs[key]] if key in self._jobs else []
+        for _, token in jobs:
+            token.cancel()
+
+    def shutdown(self):
+        """Cancela tudo e libera as threads do executor (operações ainda na fila são descartadas)"""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
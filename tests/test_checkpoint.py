@@ -0,0 +1,58 @@
+# test_checkpoint.py - Retomada de downloads interrompidos
+import pytest
+
+import analizador
+from http_client import FetchError
+from sources import DrawRecord
+from task_manager import OperationCancelled
+
+
+class FakeFetcher:
+    def __init__(self, fail=(), cancel_at=None):
+        self.fail = set(fail)
+        self.cancel_at = cancel_at
+        self.fetched = []
+
+    def fetch_contest(self, lottery_type, concurso, cancel_token=None):
+        if concurso == self.cancel_at:
+            raise OperationCancelled()
+        if concurso in self.fail:
+            raise FetchError("HTTP 503")
+        self.fetched.append(concurso)
+        numbers = tuple(sorted({(concurso * k) % 60 + 1 for k in range(1, 7)} | {1, 2, 3, 4, 5, 6})[:6])
+        return DrawRecord(lottery_type, concurso, "01/01/2020", numbers, "caixa", {"concurso": concurso}), 100
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return analizador.LotteryPatternAnalyzer(
+        "megasena", last_n_games=10, cache_manager=analizador.LotteryCacheManager(str(tmp_path / "cache.db"))
+    )
+
+
+def test_resume_fetches_failed_and_remaining_contests(analyzer):
+    analyzer.fetcher = FakeFetcher(fail={7}, cancel_at=40)
+    with pytest.raises(OperationCancelled):
+        analyzer._fetch_all_concursos(1, 60)
+
+    # Uma atualização no meio não apaga o ponto de retomada do histórico
+    analyzer.fetcher = FakeFetcher()
+    analyzer._download_concursos([61, 62], "Atualizando")
+    assert analyzer.cache_manager.get_checkpoint("megasena", "historico:1") is not None
+
+    analyzer.fetcher = FakeFetcher()
+    results = analyzer._fetch_all_concursos(1, 62)
+
+    assert analyzer.fetcher.fetched == [7] + list(range(40, 61))
+    assert [r['concurso'] for r in sorted(results, key=lambda r: r['concurso'])] == list(range(1, 63))
+    assert analyzer.cache_manager.get_checkpoint("megasena", "historico:1") is None
+
+
+def test_download_clears_only_its_own_checkpoint(analyzer):
+    cache = analyzer.cache_manager
+    cache.save_results("megasena", [], checkpoint=("historico:1", 1, 500, 120))
+    analyzer.fetcher = FakeFetcher()
+    analyzer._download_concursos(list(range(1, 30)), "Baixando")
+
+    assert cache.get_checkpoint("megasena", "1-29") is None
+    assert cache.get_checkpoint("megasena", "historico:1")['proximo_concurso'] == 120
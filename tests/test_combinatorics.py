@@ -0,0 +1,48 @@
+# test_combinatorics.py - Distribuições exatas contra enumeração completa
+from collections import Counter
+from itertools import combinations
+from math import comb
+
+import pytest
+
+from combinatorics import central_interval, exact_distributions, longest_run_counts, mean_std, sum_counts
+
+
+def longest_run(numbers):
+    best = run = 1
+    for a, b in zip(numbers, numbers[1:]):
+        run = run + 1 if b == a + 1 else 1
+        best = max(best, run)
+    return best
+
+
+@pytest.mark.parametrize("total, draw_size, low_max", [(10, 3, 5), (15, 5, 7), (12, 6, 6)])
+def test_exact_distributions_match_enumeration(total, draw_size, low_max):
+    values = range(1, total + 1)
+    draws = list(combinations(values, draw_size))
+    expected = {
+        "soma": Counter(sum(d) for d in draws),
+        "pares": Counter(sum(1 for n in d if n % 2 == 0) for d in draws),
+        "baixos": Counter(sum(1 for n in d if n <= low_max) for d in draws),
+        "sequencia": Counter(longest_run(d) for d in draws),
+    }
+
+    distributions = exact_distributions(values, draw_size, low_max)
+    for name, counter in expected.items():
+        assert distributions[name] == pytest.approx({k: v / len(draws) for k, v in counter.items()})
+        assert sum(distributions[name].values()) == pytest.approx(1.0)
+
+
+def test_counts_are_exact_integers_for_real_lotteries():
+    assert sum(sum_counts(range(1, 61), 6).values()) == comb(60, 6)
+    assert sum(longest_run_counts(25, 15).values()) == comb(25, 15)
+    # Lotomania começa em 0: a menor soma é 0 + 1 + ... + 19
+    assert min(sum_counts(range(0, 100), 20)) == sum(range(20))
+
+
+def test_mean_and_interval_of_the_megasena_sum():
+    mean, std = mean_std(exact_distributions(range(1, 61), 6, 30)["soma"])
+    assert mean == pytest.approx(183.0)
+    low, high = central_interval(exact_distributions(range(1, 61), 6, 30)["soma"])
+    assert low < mean < high
+    assert high - low == pytest.approx(2 * std, rel=0.1)
@@ -0,0 +1,60 @@
+# test_http_client.py - Balde de fichas e limitador adaptativo
+import threading
+import time
+
+import pytest
+
+from http_client import AdaptiveRateLimiter, TokenBucket
+from task_manager import CancellationToken, OperationCancelled
+
+
+def test_burst_up_to_capacity_then_wait():
+    bucket = TokenBucket(rate=10.0, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+
+def test_try_acquire_does_not_go_into_debt():
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.reserve() == pytest.approx(10.0, abs=0.1)
+
+
+def test_cancelled_acquire_gives_the_token_back():
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.acquire()
+
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(OperationCancelled):
+        bucket.acquire(token)
+    assert time.monotonic() - started < 0.5
+
+    # Só a ficha da primeira chamada continua em uso: a próxima espera é menor que 1 s
+    assert bucket.reserve() < 1.0
+
+
+def test_repeated_cancellations_do_not_accumulate_debt():
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.acquire()
+    for _ in range(20):
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(OperationCancelled):
+            bucket.acquire(token)
+    assert bucket.reserve() <= 1.0
+
+
+def test_aimd_halves_on_failure_and_grows_on_fast_success():
+    limiter = AdaptiveRateLimiter(rate=10.0, min_rate=1.0, max_rate=20.0, target_latency=1.0)
+    limiter.record_failure()
+    assert limiter.rate == pytest.approx(5.0)
+    limiter.record_failure(throttled=True)
+    assert limiter.rate == pytest.approx(1.5)
+    limiter.record_success(0.1)
+    assert limiter.rate == pytest.approx(2.0)
+    for _ in range(10):
+        limiter.record_failure()
+    assert limiter.rate == limiter.min_rate
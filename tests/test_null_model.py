@@ -0,0 +1,32 @@
+# test_null_model.py - Simulação Monte Carlo do modelo nulo
+import numpy as np
+import pytest
+
+from null_model import NULL_MODEL_METRICS, simulate
+from task_manager import CancellationToken, OperationCancelled
+
+VALUES = np.arange(1, 61)
+
+
+def test_inline_simulation_is_reproducible():
+    first = simulate(40, 50, VALUES, 6, 30, seed=7, workers=1)
+    second = simulate(40, 50, VALUES, 6, 30, seed=7, workers=1, cancel_token=CancellationToken())
+    assert set(first) == set(NULL_MODEL_METRICS)
+    for key in NULL_MODEL_METRICS:
+        np.testing.assert_array_equal(first[key], second[key])
+    assert first["media_pares"].mean() == pytest.approx(3.0, abs=0.3)
+
+
+def test_inline_simulation_checks_the_token_between_batches():
+    calls = []
+
+    class CancelAfterFirstBatch(CancellationToken):
+        def raise_if_cancelled(self):
+            calls.append(1)
+            if len(calls) > 1:
+                raise OperationCancelled()
+
+    with pytest.raises(OperationCancelled):
+        # Vários lotes inline: o cancelamento chega no segundo
+        simulate(2000, 500, VALUES, 6, 30, seed=1, workers=1, cancel_token=CancelAfterFirstBatch())
+    assert len(calls) == 2
@@ -0,0 +1,37 @@
+# test_randomness.py - Bateria de testes de aleatoriedade
+import numpy as np
+import pytest
+
+from null_model import random_histories
+from randomness import chi2_sf, frequency_uniformity, randomness_battery
+
+VALUES = np.arange(1, 61)
+
+
+def fair_draws(draws, seed=3):
+    return random_histories(np.random.default_rng(seed), 1, draws, len(VALUES), 6)[0]
+
+
+@pytest.mark.parametrize("statistic, dof, expected", [(3.841, 1, 0.05), (18.307, 10, 0.05), (0.0, 5, 1.0)])
+def test_chi2_survival_function(statistic, dof, expected):
+    assert chi2_sf(statistic, dof) == pytest.approx(expected, abs=1e-3)
+
+
+def test_fair_draws_pass_the_battery():
+    results = randomness_battery(fair_draws(2000), VALUES, 6)
+    assert set(results) == {"uniformidade", "sequencias_por_numero", "correlacao_serial", "intervalos", "pares"}
+    for result in results.values():
+        assert 0.0 <= result["p_valor"] <= 1.0
+        assert result["p_valor"] > 0.001
+
+
+def test_biased_frequencies_are_detected():
+    present = fair_draws(2000)
+    # Número 1 forçado em um terço dos concursos (no lugar de outro número do sorteio)
+    for row in present[::3]:
+        if not row[0]:
+            row[np.flatnonzero(row)[0]] = False
+            row[0] = True
+    result = frequency_uniformity(present, 6)
+    assert result["p_valor"] < 1e-6
+    assert result["conclusao"] == "desvio detectado"
@@ -0,0 +1,72 @@
+# test_snapshot.py - Snapshot colunar: gravação, junção de concursos novos e janelas
+from datetime import date
+
+import numpy as np
+
+from snapshot import SNAPSHOT_COLUMNS, load_snapshot, merge_snapshot, write_snapshot
+
+
+def make_rows(concursos, draw_size=5):
+    rows = []
+    for concurso in concursos:
+        numbers = [(concurso * 7 + k * 13) % 80 + 1 for k in range(draw_size)]
+        rows.append((concurso, date(2020, 1, 1).toordinal() + concurso, numbers))
+    return rows
+
+
+def assert_same_snapshot(left, right):
+    for name in SNAPSHOT_COLUMNS:
+        np.testing.assert_array_equal(getattr(left, name), getattr(right, name))
+
+
+def test_merge_matches_full_rewrite(tmp_path):
+    rows = make_rows(range(1, 101))
+    write_snapshot(str(tmp_path / "a"), "quina", rows[:90])
+    # Concursos novos, um regravado com outras dezenas e um antigo que faltava
+    rewritten = (50, rows[49][1], [1, 2, 3, 4, 80])
+    assert merge_snapshot(str(tmp_path / "a"), "quina", rows[90:] + [rewritten]) == 100
+
+    expected = rows[:49] + [rewritten] + rows[50:]
+    write_snapshot(str(tmp_path / "b"), "quina", expected)
+    assert_same_snapshot(load_snapshot(str(tmp_path / "a"), "quina"),
+                         load_snapshot(str(tmp_path / "b"), "quina"))
+
+
+def test_merge_widens_columns(tmp_path):
+    write_snapshot(str(tmp_path), "duplasena", make_rows(range(1, 11), draw_size=6))
+    merge_snapshot(str(tmp_path), "duplasena", [(11, 0, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])])
+    snapshot = load_snapshot(str(tmp_path), "duplasena")
+    assert snapshot.numeros.shape == (11, 12)
+    assert (snapshot.numeros[:10, 6:] == -1).all()
+    assert snapshot.counts[10, 1:13].sum() == 12
+
+
+def test_merge_without_snapshot_writes_nothing(tmp_path):
+    assert merge_snapshot(str(tmp_path), "quina", make_rows([1])) is None
+    assert load_snapshot(str(tmp_path), "quina") is None
+
+
+def test_date_window_is_inclusive_and_skips_undated_rows(tmp_path):
+    base = date(2024, 1, 1).toordinal()
+    rows = [(1, base, [1, 2]), (2, 0, [3, 4]), (3, base + 3, [5, 6]), (4, 0, [7, 8]),
+            (5, base + 7, [9, 10]), (6, base + 10, [11, 12])]
+    write_snapshot(str(tmp_path), "megasena", rows)
+    snapshot = load_snapshot(str(tmp_path), "megasena")
+
+    window = snapshot.date_window(date(2024, 1, 1), date(2024, 1, 8))
+    assert snapshot.concursos[window].tolist() == [1, 3, 5]
+    assert [r['data'] for r in snapshot.to_results(window)] == ['01/01/2024', '04/01/2024', '08/01/2024']
+    assert snapshot.date_window(date(2024, 1, 2), date(2024, 1, 3)).tolist() == []
+    assert snapshot.date_window(date(2023, 1, 1), date(2023, 12, 31)).tolist() == []
+
+
+def test_date_window_after_merge_out_of_date_order(tmp_path):
+    base = date(2024, 1, 1).toordinal()
+    write_snapshot(str(tmp_path), "megasena", [(1, base, [1]), (2, base + 5, [2])])
+    # Concurso antigo chegando depois, e um concurso cuja data recua em relação ao anterior
+    merge_snapshot(str(tmp_path), "megasena", [(3, base + 2, [3]), (0, 0, [4])])
+    snapshot = load_snapshot(str(tmp_path), "megasena")
+
+    window = snapshot.date_window(date(2024, 1, 1), date(2024, 1, 3))
+    assert snapshot.concursos[window].tolist() == [1, 3]
+    assert snapshot.datas_ordenadas.tolist() == sorted(snapshot.datas_ordenadas.tolist())
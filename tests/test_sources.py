@@ -0,0 +1,50 @@
+# test_sources.py - Requisições "hedged" entre a Caixa e o espelho
+import time
+
+from http_client import AdaptiveRateLimiter, ResilientHttpClient
+from sources import MultiSourceFetcher, ResultSource
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+    content = b'{}'
+
+    def __init__(self, concurso):
+        self._payload = {'concurso': concurso, 'data': '01/01/2024', 'dezenas': ['01', '02', '03']}
+
+    def json(self):
+        return self._payload
+
+
+def make_source(name, limiter, calls):
+    client = ResilientHttpClient(limiter=limiter, max_retries=0)
+
+    def get(url, timeout):
+        calls.append(url)
+        return FakeResponse(int(url.rsplit('/', 1)[-1]))
+
+    client.session.get = get
+    return ResultSource(name, f"http://{name}", client)
+
+
+def test_hedge_does_not_charge_the_cancelled_source():
+    # Principal sem fichas: fica esperando no limitador até o espelho responder
+    primary_limiter = AdaptiveRateLimiter(rate=1.0, capacity=1)
+    primary_limiter.acquire()
+    primary_calls, mirror_calls = [], []
+    fetcher = MultiSourceFetcher([
+        make_source("caixa", primary_limiter, primary_calls),
+        make_source("espelho", AdaptiveRateLimiter(rate=50.0), mirror_calls),
+    ], default_hedge_delay=0.1)
+
+    for concurso in range(1, 6):
+        record, _ = fetcher.fetch_contest("megasena", concurso)
+        assert record.concurso == concurso
+        assert record.source == "espelho"
+    time.sleep(0.2)
+
+    assert primary_calls == []
+    assert len(mirror_calls) == 5
+    # As cinco esperas canceladas não deixaram dívida no limitador da principal
+    assert primary_limiter.reserve() < 1.0